@@ -1,9 +1,16 @@
 from tkinter import Frame, Label
-from chichitk import ScrollableFrame, IconButton
+from tkinter.ttk import Scrollbar
+from chichitk import ScrollableFrame
+from itertools import accumulate
+from bisect import bisect_left, bisect_right
 
 
 from utils.info import colors, font_name, font_name_bold, font_size_normal, font_size_header
-from utils.accounts import AccountDisplay
+from utils.accounts import Account
+from utils.account_display import AccountDisplay
+from utils.registry import AccountRegistry
+from utils.icons import CachedIconButton
+from utils.strength_analyzer import score_labels
 
 
 class ListSeparator(Frame):
@@ -15,10 +22,19 @@ class ListSeparator(Frame):
         Frame.__init__(self, master, bg=bg, padx=padx, pady=pady)
         self.__text = text
 
-        Label(self, text=self.__text + ' ', bg=bg, fg=fg,
-              font=(font_name, font_size_normal)).pack(side='left')
+        self.__Label = Label(self, text=self.__text + ' ', bg=bg, fg=fg,
+                             font=(font_name, font_size_normal))
+        self.__Label.pack(side='left')
         Frame(self, bg=line_color, height=line_width).pack(side='left', fill='x', expand=True) # divider line
 
+    def set_text(self, text:str):
+        '''
+        Purpose:
+            updates separator text - used to recycle separators in a virtual list
+        '''
+        self.__text = text
+        self.__Label.config(text=self.__text + ' ')
+
     def get_text(self) -> str:
         '''
         Purpose:
@@ -26,16 +42,90 @@ class ListSeparator(Frame):
         '''
         return self.__text
 
+# Sort keys for each account order - every key ends with id(Account) so
+# that keys are unique and an account can be found in the list by bisection
+def name_order(Account:Account) -> tuple:
+    '''sort key - alphabetical by account name'''
+    return (Account.get_name(), id(Account))
+
+def type_order(Account:Account) -> tuple:
+    '''sort key - alphabetical by category, then by account name'''
+    return (Account.get_order_category(), Account.get_name(), id(Account))
+
+def date_order(Account:Account) -> tuple:
+    '''sort key - most recent year first, then by account name'''
+    # year characters are negated so that years sort in reverse
+    return (tuple(-ord(c) for c in Account.get_date_year()) + (1,), Account.get_name(), id(Account))
+
+def strength_order(Account:Account, report:dict) -> tuple:
+    '''sort key - weakest password first, then by account name - accounts not analyzed yet are last'''
+    if report is None:
+        return (len(score_labels), 0.0, Account.get_name(), id(Account))
+    return (report['score'], report['entropy'], Account.get_name(), id(Account))
+
 class AccountsPage(Frame):
     ''' Page to display list of accounts
+
+        In virtual mode, only enough AccountDisplay rows to fill the visible
+        area (plus buffer rows above and below) are created. As the list is
+        scrolled, rows that leave the visible area are recycled to display
+        the accounts coming into view. Every row and separator has a fixed
+        height, so the position of each list item is known without packing.
+
+        Displayed accounts are kept sorted along with their sort keys. When an
+        account is edited, update_account() bisects it out of the list and
+        back in, so only that row and the separators next to it are moved.
     '''
-    def __init__(self, master, bg, top_bg=colors['background1'],
-                 header_fg='#ffffff', inactive_fg=colors['inactive_icon']):
+    def __init__(self, master, bg, select_command, delete_command,
+                 Registry:AccountRegistry, strength_function=lambda A: None,
+                 top_bg=colors['background1'], header_fg='#ffffff',
+                 inactive_fg=colors['inactive_icon'], virtual=True,
+                 buffer_rows=4, row_padx=10, row_pady=2, info_margin=60):
+        '''
+        Parameters
+        ----------
+            :param master: tk.Frame - parent widget
+            :param bg: str (hex code) - background color
+            :param select_command: 1 argument function (str) - called with account name when an account is clicked
+            :param delete_command: 1 argument function (str) - called with account name when an account is deleted
+            :param Registry: AccountRegistry - all accounts by name - displays are registered here when shown
+            :param strength_function: 1 argument function (Account) -> dict or None - password strength report
+                used by the Strength order (see StrengthAnalyzer.get_report)
+            :param virtual: bool - if True, AccountDisplay rows are recycled as the list scrolls
+            :param buffer_rows: int - rows kept above and below the visible area in virtual mode
+            :param info_margin: int - pixels of each row not available to info text (padding, bar and delete button)
+        '''
         self.bg = bg
         Frame.__init__(self, master, bg=self.bg)
-        self.__Accounts: list[AccountDisplay] = [] # all accounts
-        self.Accounts: list[AccountDisplay] = [] # only accounts currently displayed - controlled by search bar
-        self.Separators: list[ListSeparator] = []
+        self.__select_command = select_command
+        self.__delete_command = delete_command
+        self.__virtual = virtual
+        self.__buffer_rows = buffer_rows
+        self.__row_padx, self.__row_pady = row_padx, row_pady
+        self.__info_margin = info_margin
+        self.__info_width = None # width (pixels) of info text in every row - None until list is mapped
+        self.__resize_pending = False # True while a resize is waiting for the next idle cycle
+        self.__Registry = Registry # all accounts and the displays currently showing them
+        self.__strength_function = strength_function
+        self.Accounts: list[Account] = [] # only accounts currently displayed - controlled by search bar
+        self.categories: list[str] = [] # category of each displayed account - a separator starts each run of categories
+        self.__keys = [] # sort key of each displayed account - sorted
+        self.__key_of = {} # Account -> sort key when account was inserted
+        self.__order_key, self.__category_of = name_order, lambda A: A.get_name()[:1].upper()
+        self.__separators = {} # Account -> ListSeparator packed above account - pack mode only
+        self.__separator_pool = {} # label -> list of ListSeparators not in the list - reused in both modes
+        self.__filtered = False # True when only search results are displayed
+        self.__selected: Account = None
+
+        # Virtual mode
+        self.__items = [] # list of (Account or None, category) - None for separators
+        self.__item_of = [] # index in self.__items of each displayed account
+        self.__offsets = [0] # y coordinate of the top of each item - last entry is the bottom of the list
+        self.__rows: list[AccountDisplay] = [] # all recycled account rows
+        self.__free_rows: list[AccountDisplay] = [] # rows not currently placed
+        self.__visible = {} # item index -> row or separator currently placed there
+        self.__row_height = None # measured from first row
+        self.__separator_height = None # measured from first separator
         
         header_label = Label(self, text='Accounts', bg=top_bg, fg=header_fg,
                              font=(font_name_bold, font_size_header))
@@ -49,19 +139,23 @@ class AccountsPage(Frame):
 
         buttons_frame = Frame(self.main_page, bg=bg)
         buttons_frame.pack(side='top', fill='x')
-        NameButton = IconButton(buttons_frame, 'icons\\arrow_down.png',
+        NameButton = CachedIconButton(buttons_frame, 'icons\\arrow_down.png',
                                 self.reorder_name, label='Name', bar_height=3,
                                 inactive_bg=bg, popup_label='Order by Account Name')
-        TypeButton = IconButton(buttons_frame, 'icons\\arrow_down.png',
+        TypeButton = CachedIconButton(buttons_frame, 'icons\\arrow_down.png',
                                 self.reorder_type, label='Type', bar_height=3,
                                 inactive_bg=bg, popup_label='Order by Category')
-        DateButton = IconButton(buttons_frame, 'icons\\arrow_down.png',
+        DateButton = CachedIconButton(buttons_frame, 'icons\\arrow_down.png',
                                 self.reorder_date, label='Date', bar_height=3,
                                 inactive_bg=bg, popup_label='Order by Date')
+        StrengthButton = CachedIconButton(buttons_frame, 'icons\\arrow_down.png',
+                                self.reorder_strength, label='Strength', bar_height=3,
+                                inactive_bg=bg, popup_label='Order by Password Strength')
         NameButton.pack(side='left', fill='x', expand=True)
         TypeButton.pack(side='left', fill='x', expand=True)
         DateButton.pack(side='left', fill='x', expand=True)
-        self.__order_buttons = [NameButton, TypeButton, DateButton]
+        StrengthButton.pack(side='left', fill='x', expand=True)
+        self.__order_buttons = [NameButton, TypeButton, DateButton, StrengthButton]
 
         self.scroll_frame = ScrollableFrame(self.main_page, bg,
                                             include_scrollbar=True,
@@ -69,7 +163,14 @@ class AccountsPage(Frame):
                                             yscrollincrement=1)
         self.scroll_frame.pack(side='top', fill='both', expand=True)
         self.main_frame = self.scroll_frame.scrollable_frame # all account listings go in main_frame
-        self.bind_all('<MouseWheel>', self.scroll_frame.on_mousewheel)
+        self.bind_all('<MouseWheel>', self.scroll_frame.on_mousewheel, add='+') # keep activity monitor binding
+        # rows do not handle their own resizing - one pass over all rows per idle cycle
+        self.scroll_frame.canvas.bind('<Configure>', lambda e: self.__schedule_resize(), add='+')
+        if self.__virtual:
+            # refresh visible rows whenever the canvas scrolls or is resized
+            self.__scrollbars = [w for w in self.scroll_frame.winfo_children() if isinstance(w, Scrollbar)]
+            self.scroll_frame.canvas.config(yscrollcommand=self.__on_scroll)
+            self.scroll_frame.canvas.bind('<Configure>', lambda e: self.update_visible(), add='+')
 
         NameButton.click_button()
 
@@ -77,20 +178,25 @@ class AccountsPage(Frame):
         '''
         Purpose:
             add accounts to display list
-            removes and re-packs all existing accounts
-            accounts must already be initialized with self.main_frame as master
+            a single account is inserted at its sorted position - a list of accounts
+            (or any account while search results are shown) re-packs all accounts
+            accounts must already be added to the registry
         Pre-conditions:
-            accounts : list of AccountDisplay objects or a single AccountDisplay object - accounts to be added
+            accounts : list of Account objects or a single Account object - accounts to be added
         Post-conditions:
             adds accounts to display list
         Returns:
             (none)
         '''
-        if isinstance(accounts, list):
-            self.__Accounts.extend(accounts)
-        else:
-            self.__Accounts.append(accounts)
-        self.Accounts = self.__Accounts # display all accounts - regardless of search bar status
+        if isinstance(accounts, Account) and not self.__filtered:
+            j = self.__insert_item(accounts)
+            self.__update_inactive_page()
+            if self.__virtual:
+                self.__relayout(j)
+            return
+        # display all accounts - regardless of search bar status
+        self.__filtered = False
+        self.Accounts = self.__Registry.get_accounts()
         self.repack_accounts()
 
     def remove_account(self, account_name:str):
@@ -104,22 +210,21 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        for Account in self.__Accounts:
-            if Account.get_name() == account_name:
-                Account.pack_forget()
-                self.__Accounts.remove(Account)
-                if Account in self.Accounts: # removed account is one of the accounts currently displayed
-                    i = self.Accounts.index(Account)
-                    # if Account is the last in its category, remove separator
-                    if self.categories.count(self.categories[i]) == 1:
-                        for S in self.Separators:
-                            if S.get_text() == self.categories[i]:
-                                S.pack_forget()
-                                self.Separators.remove(S)
-                                break
-                    del self.Accounts[i]
-                    del self.categories[i]
-                break
+        Account = self.__Registry.get(account_name)
+        if Account is None:
+            return
+        if Account is self.__selected:
+            self.__selected = None
+        if Account in self.__key_of: # removed account is one of the accounts currently displayed
+            i = self.__remove_item(Account)
+            self.__update_inactive_page()
+            if self.__virtual:
+                self.__relayout(i)
+        if not self.__virtual:
+            D = self.__Registry.get_display(account_name)
+            if D is not None: # free widgets of deleted account
+                self.__Registry.remove_display(account_name)
+                D.destroy()
 
     def show_accounts(self, account_names:list):
         '''
@@ -135,7 +240,9 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        self.Accounts = [A for A in self.__Accounts if A.get_name() in account_names]
+        # dict.fromkeys drops repeated names but keeps their order
+        self.Accounts = [self.__Registry.get(name) for name in dict.fromkeys(account_names) if name in self.__Registry]
+        self.__filtered = True
         self.repack_accounts()
         self.scroll_frame.canvas.yview_moveto(0)
 
@@ -151,7 +258,8 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        self.Accounts = self.__Accounts
+        self.__filtered = False
+        self.Accounts = self.__Registry.get_accounts()
         self.repack_accounts()
 
     def remove_all_widgets(self):
@@ -165,11 +273,11 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        for A in self.__Accounts:
-            A.pack_forget()
-        for S in self.Separators:
-            S.pack_forget()
-        self.Separators = []
+        for D in self.__Registry.get_displays():
+            D.pack_forget()
+        for S in self.__separators.values():
+            self.__release_separator(S)
+        self.__separators = {}
 
     def pack_accounts(self):
         '''
@@ -183,12 +291,30 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        self.remove_all_widgets()
-        # check if there are no accounts - if so, display inactive Frame
+        if not self.__virtual:
+            self.remove_all_widgets()
+        self.__update_inactive_page()
+
+        if self.__virtual:
+            self.__layout()
+            return
+        last_category = None
+        for Account, category in zip(self.Accounts, self.categories):
+            if category != last_category: # add separator for new category
+                S = self.__get_separator(category)
+                S.pack(side='top', fill='x')
+                self.__separators[Account] = S
+            self.__get_display(Account).pack(side='top', fill='x', padx=self.__row_padx, pady=self.__row_pady)
+            last_category = category
+        # check scroll position at start, scroll back when done
+        # scrolll to position of selected account
+
+    def __update_inactive_page(self):
+        '''private - shows "No Accounts" or "No Search Results" instead of the list when no accounts are displayed'''
         if len(self.Accounts) == 0:
             self.main_page.pack_forget()
             self.inactive_page.pack(fill='both', expand=True)
-            if len(self.__Accounts) == 0: # no accounts exist
+            if len(self.__Registry) == 0: # no accounts exist
                 self.inactive_page.config(text='No Accounts')
             else:
                 self.inactive_page.config(text='No Search Results')
@@ -196,17 +322,6 @@ class AccountsPage(Frame):
             self.inactive_page.pack_forget()
             self.main_page.pack(fill='both', expand=True)
 
-        last_category = None
-        for Account, category in zip(self.Accounts, self.categories):
-            if category != last_category: # add separator for new category
-                S = ListSeparator(self.main_frame, category, self.bg)
-                S.pack(side='top', fill='x')
-                self.Separators.append(S)
-            Account.pack(side='top', fill='x', padx=10, pady=2)
-            last_category = category
-        # check scroll position at start, scroll back when done
-        # scrolll to position of selected account
-
     def repack_accounts(self):
         '''
         Purpose:
@@ -223,14 +338,156 @@ class AccountsPage(Frame):
             if button.selected:
                 button.click_button() # sort accounts, set categories, and pack accounts
                 break
+
+    def update_account(self, Account:Account):
+        '''
+        Purpose:
+            moves Account to its new position in the list after it has been edited
+            only the row of Account and the separators next to it are changed
+        Pre-conditions:
+            :param Account: Account - account that was edited
+        Post-conditions:
+            may change position of Account in display
+        Returns:
+            (none)
+        '''
+        self.refresh_account(Account)
+        if Account not in self.__key_of:
+            return # account is not displayed
+        i = bisect_left(self.__keys, self.__key_of[Account])
+        if self.__order_key(Account) == self.__keys[i] and self.__category_of(Account) == self.categories[i]:
+            return # position and category are unchanged
+        i = self.__remove_item(Account)
+        j = self.__insert_item(Account)
+        if self.__virtual:
+            self.__relayout(min(i, j))
+
+    def __insert_item(self, Account:Account) -> int:
+        '''private - inserts Account into displayed accounts at its sorted position - returns its index'''
+        key = self.__order_key(Account)
+        j = bisect_left(self.__keys, key)
+        self.__keys.insert(j, key)
+        self.Accounts.insert(j, Account)
+        self.categories.insert(j, self.__category_of(Account))
+        self.__key_of[Account] = key
+        if self.__virtual:
+            return j
+        D = self.__get_display(Account)
+        if j + 1 < len(self.Accounts): # pack above the next account (or its separator)
+            after = self.Accounts[j + 1]
+            D.pack(side='top', fill='x', padx=self.__row_padx, pady=self.__row_pady,
+                   before=self.__separators.get(after, self.__get_display(after)))
+        else:
+            D.pack(side='top', fill='x', padx=self.__row_padx, pady=self.__row_pady)
+        # new account may start a category, or split the category of the next account
+        self.__fix_separator(j)
+        self.__fix_separator(j + 1)
+        return j
+
+    def __remove_item(self, Account:Account) -> int:
+        '''private - removes Account from displayed accounts - returns the index it had'''
+        i = bisect_left(self.__keys, self.__key_of.pop(Account))
+        del self.__keys[i]
+        del self.Accounts[i]
+        del self.categories[i]
+        if self.__virtual:
+            return i
+        self.__get_display(Account).pack_forget()
+        if Account in self.__separators:
+            self.__release_separator(self.__separators.pop(Account))
+        # next account may now start its category, or join the previous one
+        self.__fix_separator(i)
+        return i
+
+    def __fix_separator(self, i:int):
+        '''private - adds or removes separator above account i so that each run of a category starts with one'''
+        if i >= len(self.Accounts):
+            return
+        Account, category = self.Accounts[i], self.categories[i]
+        needed = i == 0 or self.categories[i - 1] != category
+        S = self.__separators.get(Account)
+        if needed and S is not None and S.get_text() != category:
+            self.__release_separator(self.__separators.pop(Account)) # replaced by separator with new label
+            S = None
+        if needed and S is None:
+            S = self.__get_separator(category)
+            S.pack(side='top', fill='x', before=self.__get_display(Account))
+            self.__separators[Account] = S
+        elif not needed and S is not None:
+            self.__release_separator(self.__separators.pop(Account))
+
+    def __get_separator(self, label:str) -> ListSeparator:
+        '''private - returns an unused separator with label - from pool if possible, relabelled if none has label'''
+        if len(self.__separator_pool) == 0:
+            return self.__new_separator(label)
+        pooled = label if label in self.__separator_pool else next(iter(self.__separator_pool))
+        S = self.__separator_pool[pooled].pop()
+        if len(self.__separator_pool[pooled]) == 0:
+            del self.__separator_pool[pooled]
+        if pooled != label:
+            S.set_text(label)
+        return S
+
+    def __release_separator(self, S:ListSeparator):
+        '''private - removes separator from list and returns it to pool to be reused'''
+        if self.__virtual:
+            S.place_forget()
+        else:
+            S.pack_forget()
+        self.__separator_pool.setdefault(S.get_text(), []).append(S)
+
+    def count_widgets(self) -> int:
+        '''returns number of widgets in the accounts list (packed or not) - used to check for widget leaks'''
+        count, stack = 0, [self.main_frame]
+        while stack:
+            children = stack.pop().winfo_children()
+            count += len(children)
+            stack.extend(children)
+        return count
     
+    def select_account(self, Account:Account):
+        '''
+        Purpose:
+            selects Account in list and deselects all other accounts
+            does not call select command
+        '''
+        self.deselect_accounts()
+        self.__selected = Account
+        if not self.__virtual:
+            self.__get_display(Account).select()
+        elif self.__Registry.get_display(Account.get_name()) is not None: # account is in view
+            self.__Registry.get_display(Account.get_name()).select()
+
     def deselect_accounts(self):
         '''
         Purpose:
             deselect all accounts in list
         '''
-        for A in self.__Accounts:
-            A.deselect()
+        self.__selected = None
+        for D in self.__Registry.get_displays():
+            D.deselect()
+
+    def refresh_account(self, Account:Account):
+        '''
+        Purpose:
+            updates the display of Account after it has been edited
+            does nothing if Account has no display (it is created up to date when needed)
+        '''
+        D = self.__Registry.get_display(Account.get_name())
+        if D is not None:
+            D.set_account(Account, selected=Account is self.__selected)
+
+    def __get_display(self, Account:Account) -> AccountDisplay:
+        '''returns AccountDisplay of Account - creates it if account has not been displayed yet'''
+        D = self.__Registry.get_display(Account.get_name())
+        if D is None:
+            D = AccountDisplay(self.main_frame, Account.get_name(), Account.get_notes(),
+                               Account.get_category(), Account.get_date(),
+                               self.__select_command, self.__delete_command)
+            if self.__info_width is not None:
+                D.set_info_width(self.__info_width)
+            self.__Registry.set_display(Account.get_name(), D)
+        return D
 
     def deselect_buttons(self):
         '''
@@ -253,10 +510,7 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        self.deselect_buttons()
-        self.Accounts.sort(key=lambda A: A.get_name())
-        self.categories = [A.get_name()[0].upper() for A in self.Accounts] # start letter of each account
-        self.pack_accounts()
+        self.__set_order(name_order, lambda A: A.get_name()[:1].upper()) # start letter of each account
 
     def reorder_type(self):
         '''
@@ -270,12 +524,8 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
-        self.deselect_buttons()
-        # sort by name first so that accounts will be in alphabetical order within each category
-        self.Accounts.sort(key=lambda A: A.get_name())
-        self.Accounts.sort(key=lambda A: A.get_order_category())
-        self.categories = [A.get_category() for A in self.Accounts]
-        self.pack_accounts()
+        # accounts are in alphabetical order within each category
+        self.__set_order(type_order, lambda A: A.get_category())
 
     def reorder_date(self):
         '''
@@ -289,10 +539,242 @@ class AccountsPage(Frame):
         Returns:
             (none)
         '''
+        # accounts are in alphabetical order within each date category
+        self.__set_order(date_order, lambda A: A.get_date_year()) # should get only month or only year
+
+    def reorder_strength(self):
+        '''
+        Purpose:
+            called when 'Strength' order button is clicked
+            reorders accounts from weakest to strongest password
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            changes order of accounts
+        Returns:
+            (none)
+        '''
+        # separators show the strength label - accounts that have not been analyzed yet are last
+        strength = self.__strength_function
+        self.__set_order(lambda A: strength_order(A, strength(A)),
+                         lambda A: strength(A)['label'] if strength(A) is not None else 'Not Analyzed')
+
+    def strengths_changed(self):
+        '''
+        Purpose:
+            called when password strength reports have changed
+            re-sorts accounts if they are ordered by strength
+        '''
+        if self.__order_buttons[-1].selected:
+            self.repack_accounts()
+
+    def __set_order(self, order_key, category_of):
+        '''
+        Purpose:
+            sorts displayed accounts and packs them
+            called when an order button is clicked - and to re-sort all accounts
+        Pre-conditions:
+            :param order_key: 1 argument function (Account) -> tuple - sort key (see name_order)
+            :param category_of: 1 argument function (Account) -> str - category shown by separators
+        Post-conditions:
+            changes order of accounts
+        Returns:
+            (none)
+        '''
         self.deselect_buttons()
-        # sort by name first so that accounts will be in alphabetical order within each date category
-        self.Accounts.sort(key=lambda A: A.get_name())
-        self.Accounts.sort(key=lambda A: A.get_date_year(), reverse=True) # reverse - most recent dates first
-        self.categories = [A.get_date_year() for A in self.Accounts] # should get only month or only year
+        self.__order_key, self.__category_of = order_key, category_of
+        # keys are computed once per account - they are unique, so accounts are never compared
+        items = sorted((order_key(A), A) for A in self.Accounts)
+        self.__keys = [key for key, _ in items]
+        self.Accounts = [A for _, A in items]
+        self.categories = [category_of(A) for A in self.Accounts]
+        self.__key_of = dict(zip(self.Accounts, self.__keys))
         self.pack_accounts()
 
+    def __schedule_resize(self):
+        '''private - called on every resize event - resizes rows once when Tk is next idle'''
+        if not self.__resize_pending:
+            self.__resize_pending = True
+            self.after_idle(self.__resize)
+
+    def __resize(self):
+        '''private - sets info text width of every row - only if list width actually changed'''
+        self.__resize_pending = False
+        width = self.scroll_frame.canvas.winfo_width() - 2 * self.__row_padx - self.__info_margin
+        if width == self.__info_width:
+            return
+        self.__info_width = width
+        for D in self.__rows if self.__virtual else self.__Registry.get_displays():
+            D.set_info_width(width)
+
+    def __on_scroll(self, first, last):
+        '''called by canvas when it is scrolled - updates scrollbar and visible rows'''
+        for S in self.__scrollbars:
+            S.set(first, last)
+        self.update_visible()
+
+    def __new_row(self) -> AccountDisplay:
+        '''creates an empty AccountDisplay row to be recycled in virtual mode'''
+        R = AccountDisplay(self.main_frame, '', '', '', '', self.__select_command,
+                           self.__delete_command)
+        if self.__info_width is not None:
+            R.set_info_width(self.__info_width)
+        self.__rows.append(R)
+        if self.__row_height is None:
+            R.update_idletasks()
+            self.__row_height = R.winfo_reqheight() + 2 * self.__row_pady
+        return R
+
+    def __new_separator(self, label:str='') -> ListSeparator:
+        '''creates a ListSeparator - only called when the separator pool is empty'''
+        S = ListSeparator(self.main_frame, label, self.bg)
+        if self.__separator_height is None:
+            S.update_idletasks()
+            self.__separator_height = S.winfo_reqheight()
+        return S
+
+    def __layout(self):
+        '''
+        Purpose:
+            computes the position of every list item in virtual mode
+            no widgets are created or packed here - only numbers are computed
+            visible rows are then rebound to the accounts in view
+        Pre-conditions:
+            self.Accounts and self.categories must be in display order
+        Post-conditions:
+            changes height of scrollable area and accounts displayed
+        Returns:
+            (none)
+        '''
+        if self.__row_height is None: # measure item heights once
+            self.__free_rows.append(self.__new_row())
+            self.__release_separator(self.__new_separator())
+        # all rows are rebound since account info may have changed
+        for i in list(self.__visible):
+            self.__release(i)
+        self.__items, self.__item_of = self.__build_items(0)
+        self.__offsets = list(accumulate(self.__heights(self.__items), initial=0))
+        self.main_frame.config(height=max(1, self.__offsets[-1]))
+        self.update_visible()
+
+    def __build_items(self, j:int) -> tuple:
+        '''private - returns (items, item index of each account) for accounts from index j on
+        item indexes start after the item of account j - 1'''
+        start = self.__item_of[j - 1] + 1 if j > 0 else 0
+        items, item_of = [], []
+        last_category = self.categories[j - 1] if j > 0 else None
+        for Account, category in zip(self.Accounts[j:], self.categories[j:]):
+            if category != last_category: # separator for new category
+                items.append((None, category))
+            item_of.append(start + len(items))
+            items.append((Account, category))
+            last_category = category
+        return items, item_of
+
+    def __heights(self, items:list) -> list:
+        '''private - returns height (pixels) of each item'''
+        return [self.__separator_height if A is None else self.__row_height for A, _ in items]
+
+    def __relayout(self, j:int):
+        '''
+        Purpose:
+            updates list items after an account was inserted or removed at index j (virtual mode)
+            items above account j are not touched - offsets are only recomputed from there on
+            rows that still show the same account (or category) are only moved to its new
+            position - only rows of items that no longer exist are released, and update_visible
+            binds rows to items that came into view
+        Pre-conditions:
+            :param j: int - lowest index in self.Accounts that changed
+        Post-conditions:
+            changes height of scrollable area and accounts displayed
+        Returns:
+            (none)
+        '''
+        if self.__row_height is None:
+            self.__layout()
+            return
+        t = self.__item_of[j - 1] + 1 if j > 0 else 0 # first item that may change
+        items, item_of = self.__build_items(j)
+        offsets = list(accumulate(self.__heights(items), initial=self.__offsets[t]))
+        # rows keep showing their account (separators their category) at its new index
+        new_index = {category if A is None else A: t + k for k, (A, category) in enumerate(items)}
+        kept = {} # new item index -> (row or separator, old offset)
+        for i in [i for i in self.__visible if i >= t]:
+            A, category = self.__items[i]
+            k = new_index.get(category if A is None else A)
+            if k is None: # item no longer exists - row is recycled
+                self.__release(i)
+            else:
+                kept[k] = (self.__visible.pop(i), self.__offsets[i])
+        self.__items[t:] = items
+        self.__item_of[j:] = item_of
+        self.__offsets[t:] = offsets
+        for k, (W, offset) in kept.items():
+            self.__visible[k] = W
+            if self.__offsets[k] != offset: # moved - not rebound
+                self.__place(k, W)
+        self.main_frame.config(height=max(1, self.__offsets[-1]))
+        self.update_visible()
+
+    def __place(self, i:int, W):
+        '''private - places row or separator W at the position of item i'''
+        if isinstance(W, ListSeparator):
+            W.place(x=0, y=self.__offsets[i], relwidth=1, height=self.__separator_height)
+        else:
+            W.place(x=self.__row_padx, y=self.__offsets[i] + self.__row_pady,
+                    relwidth=1, width=-2 * self.__row_padx,
+                    height=self.__row_height - 2 * self.__row_pady)
+
+    def __release(self, i:int):
+        '''removes row or separator from item i and makes it available for recycling'''
+        W = self.__visible.pop(i)
+        if isinstance(W, ListSeparator):
+            self.__release_separator(W)
+        else:
+            W.place_forget()
+            name = self.__items[i][0].get_name()
+            if self.__Registry.get_display(name) is W:
+                self.__Registry.remove_display(name)
+            self.__free_rows.append(W)
+
+    def update_visible(self):
+        '''
+        Purpose:
+            places rows and separators for the items in the visible area (plus buffer)
+            rows that scrolled out of view are recycled for items that scrolled into view
+            only used in virtual mode
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            changes which accounts are displayed by the recycled rows
+        Returns:
+            (none)
+        '''
+        if not self.__virtual or self.__row_height is None:
+            return
+        canvas = self.scroll_frame.canvas
+        top = canvas.canvasy(0) - self.__buffer_rows * self.__row_height
+        bottom = canvas.canvasy(0) + canvas.winfo_height() + self.__buffer_rows * self.__row_height
+        start = max(0, bisect_right(self.__offsets, top) - 1)
+        end = min(len(self.__items), bisect_right(self.__offsets, bottom))
+        in_view = range(start, end)
+
+        # free rows and separators that are no longer in view
+        for i in [i for i in self.__visible if i not in in_view]:
+            self.__release(i)
+
+        # bind free rows and separators to items that came into view
+        for i in in_view:
+            if i in self.__visible:
+                continue # already displayed
+            Account, category = self.__items[i]
+            if Account is None:
+                S = self.__get_separator(category)
+                self.__place(i, S)
+                self.__visible[i] = S
+            else:
+                R = self.__free_rows.pop() if self.__free_rows else self.__new_row()
+                R.set_account(Account, selected=Account is self.__selected)
+                self.__Registry.set_display(Account.get_name(), R)
+                self.__place(i, R)
+                self.__visible[i] = R
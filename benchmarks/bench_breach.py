@@ -0,0 +1,69 @@
+''' Breached password lookup benchmark
+
+    Generates a sorted binary hash corpus (random SHA-1 hashes, 1 GB by
+    default) and prints the throughput of:
+        - single lookups with and without the fan-out table
+        - batched lookups (contains_many) of a whole vault
+        - the full-vault sweep over a process pool (check_passwords)
+    The corpus is written to a temporary folder and deleted afterwards.
+    The pool sweep only speeds up with more processes on a machine with as
+    many cores - with one core, extra processes only add start-up cost.
+
+        python benchmarks/bench_breach.py [corpus MB] [vault passwords]
+'''
+import numpy as np
+import tempfile, shutil, time, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.breach_checker import BreachCorpus, write_fanout, check_passwords, password_hash, record_size
+
+
+def make_corpus(path:str, n:int, chunk=2 ** 22):
+    '''writes n sorted random hashes to path - each chunk covers the next range of 32 bit prefixes'''
+    rng = np.random.default_rng(0)
+    with open(path, 'wb') as f:
+        chunks = (n + chunk - 1) // chunk
+        for c in range(chunks):
+            size = min(chunk, n - c * chunk)
+            hashes = rng.integers(0, 256, (size, record_size), dtype=np.uint8)
+            prefixes = rng.integers(c * 2 ** 32 // chunks, (c + 1) * 2 ** 32 // chunks, size).astype('>u4')
+            hashes[:, :4] = prefixes.view(np.uint8).reshape(-1, 4)
+            f.write(np.sort(hashes.view(f'S{record_size}').ravel()).tobytes())
+
+def rate(count:int, seconds:float) -> str:
+    '''returns count per second as text'''
+    return f'{count / seconds:>12,.0f} /s'
+
+
+if __name__ == '__main__':
+    size_mb = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    vault = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    folder = tempfile.mkdtemp()
+    path = os.path.join(folder, 'hashes.bin')
+    try:
+        n = size_mb * 2 ** 20 // record_size
+        t0 = time.perf_counter()
+        make_corpus(path, n)
+        print(f'corpus: {n:,} hashes ({size_mb} MB) written in {time.perf_counter() - t0:.1f} s')
+        passwords = [f'password{i}' for i in range(vault)]
+        digests = [password_hash(p) for p in passwords]
+
+        for label in ['no fan-out', 'fan-out']:
+            if label == 'fan-out':
+                write_fanout(path)
+            Corpus = BreachCorpus(path)
+            t0 = time.perf_counter()
+            for d in digests[:5000]:
+                Corpus.contains_hash(d)
+            print(f'{"single (" + label + ")":<28} | {rate(5000, time.perf_counter() - t0)}')
+            t0 = time.perf_counter()
+            Corpus.contains_many(digests)
+            print(f'{"batched (" + label + ")":<28} | {rate(vault, time.perf_counter() - t0)}')
+            del Corpus
+
+        for processes in sorted({1, 2, 4, os.cpu_count()}):
+            t0 = time.perf_counter()
+            check_passwords(path, passwords, processes=processes, chunk_size=max(1, vault // (4 * processes)))
+            print(f'{f"pool sweep ({processes} processes)":<28} | {rate(vault, time.perf_counter() - t0)}')
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
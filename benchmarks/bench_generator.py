@@ -0,0 +1,42 @@
+''' Password generation benchmark
+
+    Prints the throughput of the old generator (random.choice per character)
+    and of password_generator.generate_passwords (secure bytes, one batched
+    numpy pass) for growing numbers of passwords, and the time to stream
+    passwords to a file with write_passwords.
+
+        python benchmarks/bench_generator.py [largest count]
+'''
+import random, time, sys, os, tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.info import ascii_lowercase, ascii_uppercase, digits, punctuation
+from utils.password_generator import generate_passwords, write_passwords
+
+
+def old_generate(characters:str, n:int, min_length:int, max_length:int) -> list:
+    '''generator before bulk mode - one random.choice call per character'''
+    return [''.join([random.choice(characters) for _ in range(random.randint(min_length, max_length))])
+            for _ in range(n)]
+
+def timed(function, *args) -> float:
+    '''returns seconds taken by function(*args)'''
+    t0 = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - t0
+
+
+if __name__ == '__main__':
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    characters = ascii_uppercase + ascii_lowercase + digits + punctuation
+    lengths = (15, 30)
+    print(f'{"passwords":>9} | {"random.choice (/s)":>18} | {"batched (/s)":>12} | {"speedup":>7}')
+    n = 100
+    while n <= largest:
+        old = timed(old_generate, characters, n, *lengths)
+        new = timed(generate_passwords, characters, n, *lengths)
+        print(f'{n:>9} | {n / old:>18,.0f} | {n / new:>12,.0f} | {old / new:>6.1f}x')
+        n *= 10
+    with tempfile.TemporaryFile('w') as f:
+        seconds = timed(write_passwords, f, characters, largest, *lengths)
+    print(f'streamed {largest:,} passwords to file in {seconds:.3f} s ({largest / seconds:,.0f} /s)')
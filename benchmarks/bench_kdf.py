@@ -0,0 +1,24 @@
+''' Key derivation benchmark
+
+    Prints how long scrypt takes on this machine for each cost n, and the
+    cost that vault_crypto.calibrate picks for a target unlock time. A new
+    vault uses the calibrated cost, which is saved in its .meta file.
+
+        python benchmarks/bench_kdf.py [target seconds]
+'''
+import time, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.vault_crypto import derive_keys, calibrate
+
+
+if __name__ == '__main__':
+    target = float(sys.argv[1]) if len(sys.argv) > 1 else 0.5
+    print(f'{"n":>8} | {"memory (MB)":>11} | {"time (s)":>8}')
+    for power in range(14, 21):
+        n = 2 ** power
+        t0 = time.perf_counter()
+        derive_keys('benchmark', os.urandom(16), n, 8, 1)
+        print(f'{n:>8} | {128 * 8 * n / 2 ** 20:>11.0f} | {time.perf_counter() - t0:>8.3f}')
+    params = calibrate(target)
+    print(f'calibrated for {target} s: n={params["n"]}, r={params["r"]}, p={params["p"]} ({params["seconds"]:.3f} s)')
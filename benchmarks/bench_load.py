@@ -0,0 +1,85 @@
+''' Startup benchmark for loading the accounts database
+
+    Compares the old loader (pandas read_csv + iterrows) with the streaming
+    VaultStore loader on generated vaults of 1k, 10k and 100k accounts.
+    Each measurement runs in a fresh interpreter so that import time of the
+    loader (pandas) is included, as it is when the app starts.
+
+    Run from the repository folder:
+        python benchmarks/bench_load.py
+    The old loader needs pandas, which is no longer in requirements.txt - if
+    it is not installed, only the streaming loader is measured.
+'''
+import importlib.util, subprocess, tempfile, json, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.vault_store import fields
+
+
+before = '''
+import time, json
+t0 = time.perf_counter()
+import pandas as pd
+t1 = time.perf_counter()
+from utils.accounts import Account
+t2 = time.perf_counter()
+accounts = []
+df = pd.read_csv(PATH, index_col=0)
+for _, row in df.iterrows():
+    accounts.append(Account(row.name, row.username, row.password,
+                            category=row.category, notes=row.notes, date=row.date))
+t3 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'load': t3 - t2, 'count': len(accounts)}))
+'''
+
+after = '''
+import time, json
+t0 = time.perf_counter()
+from utils.vault_store import VaultStore
+t1 = time.perf_counter()
+from utils.accounts import Account
+t2 = time.perf_counter()
+accounts = []
+for info in VaultStore(PATH).iter_records():
+    accounts.append(Account(info['name'], info['username'], info['password'],
+                            category=info['category'], notes=info['notes'], date=info['date']))
+t3 = time.perf_counter()
+print(json.dumps({'import': t1 - t0, 'load': t3 - t2, 'count': len(accounts)}))
+'''
+
+
+def write_vault(path:str, n:int):
+    '''writes a vault with n generated accounts'''
+    categories = ['Music', 'Personal', 'School', 'Sports', 'Websites', 'Work', 'Other']
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(','.join(fields) + '\n')
+        for i in range(n):
+            f.write(f'Account {i:06d},user{i}@mail.com,{os.urandom(12).hex()},'
+                    f'{categories[i % len(categories)]},"notes for account {i}, with a comma",'
+                    f'{1 + i % 12:0>2}/{1 + i % 28:0>2}/{2000 + i % 24}\n')
+
+def run(code:str, path:str, repeat=3) -> dict:
+    '''runs code in a fresh interpreter and returns the fastest timings'''
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, '-c', f'PATH = {path!r}\n' + code],
+                             cwd=root, capture_output=True, text=True, check=True).stdout
+        results.append(json.loads(out.strip().splitlines()[-1]))
+    return min(results, key=lambda r: r['import'] + r['load'])
+
+
+if __name__ == '__main__':
+    loaders = [('pandas', before), ('streaming', after)]
+    if importlib.util.find_spec('pandas') is None:
+        print('pandas is not installed - only the streaming loader is measured')
+        loaders = loaders[1:]
+    print(f'{"accounts":>9} | {"loader":<10} | {"import (s)":>10} | {"load (s)":>9} | {"total (s)":>9}')
+    with tempfile.TemporaryDirectory() as folder:
+        for n in [1000, 10000, 100000]:
+            path = os.path.join(folder, f'vault_{n}.csv')
+            write_vault(path, n)
+            for label, code in loaders:
+                r = run(code, path)
+                assert r['count'] == n
+                print(f'{n:>9} | {label:<10} | {r["import"]:>10.3f} | {r["load"]:>9.3f} | {r["import"] + r["load"]:>9.3f}')
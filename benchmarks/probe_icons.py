@@ -0,0 +1,95 @@
+''' Icon memory probe
+
+    Creates 10k delete buttons - one per account row - with the plain
+    chichitk IconButton and with CachedIconButton, and prints the number of
+    Tk images, their pixel memory and the Python memory (tracemalloc) per
+    button. Then it builds a 10k account list (pack mode, so every row has
+    a display) and prints the image cost per row, which should be zero.
+
+    Without a display (no Tk), it only measures the work done before Tk:
+    decoding the .png and coloring the 5 images of each button, with
+    IconButton's per-button path and with the shared cache.
+
+    Run from the repository folder:
+        python benchmarks/probe_icons.py
+'''
+from tkinter import Tk, Frame, TclError
+from chichitk import IconButton
+from chichitk.buttons import image_replace_colors
+from PIL import Image
+import tracemalloc, time, sys, os
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.info import colors
+from utils.icons import CachedIconButton, load_icon
+from utils.accounts import Account
+from utils.registry import AccountRegistry
+from accounts_page import AccountsPage
+
+
+def image_bytes(root) -> tuple:
+    '''returns (number of Tk images, bytes of pixels in all Tk images)'''
+    names = root.image_names()
+    size = sum(4 * int(root.tk.call('image', 'width', name)) * int(root.tk.call('image', 'height', name))
+               for name in names)
+    return len(names), size
+
+def measure(root, create, n:int) -> tuple:
+    '''calls create n times and returns (images, image bytes, python bytes) added per call'''
+    images0, bytes0 = image_bytes(root)
+    tracemalloc.start()
+    for _ in range(n):
+        create()
+    python_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    images1, bytes1 = image_bytes(root)
+    return (images1 - images0) / n, (bytes1 - bytes0) / n, python_bytes / n
+
+def measure_decoding(n:int, icon_path:str):
+    '''prints time and retained bytes per button of decoding and coloring icons without Tk'''
+    states = [(colors['background2'], '#ffffff'), (colors['background3'], '#ffffff'), (colors['background2'], '#aaaaaa'),
+              (colors['background3'], '#aaaaaa'), (colors['background2'], colors['inactive_icon'])]
+    def colored(img, bg, fg):
+        return Image.fromarray(image_replace_colors(img.copy(), [('#ffffff', fg), ('#000000', bg)]))
+    cache = {}
+    def cached(bg, fg):
+        if (bg, fg) not in cache:
+            cache[(bg, fg)] = colored(load_icon(icon_path), bg, fg)
+        return cache[(bg, fg)]
+    print(f'no display - decoding and coloring only, {n} buttons')
+    print(f'{"per button":<22} | {"time (us)":>9} | {"retained bytes":>14}')
+    for label, create in [('IconButton', lambda: [colored(cv2.imread(icon_path), bg, fg) for bg, fg in states]),
+                          ('CachedIconButton', lambda: [cached(bg, fg) for bg, fg in states])]:
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        kept = [create() for _ in range(n)] # buttons keep their images
+        seconds = time.perf_counter() - t0
+        python_bytes = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        # pixels of PIL images are not traced - counted once per distinct image
+        pixels = sum(4 * img.width * img.height for img in {id(img): img for imgs in kept for img in imgs}.values())
+        print(f'{label:<22} | {1e6 * seconds / n:>9.1f} | {(python_bytes + pixels) / n:>14.0f}')
+
+
+if __name__ == '__main__':
+    n = 10000
+    try:
+        root = Tk()
+    except TclError:
+        measure_decoding(n, os.path.join('icons', 'delete.png'))
+        sys.exit()
+    print(f'{"per button":<22} | {"images":>7} | {"image bytes":>11} | {"python bytes":>12}')
+    for label, cls in [('IconButton', IconButton), ('CachedIconButton', CachedIconButton)]:
+        frame = Frame(root)
+        per = measure(root, lambda: cls(frame, 'icons\\delete.png', lambda: None, bar_height=0,
+                                        selectable=False), n)
+        print(f'{label:<22} | {per[0]:>7.2f} | {per[1]:>11.0f} | {per[2]:>12.0f}')
+        frame.destroy()
+
+    Registry = AccountRegistry([Account(f'Account {i:05d}', '', '', notes=f'notes {i}') for i in range(n)])
+    Page = AccountsPage(root, colors['background2'], lambda name: None, lambda name: None,
+                        Registry, virtual=False)
+    per = measure(root, lambda: Page.add_accounts(Registry.get_accounts()), 1)
+    print(f'{"10k account list":<22} | images per row: {per[0] / n:.4f} | image bytes per row: {per[1] / n:.1f}')
+    root.destroy()
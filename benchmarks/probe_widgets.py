@@ -0,0 +1,63 @@
+''' Widget leak probe for the accounts list
+
+    Repacks the accounts list 10k times, alternating the sort order and the
+    search results shown, and prints the number of widgets in the list and
+    the Python memory in use every 1000 repacks. It runs the virtual list
+    used by the app and then pack mode. Both should stay flat: separators
+    are reused from a pool instead of being created on every repack.
+
+    Needs a display (Tk), run from the repository folder:
+        python benchmarks/probe_widgets.py
+'''
+from tkinter import Tk
+import tracemalloc, random, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.info import colors
+from utils.accounts import Account
+from utils.registry import AccountRegistry
+from accounts_page import AccountsPage
+
+
+def make_accounts(n:int) -> list:
+    '''returns n generated accounts'''
+    categories = ['Music', 'Personal', 'School', 'Sports', 'Websites', 'Work', 'Other']
+    return [Account(f'{chr(65 + i % 26)}ccount {i:04d}', f'user{i}@mail.com', '',
+                    category=categories[i % len(categories)], notes=f'notes for account {i}',
+                    date=f'01/01/{2000 + i % 24}') for i in range(n)]
+
+def probe(repacks=10000, n=200, every=1000, virtual=True):
+    '''repacks accounts list and prints widget count and memory every "every" repacks'''
+    root = Tk()
+    Registry = AccountRegistry(make_accounts(n))
+    Page = AccountsPage(root, colors['background2'], lambda name: None, lambda name: None,
+                        Registry, virtual=virtual)
+    Page.pack(fill='both', expand=True)
+    Page.add_accounts(Registry.get_accounts())
+    names = Registry.get_names()
+    orders = [Page.reorder_name, Page.reorder_type, Page.reorder_date]
+
+    random.seed(0)
+    tracemalloc.start()
+    counts = []
+    print('virtual list' if virtual else 'pack mode')
+    print(f'{"repacks":>8} | {"widgets":>8} | {"memory (KB)":>11}')
+    for i in range(1, repacks + 1):
+        if i % 2 == 0: # like a search keystroke
+            Page.show_accounts(random.sample(names, random.randint(1, n)))
+        else: # like an order button click
+            orders[i % 3]()
+        if i % every == 0:
+            root.update()
+            counts.append(Page.count_widgets())
+            print(f'{i:>8} | {counts[-1]:>8} | {tracemalloc.get_traced_memory()[0] / 1024:>11.1f}')
+    tracemalloc.stop()
+    root.destroy()
+    return counts
+
+
+if __name__ == '__main__':
+    for virtual in (True, False):
+        counts = probe(virtual=virtual)
+        # the pool only grows until it can cover the most separators ever shown at once
+        print('widget count flat:', counts[-1] == counts[len(counts) // 2])
@@ -0,0 +1,347 @@
+''' Command line interface for the accounts database - no Tk
+
+    Uses the same storage (VaultStore) and encoding (EncodingManager) as the
+    app, so changes made here are seen by the app and the other way around.
+    The login password and encryption key are read from the PM_PASSWORD and
+    PM_KEY environment variables, or asked for when they are not set.
+
+        python cli.py list [query]
+        python cli.py show NAME [--reveal]
+        python cli.py add NAME [--username U] [--password P] [--category C] [--notes N]
+        python cli.py update NAME [--name NEW] [--username U] [--password P] [--category C] [--notes N]
+        python cli.py delete NAME
+        python cli.py export PATH [--format csv|json]
+        python cli.py import PATH [--profile P] [--collisions rename|skip|overwrite]
+        python cli.py batch < commands.txt
+
+    Batch mode unlocks the vault once and runs one command per line of stdin.
+'''
+from argparse import ArgumentParser
+from datetime import datetime
+from getpass import getpass
+import shlex, json, csv, sys, os
+
+from utils.info import database_path
+try:
+    from utils.encoding import EncodingManager # private legacy encoding - subclass of encoding_manager.EncodingManager
+except ImportError: # git version
+    from utils.encoding_manager import EncodingManager
+from utils.accounts import Account
+from utils.vault_store import VaultStore, fields
+from utils.registry import AccountRegistry
+from utils.text_index import FullTextIndex
+from utils.importer import AccountImporter, profiles, collision_policies
+
+
+class VaultSession:
+    ''' Accounts database opened without the app
+
+        Follows the same steps as App: accounts are streamed from the store
+        into a registry, the encoding manager is unlocked with the login
+        password and encryption key, and every change is appended to the
+        store journal with only the fields that changed.
+    '''
+    def __init__(self, path:str=database_path):
+        '''
+        Parameters
+        ----------
+            :param path: str - path to accounts database
+        '''
+        self.__EncodingManager = EncodingManager(meta_path=path + '.meta') # key file of this database, not the default one
+        self.__Store = VaultStore(path)
+        self.__Registry = AccountRegistry()
+        self.__TextIndex = None # FullTextIndex - only built when a query is searched
+        if self.__Store.exists():
+            for old, new in self.__Store.fix_duplicate_names(): # older versions could save accounts with the same name
+                print(f'renamed duplicate account "{old}" to "{new}"', file=sys.stderr)
+            for info in self.__Store.iter_records():
+                A = Account(info['name'], info['username'], info['password'],
+                            category=info['category'], notes=info['notes'], date=info['date'])
+                self.__Store.track(A)
+                self.__Registry.add(A)
+
+    def unlock(self, password:str, key:str) -> bool:
+        '''
+        Purpose:
+            checks login password and unlocks encoding manager - same checks as App.login
+        Pre-conditions:
+            :param password: str - login password
+            :param key: str - encryption key
+        Post-conditions:
+            re-saves legacy passwords in the encrypted format (as App does at login)
+        Returns:
+            :return: bool - True if login password and key are correct
+        '''
+        if password != self.__EncodingManager.raw_decode('wYe[+t') or key == '':
+            return False
+        if not self.__EncodingManager.unlock(key, [A.get_password() for A in self.__Registry.get_accounts()]):
+            return False
+        self.__EncodingManager.initiate_chars(key)
+        legacy = [A for A in self.__Registry.get_accounts() if not self.__EncodingManager.is_current(A.get_password())]
+        if len(legacy) > 0:
+            passwords = self.__EncodingManager.decode_passwords(legacy)
+            for A, password in zip(legacy, self.__EncodingManager.encode_many(passwords, [A.get_name() for A in legacy])):
+                A.set_password(password)
+                self.__Store.upsert(A)
+        return True
+
+    def get(self, name:str) -> Account:
+        '''returns account with name - raises KeyError if there is none'''
+        A = self.__Registry.get(name)
+        if A is None:
+            raise KeyError(f'No account named "{name}"')
+        return A
+
+    def search(self, query:str, max_results:int=50) -> list:
+        '''returns accounts matching query (best first) - all accounts by name if query is empty'''
+        if query == '':
+            return sorted(self.__Registry.get_accounts(), key=lambda A: A.get_name())
+        if self.__TextIndex is None:
+            self.__TextIndex = FullTextIndex()
+            self.__TextIndex.add_many(self.__Registry.get_accounts())
+        return self.__TextIndex.search(query, max_results)
+
+    def get_info(self, Account:Account, reveal=False) -> dict:
+        '''returns info dictionary of Account - password is decoded if reveal is True, else hidden'''
+        info = Account.get_info_dict()
+        info['password'] = self.__EncodingManager.decode(info['password'], info['name']) if reveal else '*' * 8
+        return info
+
+    def add(self, name:str, username='', password='', category='Other', notes='') -> Account:
+        '''
+        Purpose:
+            creates a new account and saves it
+        Pre-conditions:
+            :param name: str - account name - must not be used by another account
+            :param username, password, category, notes: str - account fields - password is not encoded
+        Post-conditions:
+            appends account to database journal
+        Returns:
+            :return: Account - new account
+        '''
+        if name == '' or name in self.__Registry:
+            raise ValueError(f'Account name "{name}" is empty or already used')
+        A = Account(name, username, self.__EncodingManager.encode(password, name), category=category,
+                    notes=notes, date=datetime.now().strftime('%m/%d/%Y'))
+        self.__Registry.add(A)
+        if self.__TextIndex is not None:
+            self.__TextIndex.add(A)
+        self.__Store.upsert(A)
+        return A
+
+    def update(self, name:str, changes:dict) -> list:
+        '''
+        Purpose:
+            changes fields of an account and saves only the fields that changed
+        Pre-conditions:
+            :param name: str - name of account to change
+            :param changes: dict - field -> new text - fields are keys of Account.get_info_dict() except date
+                            password is not encoded
+        Post-conditions:
+            appends changed fields to database journal
+        Returns:
+            :return: list of str - fields that changed
+        '''
+        A = self.get(name)
+        new_name = changes.get('name', name)
+        if new_name != name and (new_name == '' or new_name in self.__Registry):
+            raise ValueError(f'Account name "{new_name}" is empty or already used')
+        setters = {'name': A.set_name, 'username': A.set_username, 'password': A.set_password,
+                   'category': A.set_category, 'notes': A.set_notes}
+        info = self.get_info(A, reveal=True)
+        changed = [field for field in sorted(changes) if changes[field] != info[field]] # unchanged fields are not written
+        written = list(changed)
+        if 'name' in changed and 'password' not in changed:
+            written.append('password') # password is encoded with the account name - encoded again under new name
+        for field in written:
+            text = changes.get(field, info[field])
+            setters[field](self.__EncodingManager.encode(text, new_name) if field == 'password' else text)
+        if len(written) > 0:
+            self.__Store.upsert(A, written)
+        return changed
+
+    def delete(self, name:str):
+        '''deletes account with name from database'''
+        A = self.get(name)
+        self.__Registry.remove(A)
+        if self.__TextIndex is not None:
+            self.__TextIndex.remove(A)
+        self.__Store.delete(A)
+
+    def import_file(self, file, profile:str=None, collisions='rename') -> dict:
+        '''
+        Purpose:
+            imports accounts from the csv export of another password manager
+            new and changed accounts are saved in one database transaction
+        Pre-conditions:
+            :param file: readable text file object
+            :param profile: str or None - name of import profile - detected if None
+            :param collisions: str - what to do with names that are already used (see AccountImporter)
+        Post-conditions:
+            appends one line to database journal
+        Returns:
+            :return: dict - result of AccountImporter.read
+        '''
+        result = AccountImporter(self.__EncodingManager, self.__Registry, collisions).read(file, profile)
+        setters = lambda A: {'username': A.set_username, 'password': A.set_password,
+                             'category': A.set_category, 'notes': A.set_notes}
+        for A, changes in result['updated'].items():
+            for field, text in changes.items():
+                setters(A)[field](text)
+        for A in result['added']:
+            self.__Registry.add(A)
+            if self.__TextIndex is not None:
+                self.__TextIndex.add(A)
+        self.__Store.upsert_many(result['added'] + list(result['updated']),
+                                 {A: list(changes) for A, changes in result['updated'].items()})
+        return result
+
+    def export(self, file, format='csv'):
+        '''
+        Purpose:
+            writes every account with its decoded password to file
+        Pre-conditions:
+            :param file: writable text file object
+            :param format: str - 'csv' (same columns as database) or 'json' (list of info dictionaries)
+        Post-conditions:
+            writes to file
+        Returns:
+            :return: int - number of accounts written
+        '''
+        accounts = sorted(self.__Registry.get_accounts(), key=lambda A: A.get_name())
+        infos = [A.get_info_dict() for A in accounts]
+        for info, password in zip(infos, self.__EncodingManager.decode_passwords(accounts)):
+            info['password'] = password
+        if format == 'json':
+            json.dump(infos, file, indent=2)
+            file.write('\n')
+        else:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(infos)
+        return len(infos)
+
+
+def get_parser() -> ArgumentParser:
+    '''returns parser of all commands - also used for each line in batch mode'''
+    parser = ArgumentParser(prog='cli.py', description='Password manager without the app')
+    parser.add_argument('--database', default=database_path, help='path to accounts database')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    search = commands.add_parser('list', help='list accounts - all accounts, or the best matches of a query')
+    search.add_argument('query', nargs='*', help='search words')
+    search.add_argument('--max', type=int, default=50, help='maximum number of search results')
+
+    show = commands.add_parser('show', help='show every field of an account')
+    show.add_argument('name')
+    show.add_argument('--reveal', action='store_true', help='show decoded password')
+
+    for command, description in [('add', 'create an account'), ('update', 'change fields of an account')]:
+        sub = commands.add_parser(command, help=description)
+        sub.add_argument('name')
+        if command == 'update':
+            sub.add_argument('--name', dest='new_name', help='new account name')
+        for field in ['username', 'password', 'category', 'notes']:
+            sub.add_argument(f'--{field}')
+
+    delete = commands.add_parser('delete', help='delete an account')
+    delete.add_argument('name')
+
+    export = commands.add_parser('export', help='write every account with decoded passwords - "-" writes to stdout')
+    export.add_argument('path')
+    export.add_argument('--format', choices=['csv', 'json'], default='csv')
+
+    load = commands.add_parser('import', help='import accounts from the csv export of another password manager')
+    load.add_argument('path')
+    load.add_argument('--profile', choices=list(profiles), help='export format - detected from csv header by default')
+    load.add_argument('--collisions', choices=collision_policies, default='rename',
+                      help='what to do with accounts whose names are already used')
+
+    commands.add_parser('batch', help='run one command per line of stdin')
+    return parser
+
+def run_command(Session:VaultSession, args):
+    '''runs one parsed command (other than batch) - output is printed to stdout'''
+    if args.command == 'list':
+        for A in Session.search(' '.join(args.query), args.max):
+            print(f'{A.get_name()}\t{A.get_category()}\t{A.get_username()}')
+    elif args.command == 'show':
+        for field, value in Session.get_info(Session.get(args.name), args.reveal).items():
+            print(f'{field}: {value}')
+    elif args.command == 'add':
+        Session.add(args.name, *[getattr(args, f) or d for f, d in
+                                 [('username', ''), ('password', ''), ('category', 'Other'), ('notes', '')]])
+        print(f'added {args.name}')
+    elif args.command == 'update':
+        changes = {f: getattr(args, f) for f in ['username', 'password', 'category', 'notes']
+                   if getattr(args, f) is not None}
+        if args.new_name is not None:
+            changes['name'] = args.new_name
+        changed = Session.update(args.name, changes)
+        print(f'updated {args.name}: {", ".join(changed) if changed else "no changes"}')
+    elif args.command == 'delete':
+        Session.delete(args.name)
+        print(f'deleted {args.name}')
+    elif args.command == 'export':
+        if args.path == '-':
+            count = Session.export(sys.stdout, args.format)
+        else:
+            with open(args.path, 'w', newline='', encoding='utf-8') as f:
+                count = Session.export(f, args.format)
+        print(f'exported {count} accounts', file=sys.stderr)
+    elif args.command == 'import':
+        with open(args.path, 'r', newline='', encoding='utf-8-sig') as f:
+            result = Session.import_file(f, args.profile, args.collisions)
+        print(f'imported {len(result["added"])} accounts from {result["profile"]} export - '
+              f'{len(result["updated"])} overwritten, {result["renamed"]} renamed, {result["skipped"]} skipped')
+
+def run_batch(Session:VaultSession, parser:ArgumentParser, lines) -> int:
+    '''runs one command per line - blank lines and lines starting with # are skipped - returns number of errors'''
+    errors = 0
+    for number, line in enumerate(lines, start=1):
+        words = shlex.split(line, comments=True)
+        if len(words) == 0:
+            continue
+        try:
+            args = parser.parse_args(words)
+            if args.command == 'batch':
+                raise ValueError('batch cannot be nested')
+            run_command(Session, args)
+        except SystemExit: # argparse already printed the error
+            errors += 1
+        except (KeyError, ValueError, OSError) as e:
+            print(f'line {number}: {e.args[0] if e.args else e}', file=sys.stderr)
+            errors += 1
+    return errors
+
+def main(argv:list=None) -> int:
+    '''parses arguments, unlocks vault and runs command - returns exit code'''
+    parser = get_parser()
+    args = parser.parse_args(argv)
+    Session = VaultSession(args.database)
+    password = os.environ.get('PM_PASSWORD')
+    if password is None:
+        password = getpass('Password: ')
+    key = os.environ.get('PM_KEY')
+    if key is None:
+        key = getpass('Encryption Key: ')
+    try:
+        unlocked = Session.unlock(password, key)
+    except ValueError as e: # key file is missing - vault cannot be unlocked
+        print(e.args[0], file=sys.stderr)
+        return 2
+    if not unlocked:
+        print('Incorrect password or encryption key', file=sys.stderr)
+        return 2
+    if args.command == 'batch':
+        return 1 if run_batch(Session, parser, sys.stdin) > 0 else 0
+    try:
+        run_command(Session, args)
+    except (KeyError, ValueError, OSError) as e:
+        print(e.args[0] if e.args else e, file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
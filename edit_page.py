@@ -6,22 +6,33 @@ from utils.info import colors, font_name_bold, font_size_header
 from utils.accounts import Account
 from utils.entry_field import EntryField, BoxField
 from utils.encoding_manager import EncodingManager
+from utils.registry import AccountRegistry
+from utils.field_cache import FieldCache
+from utils.reuse_index import ReuseIndex
+from utils.breach_checker import BreachCorpus
+from utils.icons import load_icon
 
 
 class EditPage(Frame):
     def __init__(self, master, bg, EncodingManager:EncodingManager,
-                 save_function, account_names_function,
-                 inactive_fg=colors['inactive_icon'],
+                 save_function, Registry:AccountRegistry, ReuseIndex:ReuseIndex,
+                 Breaches:BreachCorpus=None, inactive_fg=colors['inactive_icon'],
                  top_bg=colors['background1'], top_hover_bg='#aaaaaa',
                  entry_bg=colors['background4'], header_fg='#ffffff',
-                 entry_width=38):
+                 entry_width=38, cache_size=64, cache_ttl=60):
         '''page to edit properties of existing account or create new account'''
         Frame.__init__(self, master, bg=bg)
-        self.__save_function = save_function # saves accounts to database and repacks AccountsPage
+        self.__save_function = save_function # 2 argument function (Account, list of changed fields) - saves account to database and moves it in AccountsPage
         self.__EncodingManager = EncodingManager
+        self.__ReuseIndex = ReuseIndex # keyed hashes of all passwords - updated when a password is saved
+        self.__Breaches = Breaches # breached password hashes - None if there is no breached password file
         self.__Account: Account = None # Account object if an account is loaded
         self.__active = False # True when an account is loaded
         self.__editing = False # True when the current account is being edited
+        self.__FieldCache = FieldCache(cache_size, cache_ttl) # decrypted passwords - cleared at lockout
+        self.__saved = {} # field -> text of field when account was loaded
+        self.__changed = set() # fields whose text differs from saved text - updated as fields are edited
+        self.__loading = False # True while show_account fills in fields
 
         self.inactive_page = Label(self, text='No Account Selected', bg=bg,
                                    fg=inactive_fg, font=(font_name_bold, font_size_header))
@@ -30,12 +41,12 @@ class EditPage(Frame):
         # Main Page
         self.main_page = Frame(self, bg=bg)
 
-        cf = lambda s: self.__Account == None or s == self.__Account.get_name() or s not in account_names_function()
+        cf = lambda s: self.__Account == None or s == self.__Account.get_name() or s not in Registry # account names must be unique
         self.__Name = EditLabel(self.main_page, 'Account Name', bg=top_bg,
                                 hover_bg=top_hover_bg, fg=header_fg,
                                 editable=self.__editing, font_name=font_name_bold,
                                 font_size=font_size_header, justify='center',
-                                check_function=cf)
+                                check_function=cf, callback=lambda s: self.__field_modified('name'))
         self.__Name.pack(side='top', fill='x')
 
         self.__Username = EntryField(self.main_page, 'Username', bg, entry_bg,
@@ -55,14 +66,22 @@ class EditPage(Frame):
                                 entry_width=entry_width + 4, entry_height=4, wrap='word')
         self.__Notes.pack(side='top', fill='both', expand=True)
 
-        self.Button = DoubleIconButton(self.main_page, 'icons\\edit.png',
-                                       'icons\\save.png', self.to_edit, self.save,
+        self.Button = DoubleIconButton(self.main_page, load_icon('icons\\edit.png'),
+                                       load_icon('icons\\save.png'), self.to_edit, self.save,
                                        label1='Edit', label2='Save',
                                        popup_label1='Edit Fields',
                                        popup_label2='Save Account',
                                        inactive_bg=bg)
         self.Button.pack(side='bottom', pady=8)
 
+        # fields report their own changes - unsaved_changes() does not need to read every field
+        self.__getters = {'name': self.__Name.get, 'username': self.__Username.get_text,
+                          'password': self.__Password.get_text, 'category': self.__Category.get_text,
+                          'notes': self.__Notes.get_text}
+        for field, Field in [('username', self.__Username), ('password', self.__Password),
+                             ('category', self.__Category), ('notes', self.__Notes)]:
+            Field.bind_modified(lambda field=field: self.__field_modified(field))
+
         # Set Tab order - doesnt work - there is an automatic tab order
         # self.__Username.get_entry().bind("<Tab>", lambda e: self.__Password.get_entry().focus())
         # self.__Password.get_entry().bind("<Tab>", lambda e: self.__Category.get_entry().focus())
@@ -139,13 +158,40 @@ class EditPage(Frame):
                 messagebox.showerror(title='Incomplete Field', message=message.format(label))
                 return # cannot save with empty fields
         self.to_static()
-        if self.unsaved_changes():
-            self.__Account.set_name(self.__Name.get())
-            self.__Account.set_username(self.__Username.get_text())
-            self.__Account.set_password(self.__EncodingManager.encode(self.__Password.get_text()))
-            self.__Account.set_category(self.__Category.get_text())
-            self.__Account.set_notes(self.__Notes.get_text())
-            self.__save_function()
+        self.__field_modified('name') # name label is committed by to_static() without a callback
+        changed = self.changed_fields()
+        if len(changed) == 0:
+            return
+        setters = {'name': self.__Account.set_name, 'username': self.__Account.set_username,
+                   'password': self.__Account.set_password, 'category': self.__Account.set_category,
+                   'notes': self.__Account.set_notes}
+        reused = [] # other accounts with the same password as the new password
+        breached = False # True if the new password is in the breached password file
+        texts = {field: self.__getters[field]() for field in changed}
+        if 'name' in changed and 'password' not in changed and self.__decode_password() is not None:
+            # password is encoded with the account name - it is encoded again under the new name
+            # (an unreadable password is kept as it is)
+            texts['password'] = self.__decode_password()
+            changed.append('password')
+        for field in changed: # only changed fields are written to account and database
+            text = texts[field]
+            if field == 'password':
+                if field in self.__changed: # new password - not only encoded again for a new name
+                    reused = self.__ReuseIndex.update(self.__Account, text)
+                    breached = self.__Breaches is not None and self.__Breaches.contains_password(text)
+                password = self.__EncodingManager.encode(text, texts.get('name', self.__Account.get_name()))
+                self.__FieldCache.put((self.__Account, 'password', password), text)
+                text = password
+            setters[field](text)
+        self.__reset_changes()
+        self.__save_function(self.__Account, changed)
+        if len(reused) > 0:
+            names = '\n'.join(A.get_name() for A in reused)
+            m = f'This password is also used by {len(reused)} other account(s):\n{names}'
+            messagebox.showwarning(title='Reused Password', message=m)
+        if breached:
+            m = 'This password appears in a list of breached passwords. It should be changed.'
+            messagebox.showwarning(title='Breached Password', message=m)
 
     def show_account(self, Account:Account):
         '''
@@ -169,12 +215,20 @@ class EditPage(Frame):
         # update fields
         bg = self.__Account.get_color()
         info = self.__Account.get_info_dict()
+        self.__loading = True # fields are not changed by user
         self.__Name.set_bg(bg, hover_bg=brighten(bg, 0.1))
         self.__Name.set_text(info['name'])
         self.__Username.set_text(info['username'])
-        self.__Password.set_text(self.__EncodingManager.decode(info['password']))
+        password = self.__decode_password()
+        self.__Password.set_text('' if password is None else password)
         self.__Category.set_text(info['category'])
         self.__Notes.set_text(info['notes'])
+        self.__loading = False
+        self.__reset_changes()
+        if password is None:
+            m = (f'The password of {info["name"]} could not be decrypted - it was changed or encrypted '
+                 'with another key. Saving a new password replaces it.')
+            messagebox.showwarning(title='Unreadable Password', message=m)
         
     def unsaved_changes(self):
         '''
@@ -187,21 +241,51 @@ class EditPage(Frame):
         Returns:
             :return: bool - True if there are unsaved changes, otherwise False
         '''
-        if self.__Account == None:
-            return False
-        # check each entry box which each attribute of __Account
-        info = self.__Account.get_info_dict()
-        if self.__Name.get() != info['name']:
-            return True
-        if self.__Username.get_text() != info['username']:
-            return True
-        if self.__Password.get_text() != self.__EncodingManager.decode(info['password']):
-            return True
-        if self.__Category.get_text() != info['category']:
-            return True
-        if self.__Notes.get_text() != info['notes']:
-            return True
-        return False
+        return self.__Account != None and len(self.__changed) > 0
+
+    def changed_fields(self) -> list:
+        '''
+        Purpose:
+            gets fields that were changed since account was loaded or saved
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of str - changed fields (keys of Account.get_info_dict())
+        '''
+        return sorted(self.__changed)
+
+    def __field_modified(self, field:str):
+        '''private - called when text of field changes - compares only that field with its saved text'''
+        if self.__loading or self.__Account == None:
+            return
+        if self.__getters[field]() != self.__saved[field]:
+            self.__changed.add(field)
+        else:
+            self.__changed.discard(field)
+
+    def __reset_changes(self):
+        '''private - current text of every field becomes its saved text'''
+        self.__saved = {field: get() for field, get in self.__getters.items()}
+        self.__changed = set()
+
+    def __decode_password(self):
+        '''private - returns decrypted password of current account - cached so repeated views do not decrypt again
+        returns None if the password fails authentication (changed or encrypted with another key)'''
+        key = (self.__Account, 'password', self.__Account.get_password())
+        password = self.__FieldCache.get(key)
+        if password is None:
+            try:
+                password = self.__EncodingManager.decode(key[2], self.__Account.get_name())
+            except ValueError:
+                return None
+            self.__FieldCache.put(key, password)
+        return password
+
+    def clear_cache(self):
+        '''removes all decrypted fields from cache - called at lockout'''
+        self.__FieldCache.clear()
 
     def get_active_account(self):
         '''
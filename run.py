@@ -1,23 +1,31 @@
-from tkinter import Tk, Frame, Label, messagebox
-from chichitk import IconButton, ToggleIconButton
+from tkinter import Tk, Frame, Label, messagebox, filedialog
+from chichitk import ToggleIconButton
 from datetime import datetime
-import pandas as pd
+from threading import Thread
 import os
 
-from utils.info import colors, font_name, font_size_normal, database_path
+from utils.info import colors, font_name, font_size_normal, database_path, breach_path
 from utils.search_bar import SearchBar
 from utils.timeout_bar import TimeoutBar
+from utils.activity_monitor import ActivityMonitor
 from utils.generator import GeneratorFrame
-from utils.encoding import EncodingManager # use encoding_manager for git
-from utils.accounts import Account, AccountDisplay
+try:
+    from utils.encoding import EncodingManager # private legacy encoding - subclass of encoding_manager.EncodingManager
+except ImportError: # git version
+    from utils.encoding_manager import EncodingManager
+from utils.accounts import Account
+from utils.vault_store import VaultStore
+from utils.text_index import FullTextIndex
+from utils.registry import AccountRegistry
+from utils.strength_analyzer import StrengthAnalyzer
+from utils.reuse_index import ReuseIndex
+from utils.breach_checker import BreachCorpus, check_passwords
+from utils.importer import AccountImporter
+from utils.icons import CachedIconButton, load_icon
 from accounts_page import AccountsPage
 from edit_page import EditPage
 from login_page import LoginPage
 
-# BUG
-#   If an account is added while logged in with the wrong encryption key,
-#   it will be encoded incorrectly - it can never be retrived
-
 class App(Tk):
     def __init__(self, w_fact=0.6, h_fact=0.75, header_footer_bg=colors['background0']):
         self.__unsaved_message = 'There are unsaved changes to the current account. Loading a new account will discard unsaved changes. Do you want to load new account anyway?'
@@ -35,6 +43,20 @@ class App(Tk):
         self.geometry(f'{w}x{h}+{sw // 2 - w // 2}+{sh // 2 - h // 2 - 15}')
 
         self.__EncodingManager = EncodingManager()
+        self.__Store = VaultStore(database_path)
+        self.__TextIndex = FullTextIndex() # words in name, username, category and notes
+        self.__Registry = AccountRegistry() # accounts and displays by account name
+        # password strength is measured on a background thread - decoded passwords never leave it
+        self.__Analyzer = StrengthAnalyzer(self.__EncodingManager.decode_passwords)
+        self.__watching_analysis = False # True while an after() loop polls analyzer progress
+        self.__ReuseIndex = ReuseIndex() # accounts by keyed hash of password - built at login
+        self.__Breaches = None # BreachCorpus - memory-mapped - None if there is no usable breached password file
+        if os.path.exists(breach_path):
+            try:
+                self.__Breaches = BreachCorpus(breach_path)
+            except (OSError, ValueError): # empty or truncated file - app runs without breach checks
+                pass
+        self.__breach_sweep = None # list of results of the running breach sweep - [] until it is done
 
         # Login Window
         self.LoginPage = LoginPage(self, self.login, self.destroy, max_attempts=5)
@@ -49,19 +71,25 @@ class App(Tk):
         self.SearchBar = SearchBar(header_frame, [],
                                    lambda l: self.AccountsPage.show_accounts(l),
                                    lambda: self.AccountsPage.show_all_accounts(),
-                                   bg=header_footer_bg)
+                                   bg=header_footer_bg, text_index=self.__TextIndex)
         self.SearchBar.pack(side='left')
-        self.NewButton = IconButton(header_frame, 'icons\\plus.png',
+        self.NewButton = CachedIconButton(header_frame, 'icons\\plus.png',
                                     self.new_account, label='New', bar_height=0,
                                     popup_label='Create New Account',
                                     selectable=False,
                                     inactive_bg=header_footer_bg, padx=2)
         self.NewButton.pack(side='right')
+        ImportButton = CachedIconButton(header_frame, 'icons\\arrow_down.png',
+                                        self.import_accounts, label='Import', bar_height=0,
+                                        popup_label='Import Accounts From CSV Export',
+                                        selectable=False,
+                                        inactive_bg=header_footer_bg, padx=2)
+        ImportButton.pack(side='right')
 
         # Footer
         footer_frame = Frame(self.home_frame, bg=header_footer_bg)
         footer_frame.pack(side='bottom', fill='x')
-        self.GeneratorButton = ToggleIconButton(footer_frame, 'icons\\edit.png',
+        self.GeneratorButton = ToggleIconButton(footer_frame, load_icon('icons\\edit.png'),
                                                 self.toggle_generator_frame,
                                                 label='Password Generator',
                                                 popup_label='Open/Close Password Generator',
@@ -72,13 +100,30 @@ class App(Tk):
                                    fg=colors['inactive_icon'],
                                    font=(font_name, font_size_normal))
         self.timeout_label.pack(side='right', padx=3)
-        LockButton = IconButton(footer_frame, 'icons\\lock.png', self.lockout,
+        self.analysis_label = Label(footer_frame, text='', bg=header_footer_bg,
+                                    fg=colors['inactive_icon'],
+                                    font=(font_name, font_size_normal))
+        self.analysis_label.pack(side='left', padx=3)
+        LockButton = CachedIconButton(footer_frame, 'icons\\lock.png', self.lockout,
                                 popup_label='Lock', bar_height=0,
                                 selectable=False, inactive_bg=header_footer_bg)
         LockButton.pack(side='right')
+        ReusedButton = CachedIconButton(footer_frame, 'icons\\copy.png', self.show_reused_passwords,
+                                        label='Reused Passwords', bar_height=0,
+                                        popup_label='List Accounts That Share a Password',
+                                        selectable=False, inactive_bg=header_footer_bg)
+        ReusedButton.pack(side='right')
+        BreachButton = CachedIconButton(footer_frame, 'icons\\lock.png', self.check_breaches,
+                                        label='Breach Check', bar_height=0,
+                                        popup_label='Check All Passwords Against Breached Password List',
+                                        selectable=False, inactive_bg=header_footer_bg)
+        BreachButton.pack(side='right')
 
+        # any click, key press or scroll in the app postpones lockout
+        self.Activity = ActivityMonitor(self)
         self.Timer = TimeoutBar(self.home_frame, header_footer_bg, 120, self.lockout,
-                                lambda s: self.timeout_label.config(text=f'Time Until Lockout: {s}'), height=2)
+                                lambda s: self.timeout_label.config(text=f'Time Until Lockout: {s}'), height=2,
+                                activity_function=self.Activity.get_last_activity)
         self.Timer.pack(side='bottom', fill='x')
 
         # Main Frame
@@ -90,20 +135,20 @@ class App(Tk):
         left_frame.place(relx=0, rely=0, relwidth=0.5, relheight=1, anchor='nw')
         right_frame.place(relx=1, rely=0, relwidth=0.5, relheight=1, anchor='ne')
 
-        self.AccountsPage = AccountsPage(left_frame, colors['background2'])
+        self.AccountsPage = AccountsPage(left_frame, colors['background2'],
+                                         self.select_account, self.delete_account,
+                                         self.__Registry,
+                                         strength_function=self.__Analyzer.get_report)
         self.AccountsPage.pack(side='top', fill='both', expand=True)
         self.EditPage = EditPage(right_frame, colors['background3'],
                                  self.__EncodingManager, self.save_accounts,
-                                 self.get_account_names, top_bg='#1e281d',
+                                 self.__Registry, self.__ReuseIndex, self.__Breaches,
+                                 top_bg='#1e281d',
                                  top_hover_bg='#2d3c2b')
         self.EditPage.pack(side='top', fill='both', expand=True)
 
         self.GeneratorFrame = GeneratorFrame(left_frame, colors['background3'])
 
-        # Any click in the app will restart lockout timer
-        # add='+' causes this to not override other bindings
-        self.bind_all('<Button-1>', lambda e: self.Timer.restart(), add='+')
-
         self.load_accounts()
         self.LoginPage.password_focus()
         self.mainloop()
@@ -112,50 +157,104 @@ class App(Tk):
         '''load accounts from database
         only ever called once at the start of program - in App.__init__
         '''
-        if not os.path.exists(database_path): # no database available
+        if not self.__Store.exists(): # no database available
             return
-        self.__Accounts: list[Account] = []
-        df = pd.read_csv(database_path, index_col=0)
-        for _, row in df.iterrows():
-            D = AccountDisplay(self.AccountsPage.main_frame, row.name,
-                               row.notes, row.category, row.date,
-                               self.select_account, self.delete_account)
-            A = Account(D, row.name, row.username, row.password,
-                        category=row.category, notes=row.notes, date=row.date)
-            self.__Accounts.append(A)
-        self.AccountsPage.add_accounts([A.get_display() for A in self.__Accounts])
-        self.SearchBar.set_results([A.get_name() for A in self.__Accounts])
-
-    def save_accounts(self, repack=True):
-        '''saves accounts to database and repacks in AccountsPage'''
+        renamed = self.__Store.fix_duplicate_names() # older versions could save accounts with the same name
+        # records are streamed straight from the database file - one pass
+        # accounts are pure data - displays are created by AccountsPage when they are shown
+        for info in self.__Store.iter_records():
+            A = Account(info['name'], info['username'], info['password'],
+                        category=info['category'], notes=info['notes'], date=info['date'])
+            self.__Store.track(A)
+            self.__Registry.add(A)
+        self.AccountsPage.add_accounts(self.__Registry.get_accounts())
+        self.SearchBar.set_results(self.__Registry.get_names())
+        # full text index is built in the background - it is searchable while it fills up
+        # accounts deleted before the thread reaches them are skipped (delete_account removes them from registry first)
+        in_registry = lambda A: self.__Registry.get(A.get_name()) is A
+        Thread(target=self.__TextIndex.add_many, args=(self.__Registry.get_accounts(), in_registry), daemon=True).start()
+        if len(renamed) > 0:
+            names = '\n'.join(f'{old} -> {new}' for old, new in renamed)
+            m = f'{len(renamed)} account(s) had the same name as another account and were renamed:\n{names}'
+            messagebox.showinfo(title='Renamed Accounts', message=m)
+
+    def save_accounts(self, Account:Account, changed:list=None, repack=True):
+        '''saves changes to Account in database and moves it in AccountsPage
+        only the changed fields of the account are written - they are appended to the database journal
+        changed : list of str or None - fields that changed - None if any field may have changed
+        '''
         if repack:
-            # repack accounts because changes may affect the order of accounts in display
-            self.AccountsPage.repack_accounts()
+            # changes may affect the order of accounts - only this account is moved
+            self.AccountsPage.update_account(Account)
+        else:
+            self.AccountsPage.refresh_account(Account)
         # update account names known to search bar
-        self.SearchBar.set_results([A.get_name() for A in self.__Accounts])
-        # generate pandas DatFrame from a list of dictionaries
-        df = pd.DataFrame([A.get_info_dict() for A in self.__Accounts])
-        # sort DataFrame however you want
-        df.to_csv(database_path, index=False)
+        self.SearchBar.set_results(self.__Registry.get_names())
+        self.__Store.upsert(Account, changed)
+        if changed is None or 'password' in changed:
+            self.analyze_passwords(Account)
 
     def new_account(self):
         '''creates new account to be edited in right frame'''
         if self.EditPage.unsaved_changes() and not messagebox.askyesno(title='Unsaved Changes', message=self.__unsaved_message):
             return # don't create new account if there are unsasved changes the user wants to keep
         date = datetime.now().strftime('%m/%d/%Y')
-        D = AccountDisplay(self.AccountsPage.main_frame, 'New Account', '', 'Other', date,
-                           self.select_account, self.delete_account)
-        A = Account(D, 'New Account', '', '', category='Other', notes='', date=date)
-        self.AccountsPage.add_accounts(D)
-        self.__Accounts.append(A)
-        self.SearchBar.set_results([A.get_name() for A in self.__Accounts])
+        # account names are unique - they are used to look accounts up
+        name, n = 'New Account', 1
+        while name in self.__Registry:
+            n += 1
+            name = f'New Account {n}'
+        A = Account(name, '', '', category='Other', notes='', date=date)
+        self.__Registry.add(A)
+        self.AccountsPage.add_accounts(A)
+        self.__TextIndex.add(A)
+        self.SearchBar.set_results(self.__Registry.get_names())
         # show new account for editing
         self.EditPage.show_account(A)
-        self.AccountsPage.deselect_accounts()
-        A.get_display().select()
+        self.AccountsPage.select_account(A)
         self.EditPage.to_edit()
         self.EditPage.Button.switch2()
 
+    def import_accounts(self):
+        '''
+        Purpose:
+            imports accounts from the csv export of another password manager
+            accounts whose names are already used are imported with a number added to the name
+            all accounts are saved in one database transaction and the list is laid out once
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            adds imported accounts everywhere
+        Returns:
+            (none)
+        '''
+        path = filedialog.askopenfilename(title='Import Accounts',
+                                          filetypes=[('CSV Files', '*.csv'), ('All Files', '*.*')])
+        if not path: # dialog was cancelled
+            return
+        try:
+            with open(path, 'r', newline='', encoding='utf-8-sig') as f:
+                # the app always renames - overwrite is only offered by the command line (cli.py import),
+                # so result['updated'] is always empty here
+                result = AccountImporter(self.__EncodingManager, self.__Registry, collisions='rename').read(f)
+        except (OSError, ValueError, UnicodeDecodeError) as e:
+            messagebox.showerror(title='Import Error', message=str(e))
+            return
+        added = result['added']
+        for A in added:
+            self.__Registry.add(A)
+        self.__Store.upsert_many(added) # one journal write for the whole import
+        self.__TextIndex.add_many(added)
+        self.AccountsPage.add_accounts(self.__Registry.get_accounts()) # one layout pass
+        self.SearchBar.set_results(self.__Registry.get_names())
+        for A, password in zip(added, self.__EncodingManager.decode_passwords(added)):
+            self.__ReuseIndex.update(A, password)
+        self.analyze_passwords(added)
+        m = f'Imported {len(added)} accounts from {result["profile"]} export.'
+        if result['renamed'] > 0:
+            m += f'\n{result["renamed"]} accounts were renamed because their names were already used.'
+        messagebox.showinfo(title='Import Accounts', message=m)
+
     def delete_account(self, account_name:str):
         '''
         Purpose:
@@ -169,38 +268,28 @@ class App(Tk):
         Returns:
             (none)
         '''
+        A = self.__Registry.get(account_name)
+        if A is None:
+            return
         self.AccountsPage.remove_account(account_name)
-        for A in self.__Accounts:
-            if A.get_name() == account_name:
-                if A is self.EditPage.get_active_account():
-                    self.EditPage.to_inactive_page()
-                self.__Accounts.remove(A)
-                break
-        self.save_accounts(repack=False)
-
-    def get_account_names(self):
-        '''
-        Purpose:
-            gets list of all account names
-        Pre-conditions:
-            (none)
-        Post-conditions:
-            (none)
-        Returns:
-            :return: list of str - account names
-        '''
-        return [A.get_name() for A in self.__Accounts]
+        if A is self.EditPage.get_active_account():
+            self.EditPage.to_inactive_page()
+        self.__Registry.remove(A)
+        self.__TextIndex.remove(A)
+        self.__Analyzer.discard(A)
+        self.__ReuseIndex.remove(A)
+        self.__Store.delete(A)
+        self.SearchBar.set_results(self.__Registry.get_names())
 
     def select_account(self, account_name:str):
         '''called when an account is selected via search bar or display list'''
-        for A in self.__Accounts:
-            if A.get_name() == account_name:
-                if self.EditPage.unsaved_changes() and not messagebox.askyesno(title='Unsaved Changes', messsage=self.__unsaved_message):
-                    return # don't show new account if there are unsasved changes the user wants to keep
-                self.EditPage.show_account(A)
-                self.AccountsPage.deselect_accounts()
-                A.get_display().select()
-                break
+        A = self.__Registry.get(account_name)
+        if A is None:
+            return
+        if self.EditPage.unsaved_changes() and not messagebox.askyesno(title='Unsaved Changes', messsage=self.__unsaved_message):
+            return # don't show new account if there are unsasved changes the user wants to keep
+        self.EditPage.show_account(A)
+        self.AccountsPage.select_account(A)
 
     def toggle_generator_frame(self, turn_on:bool):
         '''show/hide password generator frame based on turn_on'''
@@ -223,17 +312,166 @@ class App(Tk):
         if self.LoginPage.get_password() != self.__EncodingManager.raw_decode('wYe[+t') or self.LoginPage.get_key() == '':
             self.LoginPage.increment_attempts()
             return # incorrect password, cant login
+        try:
+            unlocked = self.__EncodingManager.unlock(self.LoginPage.get_key(),
+                                                     [A.get_password() for A in self.__Registry.get_accounts()])
+        except ValueError as e: # key file is missing - a new key would lock out every password
+            messagebox.showerror(title='Missing Key File', message=e.args[0])
+            return
+        if not unlocked:
+            self.LoginPage.increment_attempts()
+            return # wrong encryption key - nothing is decoded or saved with it
+        self.__EncodingManager.initiate_chars(self.LoginPage.get_key())
+        self.encrypt_legacy_passwords()
+        # passwords are decoded before the home page is shown - records that fail are left out and reported
+        failed = [] # accounts whose password is corrupted or was encrypted with another key
+        accounts = self.__Registry.get_accounts()
+        readable = [(A, p) for A, p in zip(accounts, self.__EncodingManager.decode_passwords(accounts, failed))
+                    if p is not None]
+        self.__ReuseIndex.build([A for A, _ in readable], [p for _, p in readable])
         self.__logged_in = True
         self.LoginPage.pack_forget()
         self.home_frame.pack(fill='both', expand=True)
-        self.__EncodingManager.initiate_chars(self.LoginPage.get_key())
+        self.analyze_passwords(self.__Registry.get_accounts())
         self.Timer.restart()
         self.SearchBar.Entry.activate(focus=True)
+        if len(failed) > 0:
+            names = '\n'.join(A.get_name() for A in failed)
+            m = (f'The passwords of {len(failed)} account(s) could not be decrypted - '
+                 f'they were changed or encrypted with another key:\n{names}')
+            messagebox.showwarning(title='Unreadable Passwords', message=m)
+
+    def encrypt_legacy_passwords(self):
+        '''
+        Purpose:
+            re-saves passwords saved before the vault was encrypted, or in the first
+            encrypted format (not bound to the account name), in the current encrypted format
+            does nothing once every password is in the current format
+        Pre-conditions:
+            encoding manager must be unlocked
+        Post-conditions:
+            changes password of legacy accounts and saves them in database
+            passwords that fail authentication are not changed (login reports them)
+        Returns:
+            (none)
+        '''
+        legacy = [A for A in self.__Registry.get_accounts() if not self.__EncodingManager.is_current(A.get_password())]
+        if len(legacy) == 0:
+            return
+        passwords = self.__EncodingManager.decode_passwords(legacy, []) # None for records that fail authentication
+        legacy, passwords = [A for A, p in zip(legacy, passwords) if p is not None], [p for p in passwords if p is not None]
+        for A, password in zip(legacy, self.__EncodingManager.encode_many(passwords, [A.get_name() for A in legacy])):
+            A.set_password(password)
+            self.__Store.upsert(A)
+
+    def analyze_passwords(self, accounts:list):
+        '''
+        Purpose:
+            measures password strength of accounts in the background
+            progress is shown in the footer until the analysis is done
+        Pre-conditions:
+            :param accounts: list of Account or a single Account
+            encoding manager must be unlocked
+        Post-conditions:
+            re-sorts accounts list when done if it is ordered by strength
+        Returns:
+            (none)
+        '''
+        self.__Analyzer.submit(accounts)
+        if not self.__watching_analysis:
+            self.__watching_analysis = True
+            self.after(100, self.__watch_analysis)
+
+    def __watch_analysis(self):
+        '''private - shows analysis progress every 100 ms until the analyzer is idle'''
+        if not self.__logged_in:
+            self.__watching_analysis = False
+            self.analysis_label.config(text='')
+            return
+        if self.__Analyzer.is_idle():
+            self.__watching_analysis = False
+            self.analysis_label.config(text='')
+            self.AccountsPage.strengths_changed()
+            return
+        done, total = self.__Analyzer.get_progress()
+        self.analysis_label.config(text=f'Analyzing Passwords: {100 * done // max(1, total)}%')
+        self.after(100, self.__watch_analysis)
+
+    def show_reused_passwords(self):
+        '''shows every group of accounts that share a password'''
+        clusters = self.__ReuseIndex.get_clusters()
+        if len(clusters) == 0:
+            messagebox.showinfo(title='Reused Passwords', message='No passwords are reused.')
+            return
+        groups = [f'{len(cluster)} accounts: ' + ', '.join(A.get_name() for A in cluster) for cluster in clusters]
+        messagebox.showwarning(title='Reused Passwords', message='\n\n'.join(groups))
+
+    def check_breaches(self):
+        '''
+        Purpose:
+            checks every password against the breached password file
+            passwords are hashed and searched by a pool of processes, started
+            from a background thread so that the UI is not blocked
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            shows accounts with breached passwords when the check is done
+        Returns:
+            (none)
+        '''
+        if self.__Breaches is None:
+            messagebox.showinfo(title='Breach Check', message=f'No usable breached password file found at {breach_path}')
+            return
+        if self.__breach_sweep is not None:
+            return # a check is already running
+        accounts, passwords = [], [] # accounts with unreadable passwords are not checked
+        for A, password in zip(self.__Registry.get_accounts(),
+                               self.__EncodingManager.decode_passwords(self.__Registry.get_accounts(), [])):
+            if password is not None:
+                accounts.append(A)
+                passwords.append(password)
+        self.__breach_sweep = []
+        Thread(target=self.__sweep_breaches, args=(passwords,), daemon=True).start()
+        self.analysis_label.config(text='Checking for Breached Passwords...')
+        self.after(200, self.__watch_breaches, accounts)
+
+    def __sweep_breaches(self, passwords:list):
+        '''private - runs breach check - always runs in a Thread'''
+        try:
+            results = check_passwords(breach_path, passwords)
+        except (OSError, ValueError): # breached password file could not be read
+            results = None
+        self.__breach_sweep.append(results)
+
+    def __watch_breaches(self, accounts:list):
+        '''private - waits for breach check to finish and shows its results'''
+        if len(self.__breach_sweep) == 0:
+            self.after(200, self.__watch_breaches, accounts)
+            return
+        found = self.__breach_sweep[0]
+        self.__breach_sweep = None
+        self.analysis_label.config(text='')
+        if not self.__logged_in:
+            return # results are not shown after lockout
+        if found is None:
+            messagebox.showerror(title='Breach Check', message=f'Breached password file could not be read: {breach_path}')
+            return
+        breached = [A.get_name() for A, b in zip(accounts, found) if b]
+        if len(breached) == 0:
+            messagebox.showinfo(title='Breach Check', message='No passwords were found in the breached password list.')
+            return
+        m = f'{len(breached)} password(s) were found in the breached password list:\n' + '\n'.join(breached)
+        messagebox.showwarning(title='Breach Check', message=m)
 
     def lockout(self):
         '''called when session time expires due to inactivity - goes to login page'''
+        self.EditPage.clear_cache() # no decrypted fields are kept once the session ends
         if self.__logged_in: # dont do lockout process if already locked out
             self.__logged_in = False
+            self.__Analyzer.clear() # strength reports are not kept once the session ends
+            self.__ReuseIndex.clear()
+            self.__EncodingManager.lock()
+            self.Timer.stop() # timer is not needed until next login
             self.home_frame.pack_forget()
             self.LoginPage.pack(fill='both', expand=True)
             self.LoginPage.reset_attempts()
@@ -249,4 +487,5 @@ class App(Tk):
         self.destroy()
         quit() # this doesnt work - python still doesnt stop running
 
-root = App()
+if __name__ == '__main__': # breach check processes import this module - they must not open the app
+    root = App()
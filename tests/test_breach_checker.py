@@ -0,0 +1,66 @@
+import tempfile, shutil, unittest, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.breach_checker import BreachCorpus, convert_hash_list, write_fanout, check_passwords, password_hash
+
+
+breached = ['password', '123456', 'qwerty', 'letmein', 'dragon']
+# digests that only differ in trailing zero bytes - numpy strips them from fixed size strings
+zero_digests = [bytes(19) + b'\x01', bytes(18) + b'\x01\x00', b'\xff' * 19 + b'\x00']
+
+
+class TestBreachCorpus(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'hashes.bin')
+        digests = sorted([password_hash(p) for p in breached] + zero_digests)
+        text_path = os.path.join(self.folder, 'hashes.txt')
+        with open(text_path, 'w') as f:
+            f.write(''.join(f'{d.hex().upper()}:{i + 1}\n' for i, d in enumerate(digests)))
+        self.assertEqual(convert_hash_list(text_path, self.path, chunk_lines=2), len(digests))
+        self.digests = digests
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_fanout_table(self):
+        '''entry p is the number of hashes whose 16 bit prefix is below p'''
+        table = write_fanout(self.path)
+        self.assertEqual(len(table), 2 ** 16 + 1)
+        prefixes = [int.from_bytes(d[:2], 'big') for d in self.digests]
+        for p in sorted(set(prefixes)) + [0, 1, 2 ** 16 - 1]:
+            self.assertEqual(table[p], sum(q < p for q in prefixes))
+        self.assertEqual(table[-1], len(self.digests))
+
+    def test_lookups_with_and_without_fanout(self):
+        missing = ['password1', 'correct horse battery staple', '']
+        for fanout in [True, False]:
+            if not fanout:
+                os.remove(self.path + '.fanout')
+            Corpus = BreachCorpus(self.path)
+            self.assertEqual(len(Corpus), len(self.digests))
+            self.assertTrue(all(Corpus.contains_password(p) for p in breached))
+            self.assertFalse(any(Corpus.contains_password(p) for p in missing))
+            self.assertTrue(all(Corpus.contains_hash(d) for d in zero_digests))
+            self.assertFalse(Corpus.contains_hash(bytes(20))) # prefix of stored digests
+            queries = [password_hash(p) for p in missing + breached] + zero_digests + [bytes(20), b'\xff' * 20]
+            expected = [False] * len(missing) + [True] * (len(breached) + len(zero_digests)) + [False, False]
+            self.assertEqual(Corpus.contains_many(queries), expected)
+            self.assertEqual(Corpus.contains_many([]), [])
+
+    def test_truncated_fanout(self):
+        with open(self.path + '.fanout', 'r+b') as f:
+            f.truncate(100)
+        with self.assertRaises(ValueError):
+            BreachCorpus(self.path)
+
+    def test_check_passwords(self):
+        '''a sweep over the process pool gives the same results as one corpus'''
+        passwords = ['password1', 'dragon', 'hunter2', 'qwerty', 'letmein', 'abc']
+        expected = [p in breached for p in passwords]
+        self.assertEqual(check_passwords(self.path, passwords, processes=2, chunk_size=2), expected)
+        self.assertEqual(check_passwords(self.path, passwords), expected) # one chunk - no processes
+
+
+if __name__ == '__main__':
+    unittest.main()
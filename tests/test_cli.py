@@ -0,0 +1,83 @@
+import contextlib, tempfile, shutil, unittest, json, io, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import vault_crypto
+import cli
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'db.csv')
+        self.calibrate = vault_crypto.calibrate
+        vault_crypto.calibrate = lambda target_seconds: {'n': 2 ** 14, 'r': 8, 'p': 1, 'seconds': 0}
+        self.environ = dict(os.environ)
+        os.environ['PM_PASSWORD'], os.environ['PM_KEY'] = 'wYe[+t', 'key'
+
+    def tearDown(self):
+        vault_crypto.calibrate = self.calibrate
+        os.environ.clear()
+        os.environ.update(self.environ)
+        shutil.rmtree(self.folder)
+
+    def run_cli(self, *args, stdin='') -> tuple:
+        '''returns (exit code, stdout, stderr) of cli.main with args on the test database'''
+        out, err = io.StringIO(), io.StringIO()
+        stdin_before, sys.stdin = sys.stdin, io.StringIO(stdin)
+        try:
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                code = cli.main(['--database', self.path] + list(args))
+        finally:
+            sys.stdin = stdin_before
+        return code, out.getvalue(), err.getvalue()
+
+    def test_add_and_list(self):
+        self.assertEqual(self.run_cli('add', 'Bank', '--username', 'me', '--password', 'pw')[0], 0)
+        self.assertEqual(self.run_cli('add', 'Email', '--category', 'Mail')[0], 0)
+        code, out, _ = self.run_cli('list')
+        self.assertEqual(code, 0)
+        self.assertEqual([line.split('\t')[0] for line in out.splitlines()], ['Bank', 'Email'])
+        self.assertEqual(self.run_cli('add', 'Bank')[0], 1) # name already used
+
+    def test_search(self):
+        for name in ['Bank', 'Email', 'Bakery']:
+            self.run_cli('add', name)
+        code, out, _ = self.run_cli('list', 'emai')
+        self.assertEqual(code, 0)
+        self.assertEqual(out.splitlines()[0].split('\t')[0], 'Email')
+
+    def test_rename_reencodes_password(self):
+        '''a renamed account still decodes - its password is encoded again under the new name'''
+        self.run_cli('add', 'Old', '--password', 'secret')
+        code, out, _ = self.run_cli('update', 'Old', '--name', 'New')
+        self.assertEqual(code, 0)
+        self.assertIn('name', out)
+        code, out, _ = self.run_cli('show', 'New', '--reveal')
+        self.assertEqual(code, 0)
+        self.assertIn('password: secret', out)
+
+    def test_export(self):
+        self.run_cli('add', 'Bank', '--password', 'secret')
+        export_path = os.path.join(self.folder, 'export.json')
+        self.assertEqual(self.run_cli('export', export_path, '--format', 'json')[0], 0)
+        with open(export_path, 'r', encoding='utf-8') as f:
+            infos = json.load(f)
+        self.assertEqual([(info['name'], info['password']) for info in infos], [('Bank', 'secret')])
+
+    def test_batch_error_exits_with_1(self):
+        code, out, err = self.run_cli('batch', stdin='add Bank\n# comment\nshow Missing\nadd Email\n')
+        self.assertEqual(code, 1)
+        self.assertIn('line 3', err)
+        self.assertEqual(self.run_cli('list')[1].count('\n'), 2) # other lines still ran
+
+    def test_wrong_key_exits_with_2(self):
+        self.run_cli('add', 'Bank', '--password', 'secret')
+        os.environ['PM_KEY'] = 'typo'
+        self.assertEqual(self.run_cli('list')[0], 2)
+        os.remove(self.path + '.meta') # missing key file with encrypted passwords
+        self.assertEqual(self.run_cli('list')[0], 2)
+        self.assertFalse(os.path.exists(self.path + '.meta'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import tempfile, shutil, unittest, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.encoding_manager import EncodingManager
+from utils import vault_crypto
+
+
+class TestEncodingManager(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.calibrate = vault_crypto.calibrate
+        vault_crypto.calibrate = lambda target_seconds: {'n': 2 ** 14, 'r': 8, 'p': 1, 'seconds': 0}
+        self.Manager = EncodingManager(meta_path=os.path.join(self.folder, 'db.csv.meta'))
+        self.assertTrue(self.Manager.unlock('key'))
+        self.texts = ['hunter2', '', 'pässwörd', 'a' * 100, 'plain']
+        self.names = ['Bank', 'Email', 'Shop', 'Long', 'Plain']
+
+    def tearDown(self):
+        vault_crypto.calibrate = self.calibrate
+        shutil.rmtree(self.folder)
+
+    def test_encode_many_matches_encode(self):
+        '''encode_many gives values that decode to the same texts as encode does - encryption is randomized'''
+        many = self.Manager.encode_many(self.texts, self.names)
+        single = [self.Manager.encode(text, name) for text, name in zip(self.texts, self.names)]
+        self.assertEqual([self.Manager.decode(e, n) for e, n in zip(many, self.names)],
+                         [self.Manager.decode(e, n) for e, n in zip(single, self.names)])
+        self.assertEqual([self.Manager.decode(e, n) for e, n in zip(many, self.names)], self.texts)
+
+    def test_unlock_refuses_new_key_for_encrypted_values(self):
+        '''a missing key file is an error when stored values are encrypted, not a new vault'''
+        encoded = self.Manager.encode_many(self.texts, self.names)
+        os.remove(os.path.join(self.folder, 'db.csv.meta'))
+        Manager = EncodingManager(meta_path=os.path.join(self.folder, 'db.csv.meta'))
+        with self.assertRaises(ValueError):
+            Manager.unlock('typo', encoded + ['plain'])
+        self.assertTrue(Manager.unlock('key', ['plain'])) # only legacy values - key is set now
+
+    def test_decode_many_matches_decode(self):
+        encoded = self.Manager.encode_many(self.texts[:-1], self.names[:-1]) + ['plain'] # last value is not encrypted
+        self.assertEqual(self.Manager.decode_many(encoded, self.names),
+                         [self.Manager.decode(e, n) for e, n in zip(encoded, self.names)])
+
+    def test_legacy_values_use_legacy_decoding(self):
+        '''values without a record prefix go through legacy_decode_many - encrypted values do not'''
+        class Scrambled(EncodingManager):
+            def legacy_decode_many(self, texts):
+                return [text[::-1] for text in texts]
+        Manager = Scrambled(meta_path=os.path.join(self.folder, 'db.csv.meta'))
+        self.assertTrue(Manager.unlock('key'))
+        encoded = Manager.encode('secret', 'Bank')
+        self.assertEqual(Manager.decode_many(['terces', encoded], ['Old', 'Bank']), ['secret', 'secret'])
+
+
+if __name__ == '__main__':
+    unittest.main()
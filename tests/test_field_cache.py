@@ -0,0 +1,58 @@
+import unittest, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import field_cache
+from utils.field_cache import FieldCache
+
+
+class Clock:
+    '''replaces the time module of field_cache - time only moves when the test says so'''
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+class TestFieldCache(unittest.TestCase):
+    def setUp(self):
+        self.time = field_cache.time
+        self.clock = field_cache.time = Clock()
+        self.Cache = FieldCache(max_size=3, ttl=60)
+
+    def tearDown(self):
+        field_cache.time = self.time
+
+    def test_expiry(self):
+        self.Cache.put(('A', 'password', 'v2$x'), 'secret')
+        self.clock.now += 59
+        self.assertEqual(self.Cache.get(('A', 'password', 'v2$x')), 'secret') # use does not extend expiry
+        self.clock.now += 1
+        self.assertIsNone(self.Cache.get(('A', 'password', 'v2$x')))
+        self.assertEqual(len(self.Cache), 0)
+
+    def test_expired_entries_removed_on_put(self):
+        self.Cache.put('old', 'a')
+        self.clock.now += 30
+        self.Cache.put('new', 'b')
+        self.clock.now += 30
+        self.Cache.put('newest', 'c')
+        self.assertEqual(len(self.Cache), 2) # 'old' expired
+        self.assertIsNone(self.Cache.get('old'))
+
+    def test_least_recently_used_removed(self):
+        for key in 'abc':
+            self.Cache.put(key, key.upper())
+        self.assertEqual(self.Cache.get('a'), 'A') # 'b' is now least recently used
+        self.Cache.put('d', 'D')
+        self.assertEqual(len(self.Cache), 3)
+        self.assertIsNone(self.Cache.get('b'))
+        self.assertEqual([self.Cache.get(key) for key in 'acd'], ['A', 'C', 'D'])
+        self.Cache.put('c', 'C2') # put again replaces value and expiry
+        self.assertEqual(self.Cache.get('c'), 'C2')
+        self.Cache.clear()
+        self.assertEqual(len(self.Cache), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import tempfile, shutil, unittest, io, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.importer import AccountImporter, detect_profile
+from utils.encoding_manager import EncodingManager
+from utils.registry import AccountRegistry
+from utils.accounts import Account
+from utils import vault_crypto
+
+
+bitwarden = '''folder,favorite,type,name,notes,fields,reprompt,login_uri,login_username,login_password,login_totp
+Banks,,login,Bank,,,,https://bank.com,me,new secret,
+,,login,Bank,,,,https://bank.com,other,second,
+,,login,Email,,,,,you,mail,
+'''
+
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.calibrate = vault_crypto.calibrate
+        vault_crypto.calibrate = lambda target_seconds: {'n': 2 ** 14, 'r': 8, 'p': 1, 'seconds': 0}
+        self.Manager = EncodingManager(meta_path=os.path.join(self.folder, 'db.csv.meta'))
+        self.assertTrue(self.Manager.unlock('key'))
+        self.Bank = Account('Bank', 'me', self.Manager.encode('old secret', 'Bank'), category='Banks')
+        self.Registry = AccountRegistry([self.Bank, Account('Bank (2)', '', '')])
+
+    def tearDown(self):
+        vault_crypto.calibrate = self.calibrate
+        shutil.rmtree(self.folder)
+
+    def read(self, collisions:str, chunk_size=512) -> dict:
+        '''returns result of importing the Bitwarden export with collision policy'''
+        Importer = AccountImporter(self.Manager, self.Registry, collisions=collisions, chunk_size=chunk_size)
+        return Importer.read(io.StringIO(bitwarden))
+
+    def test_detect_profile(self):
+        self.assertEqual(detect_profile(bitwarden.splitlines()[0].split(',')), 'Bitwarden')
+        with self.assertRaises(ValueError):
+            detect_profile(['title', 'comment'])
+
+    def test_rename(self):
+        '''names used by the vault or by earlier rows get the next free number'''
+        result = self.read('rename', chunk_size=1)
+        self.assertEqual([A.get_name() for A in result['added']], ['Bank (3)', 'Bank (4)', 'Email'])
+        self.assertEqual((result['renamed'], result['skipped'], result['updated']), (2, 0, {}))
+        A = result['added'][0]
+        self.assertEqual(self.Manager.decode(A.get_password(), 'Bank (3)'), 'new secret') # encoded with final name
+        self.assertEqual(A.get_category(), 'Banks')
+        self.assertIn('URL: https://bank.com', A.get_notes())
+
+    def test_skip(self):
+        result = self.read('skip')
+        self.assertEqual([A.get_name() for A in result['added']], ['Email'])
+        self.assertEqual((result['renamed'], result['skipped'], result['updated']), (0, 2, {}))
+
+    def test_overwrite(self):
+        '''the first row with a used name changes that account - a repeat within the file is renamed'''
+        result = self.read('overwrite')
+        self.assertEqual([A.get_name() for A in result['added']], ['Bank (3)', 'Email'])
+        changes = result['updated'][self.Bank]
+        self.assertEqual(set(changes), {'password', 'notes'}) # username and category are unchanged
+        self.assertEqual(self.Manager.decode(changes['password'], 'Bank'), 'new secret')
+        self.assertEqual(self.Manager.decode(self.Bank.get_password(), 'Bank'), 'old secret') # vault not changed
+
+    def test_unknown_policy(self):
+        with self.assertRaises(ValueError):
+            AccountImporter(self.Manager, self.Registry, collisions='merge')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest, io, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.password_generator import random_indices, generate_passwords, write_passwords
+
+
+class TestPasswordGenerator(unittest.TestCase):
+    def test_k_dividing_byte_range(self):
+        '''k that divides 2 ** 8 or 2 ** 32 keeps every drawn value - limit is the whole range'''
+        for k in [1, 2, 256, 2 ** 32]:
+            values = random_indices(1000, k)
+            self.assertEqual(len(values), 1000)
+            self.assertTrue(((values >= 0) & (values < k)).all())
+        self.assertEqual(len(set(random_indices(10000, 256).tolist())), 256)
+
+    def test_k_out_of_range(self):
+        for k in [0, 2 ** 32 + 1]:
+            with self.assertRaises(ValueError):
+                random_indices(1, k)
+
+    def test_lengths_and_characters(self):
+        passwords = generate_passwords('abcé', 500, 3, 7)
+        self.assertEqual(len(passwords), 500)
+        self.assertTrue(all(3 <= len(p) <= 7 for p in passwords))
+        self.assertEqual(set(''.join(passwords)), set('abcé'))
+        self.assertEqual(generate_passwords('ab', 0, 3, 7), [])
+
+    def test_min_length_above_max_length(self):
+        with self.assertRaises(ValueError):
+            generate_passwords('abc', 5, 8, 4)
+        with self.assertRaises(ValueError):
+            generate_passwords('', 5, 4, 8)
+
+    def test_write_passwords(self):
+        f = io.StringIO()
+        self.assertEqual(write_passwords(f, 'abc', 10, 4, 4, batch_size=3), 10)
+        lines = f.getvalue().splitlines()
+        self.assertEqual(len(lines), 10)
+        self.assertTrue(all(len(line) == 4 for line in lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.reuse_index import ReuseIndex
+from utils.accounts import Account
+
+
+class TestReuseIndex(unittest.TestCase):
+    def setUp(self):
+        self.accounts = [Account(name, '', '') for name in ['Bank', 'Email', 'Shop', 'Game', 'Blog']]
+        self.Index = ReuseIndex()
+        self.Index.build(self.accounts, ['same', 'same', 'other', 'same', ''])
+
+    def test_clusters(self):
+        '''only reused passwords form a cluster - largest first - empty passwords are not indexed'''
+        Bank, Email, Shop, Game, Blog = self.accounts
+        self.assertEqual(len(self.Index), 4)
+        self.assertEqual(self.Index.get_clusters(), [[Bank, Email, Game]])
+        self.assertEqual(self.Index.update(Shop, 'same'), [Bank, Email, Game])
+        self.Index.update(Blog, 'other')
+        self.assertEqual(self.Index.update(Email, 'other'), [Blog])
+        self.assertEqual(self.Index.get_clusters(), [[Bank, Game, Shop], [Blog, Email]])
+
+    def test_remove_and_clear(self):
+        Bank, Email, Shop, Game, Blog = self.accounts
+        self.Index.remove(Email)
+        self.Index.remove(Blog) # not indexed
+        self.assertEqual(self.Index.get_clusters(), [[Bank, Game]])
+        self.assertEqual(self.Index.update(Game, ''), []) # cleared password is no longer indexed
+        self.assertEqual(self.Index.get_clusters(), [])
+        self.Index.clear()
+        self.assertEqual(len(self.Index), 0)
+        self.assertEqual(self.Index.update(Bank, 'same'), [])
+
+    def test_build_replaces_index(self):
+        self.Index.build(self.accounts[:2], ['a', 'b'])
+        self.assertEqual(len(self.Index), 2)
+        self.assertEqual(self.Index.get_clusters(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
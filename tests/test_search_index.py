@@ -0,0 +1,86 @@
+from difflib import get_close_matches
+import unittest, random, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.search_index import NGramIndex, SearchCache, score_all, best_matches
+
+
+def make_names(n:int) -> list:
+    '''returns n generated account names'''
+    random.seed(0)
+    words = ['bank', 'mail', 'shop', 'game', 'school', 'work', 'music', 'cloud', 'photo', 'news']
+    return [f'{random.choice(words).title()} {random.choice(words)} {i}' for i in range(n)]
+
+
+class TestNGramIndex(unittest.TestCase):
+    def test_candidates(self):
+        Index = NGramIndex(['Bank', 'Bakery', 'Bar', 'Email'], max_candidates=2)
+        self.assertEqual(Index.candidates('bank')[0], 'Bank') # indexed in lowercase
+        self.assertNotIn('Email', Index.candidates('bank'))
+        self.assertEqual(len(Index.candidates('ba')), 2) # 3 strings start with "ba"
+        self.assertEqual(Index.candidates('xyz'), [])
+
+    def test_set_items(self):
+        Index = NGramIndex(['Bank', 'Email'])
+        self.assertFalse(Index.set_items(['Email', 'Bank']))
+        self.assertTrue(Index.set_items(['Bank', 'Shop']))
+        self.assertEqual(len(Index), 2)
+        self.assertEqual(Index.candidates('email'), [])
+        Index.remove('Missing') # not indexed - nothing happens
+        self.assertEqual(Index.candidates('shop'), ['Shop'])
+
+    def test_best_matches_like_get_close_matches(self):
+        names = make_names(300)
+        Index = NGramIndex(names, max_candidates=len(names))
+        for query in ['Bank mail', 'shop', 'Cloud news 12', 'Music']:
+            scores = score_all(query, Index.candidates(query))
+            self.assertEqual(best_matches(scores, 5, 0.6), get_close_matches(query, names, 5, 0.6))
+
+    def test_score_all_cancelled(self):
+        self.assertIsNone(score_all('bank', ['Bank', 'Shop'], cancelled=lambda: True))
+        self.assertEqual(score_all('ab', ['ab', 'cd']), [(1.0, 'ab'), (0.0, 'cd')])
+
+
+class TestSearchCache(unittest.TestCase):
+    def test_prefix_candidates(self):
+        Cache = SearchCache(min_prefix=3)
+        Cache.put('ba', ['Bank', 'Bakery', 'Email'], [])
+        self.assertIsNone(Cache.get_prefix_candidates('ban')) # prefix shorter than min_prefix
+        Cache.put('ban', ['Bank', 'Bakery'], [(0.9, 'Bank')])
+        Cache.put('bank', ['Bank'], [(1.0, 'Bank')])
+        self.assertEqual(Cache.get_prefix_candidates('bank x'), ('bank', ['Bank'])) # longest cached prefix
+        self.assertEqual(Cache.get_prefix_candidates('banx'), ('ban', ['Bank', 'Bakery']))
+        self.assertEqual(Cache.get_prefix_candidates('bank')[0], 'ban') # query itself is not its prefix
+        self.assertEqual(Cache.get('ban'), [(0.9, 'Bank')])
+        self.assertIsNone(Cache.get('email'))
+
+    def test_least_recently_used_removed(self):
+        Cache = SearchCache(max_size=2)
+        Cache.put('one', [], [])
+        Cache.put('two', [], [])
+        Cache.get('one')
+        Cache.put('three', [], [])
+        self.assertEqual(len(Cache), 2)
+        self.assertIsNone(Cache.get('two'))
+        Cache.clear()
+        self.assertEqual(len(Cache), 0)
+
+    def test_typing_narrows_to_same_results(self):
+        '''typed one character at a time, narrowed candidates are those of a full search'''
+        names = make_names(500)
+        Index, Cache = NGramIndex(names, max_candidates=len(names)), SearchCache()
+        query = 'Photo bank 4'
+        for end in range(1, len(query) + 1):
+            text = query[:end]
+            cached = Cache.get_prefix_candidates(text)
+            self.assertEqual(cached is not None, end > 3)
+            candidates = Index.candidates(text) if cached is None else Index.narrow(text, *cached)
+            self.assertEqual(set(candidates), set(Index.candidates(text)))
+            scores = score_all(text, candidates)
+            Cache.put(text, candidates, scores)
+            full = score_all(text, Index.candidates(text))
+            self.assertEqual(best_matches(scores, 10, 0.25), best_matches(full, 10, 0.25))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest, time, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.search_worker import SearchWorker
+
+
+def wait_for(function, timeout=5.0):
+    '''returns first value of function that is not None - None after timeout seconds'''
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        value = function()
+        if value is not None:
+            return value
+        time.sleep(0.01)
+    return None
+
+
+class TestSearchWorker(unittest.TestCase):
+    def test_search_error_is_reported_and_worker_survives(self):
+        def search(cancelled, text):
+            if text == 'bad':
+                raise KeyError(text)
+            return [text.upper()]
+        Worker = SearchWorker(search)
+        Worker.submit('bad')
+        self.assertIsInstance(wait_for(Worker.get_error), KeyError)
+        self.assertIsNone(Worker.get_result())
+        Worker.submit('good')
+        self.assertEqual(wait_for(Worker.get_result), ['GOOD'])
+        self.assertIsNone(Worker.get_error())
+
+    def test_stale_results_are_dropped(self):
+        Worker = SearchWorker(lambda cancelled, text: [text])
+        Worker.submit('a')
+        self.assertEqual(wait_for(Worker.get_result), ['a'])
+        Worker.submit('b')
+        Worker.cancel()
+        time.sleep(0.05)
+        self.assertIsNone(Worker.get_result())
+
+
+if __name__ == '__main__':
+    unittest.main()
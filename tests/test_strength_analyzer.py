@@ -0,0 +1,75 @@
+import threading, unittest, time, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.strength_analyzer import StrengthAnalyzer
+from utils.accounts import Account
+
+
+def wait_idle(Analyzer:StrengthAnalyzer, timeout=5.0) -> bool:
+    '''returns True once Analyzer is idle - False after timeout seconds'''
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        if Analyzer.is_idle():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class TestStrengthAnalyzer(unittest.TestCase):
+    def test_worker_survives_decode_failure(self):
+        '''accounts whose decoding raises (such as TypeError at lockout) get no report and later batches still run'''
+        failing = [True]
+        def decode_passwords(accounts):
+            if failing[0]:
+                raise TypeError('vault was locked')
+            return [A.get_password() for A in accounts]
+        Analyzer = StrengthAnalyzer(decode_passwords)
+        A, B = Account('A', '', 'password'), Account('B', '', 'Xk9#mQ2$vL7!pR4&')
+        Analyzer.submit(A)
+        self.assertTrue(wait_idle(Analyzer))
+        self.assertIsNone(Analyzer.get_report(A))
+
+        failing[0] = False
+        Analyzer.submit([A, B])
+        self.assertTrue(wait_idle(Analyzer))
+        self.assertEqual(Analyzer.get_report(A)['label'], 'Very Weak')
+        self.assertGreater(Analyzer.get_report(B)['score'], 2)
+
+        self.assertEqual(Analyzer.get_progress(), (2, 2))
+
+    def test_bad_password_does_not_drop_batch(self):
+        '''accounts of a failing batch are retried one at a time - only the bad one is left out'''
+        def decode_passwords(accounts):
+            if any(A.get_name() == 'Bad' for A in accounts):
+                raise ValueError('record failed authentication')
+            return [A.get_password() for A in accounts]
+        Analyzer = StrengthAnalyzer(decode_passwords)
+        accounts = [Account('A', '', 'password'), Account('Bad', '', 'x'), Account('C', '', 'Xk9#mQ2$vL7!pR4&')]
+        Analyzer.submit(accounts)
+        self.assertTrue(wait_idle(Analyzer))
+        self.assertIsNotNone(Analyzer.get_report(accounts[0]))
+        self.assertIsNone(Analyzer.get_report(accounts[1]))
+        self.assertIsNotNone(Analyzer.get_report(accounts[2]))
+        self.assertEqual(Analyzer.get_progress(), (2, 2)) # bad account is not counted as analyzed
+
+    def test_discard_during_batch(self):
+        '''an account deleted while its batch is analyzed gets no report'''
+        started, release = threading.Event(), threading.Event()
+        def decode_passwords(accounts):
+            started.set()
+            release.wait(5)
+            return [A.get_password() for A in accounts]
+        Analyzer = StrengthAnalyzer(decode_passwords)
+        A, B = Account('A', '', 'password'), Account('B', '', 'hello')
+        Analyzer.submit([A, B])
+        self.assertTrue(started.wait(5))
+        Analyzer.discard(A)
+        release.set()
+        self.assertTrue(wait_idle(Analyzer))
+        self.assertIsNone(Analyzer.get_report(A))
+        self.assertIsNotNone(Analyzer.get_report(B))
+        self.assertEqual(Analyzer.get_progress(), (1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
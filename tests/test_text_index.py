@@ -0,0 +1,20 @@
+import unittest, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.text_index import FullTextIndex
+from utils.accounts import Account
+
+
+class TestFullTextIndex(unittest.TestCase):
+    def test_add_many_skips_removed_accounts(self):
+        '''an account deleted before the background build reaches it is not indexed afterwards'''
+        A, B = Account('Bank', 'me', ''), Account('Bakery', 'me', '')
+        registry = {A}
+        Index = FullTextIndex()
+        Index.remove(B) # deleted before it was indexed
+        Index.add_many([A, B], keep=lambda Account: Account in registry)
+        self.assertEqual(Index.search('ba', 10), [A])
+
+
+if __name__ == '__main__':
+    unittest.main()
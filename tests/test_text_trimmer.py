@@ -0,0 +1,61 @@
+import unittest, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import text_trimmer
+from utils.text_trimmer import TextTrimmer
+
+
+class FixedFont:
+    '''replaces tkinter Font - every character is 10 pixels wide, "i" and "." are 4 - counts measure calls'''
+    calls = 0
+
+    def __init__(self, root=None, font=None):
+        pass
+
+    def measure(self, text:str) -> int:
+        FixedFont.calls += 1
+        return sum(4 if c in 'i.' else 10 for c in text)
+
+
+class TestTextTrimmer(unittest.TestCase):
+    def setUp(self):
+        self.Font = text_trimmer.Font
+        text_trimmer.Font = FixedFont
+        FixedFont.calls = 0
+        self.Trimmer = TextTrimmer(None, ('Segoe UI', 10), max_cached=2)
+
+    def tearDown(self):
+        text_trimmer.Font = self.Font
+
+    def test_text_that_fits(self):
+        self.assertEqual(self.Trimmer.trim('hello', 50), 'hello')
+        self.assertEqual(self.Trimmer.trim('iiiii', 20), 'iiiii')
+        self.assertEqual(self.Trimmer.measure('hi'), 14)
+
+    def test_trim_by_measured_width(self):
+        '''text is cut so that it fits together with the ellipsis (12 pixels)'''
+        self.assertEqual(self.Trimmer.trim('abcdefghij', 60), 'abcd...') # 4 * 10 + 12 <= 60
+        self.assertEqual(self.Trimmer.trim('iiiiiiiiiiiiiiii', 60), 'iiiiiiiiiiii...') # narrow characters
+        self.assertLessEqual(self.Trimmer.measure(self.Trimmer.trim('abcdefghijklmnop', 75)), 75)
+
+    def test_break_at_word(self):
+        '''text breaks at the end of a word unless that wastes more than half of the text'''
+        self.assertEqual(self.Trimmer.trim('lorem ipsum dolor', 150), 'lorem ipsum...')
+        self.assertEqual(self.Trimmer.trim('ab cdefghijklmnop', 120), 'ab cdefghij...') # word break too early
+
+    def test_character_widths_cached(self):
+        self.Trimmer.trim('abcabcabc', 1000)
+        calls = FixedFont.calls
+        self.Trimmer.trim('cab cab', 30)
+        self.assertEqual(FixedFont.calls, calls + 1) # only the space is new
+
+    def test_results_cached(self):
+        first = self.Trimmer.trim('abcdefghij', 60)
+        self.assertIs(self.Trimmer.trim('abcdefghij', 60), first)
+        self.Trimmer.trim('x' * 20, 60)
+        self.Trimmer.trim('y' * 20, 60) # cache holds 2 results - oldest is dropped
+        self.assertEqual(self.Trimmer.trim('abcdefghij', 60), 'abcd...')
+
+
+if __name__ == '__main__':
+    unittest.main()
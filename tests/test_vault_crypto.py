@@ -0,0 +1,63 @@
+import tempfile, shutil, unittest, hashlib, hmac, base64, json, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.vault_crypto import VaultCipher, AuthenticationError, derive_keys, legacy_prefix, is_current
+
+
+class TestVaultCipher(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'db.csv.meta')
+        self.Cipher = VaultCipher(self.path, target_seconds=0)
+        self.assertTrue(self.Cipher.unlock('key'))
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def test_round_trip_with_context(self):
+        records = self.Cipher.encrypt_many(['one', '', 'thrée'], ['A', 'B', 'C'])
+        self.assertTrue(all(is_current(r) for r in records))
+        self.assertEqual(self.Cipher.decrypt_many(records, ['A', 'B', 'C']), ['one', '', 'thrée'])
+
+    def test_record_moved_to_other_account_fails(self):
+        '''a valid record copied to another account does not authenticate'''
+        record = self.Cipher.encrypt('secret', 'Bank')
+        with self.assertRaises(ValueError):
+            self.Cipher.decrypt(record, 'Email')
+
+    def test_locked_raises_value_error(self):
+        record = self.Cipher.encrypt('secret', 'Bank')
+        self.Cipher.lock()
+        with self.assertRaises(ValueError):
+            self.Cipher.encrypt('secret', 'Bank')
+        with self.assertRaises(ValueError):
+            self.Cipher.decrypt(record, 'Bank')
+
+    def test_missing_key_file_with_records_is_refused(self):
+        '''a lost key file is not replaced by a new key while encrypted records exist'''
+        record = self.Cipher.encrypt('secret', 'Bank')
+        os.remove(self.path)
+        Cipher = VaultCipher(self.path, target_seconds=0)
+        with self.assertRaises(ValueError):
+            Cipher.unlock('typo', create=False)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(Cipher.is_unlocked())
+        self.assertTrue(Cipher.unlock('key', create=True)) # new vault without records
+        with self.assertRaises(AuthenticationError):
+            Cipher.decrypt(record, 'Bank')
+
+    def test_legacy_record_still_decrypts(self):
+        '''records of the first format (no associated data) are read under any context'''
+        with open(self.path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        enc_key, mac_key = derive_keys('key', bytes.fromhex(meta['salt']), meta['n'], meta['r'], meta['p'])
+        nonce, data = os.urandom(16), 'secret'.encode('utf-8')
+        ciphertext = bytes(a ^ b for a, b in zip(data, hashlib.shake_256(enc_key + nonce).digest(len(data))))
+        tag = hmac.new(mac_key, legacy_prefix.encode() + nonce + ciphertext, hashlib.sha256).digest()
+        record = legacy_prefix + base64.b64encode(nonce + ciphertext + tag).decode('ascii')
+        self.assertFalse(is_current(record))
+        self.assertEqual(self.Cipher.decrypt(record, 'Bank'), 'secret')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import tempfile, shutil, unittest, csv, sys, os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.vault_store import VaultStore, fields
+from utils.accounts import Account
+
+
+class TestVaultStore(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.mkdtemp()
+        self.path = os.path.join(self.folder, 'db.csv')
+
+    def tearDown(self):
+        shutil.rmtree(self.folder)
+
+    def records(self) -> dict:
+        '''returns name -> record streamed from a fresh store'''
+        return {rec['name']: rec for rec in VaultStore(self.path).iter_records()}
+
+    def test_rename_then_reuse_old_name(self):
+        '''an account renamed away from a snapshot name keeps its fields when the old name is reused'''
+        Store = VaultStore(self.path)
+        Store.upsert(Account('X', 'user', 'secret', category='Work', notes='notes', date='01/01/2024'))
+        Store.compact(wait=True) # X is now in the snapshot
+        Store = VaultStore(self.path)
+        A = Account('X', 'user', 'secret', category='Work', notes='notes', date='01/01/2024')
+        Store.track(A)
+        A.set_name('Y')
+        Store.upsert(A, ['name'])
+        Store.upsert(Account('X', 'new user', 'new secret', category='Other', notes='', date='02/02/2024'))
+
+        records = self.records()
+        self.assertEqual(records['Y']['username'], 'user')
+        self.assertEqual(records['Y']['password'], 'secret')
+        self.assertEqual(records['Y']['category'], 'Work')
+        self.assertEqual(records['Y']['notes'], 'notes')
+        self.assertEqual(records['X']['username'], 'new user')
+        self.assertEqual(records['X']['password'], 'new secret')
+
+        # streaming and compaction agree
+        Store.compact(wait=True)
+        self.assertEqual(self.records(), records)
+
+    def test_delete_then_reuse_name(self):
+        '''a deleted snapshot account does not fill in the fields of a new account with the same name'''
+        Store = VaultStore(self.path)
+        Store.upsert(Account('X', 'user', 'secret', category='Work', notes='notes', date='01/01/2024'))
+        Store.compact(wait=True)
+        Store = VaultStore(self.path)
+        A = Account('X', 'user', 'secret')
+        Store.track(A)
+        Store.delete(A)
+        Store.upsert(Account('X', 'other', 'pw', category='Other', notes='', date=''))
+        records = self.records()
+        self.assertEqual(list(records), ['X'])
+        self.assertEqual(records['X']['username'], 'other')
+        self.assertEqual(records['X']['notes'], '')
+
+    def write_snapshot(self, rows:list):
+        '''writes a csv snapshot as older versions did - names may repeat'''
+        with open(self.path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for name, username in rows:
+                writer.writerow({'name': name, 'username': username, 'password': '', 'category': 'Other',
+                                 'notes': '', 'date': ''})
+
+    def test_duplicate_names_are_renamed(self):
+        '''accounts that share a name are renamed, not dropped - the last one keeps the name'''
+        self.write_snapshot([('New Account', 'a'), ('New Account', 'b'), ('New Account (2)', 'c'),
+                             ('New Account', 'd')])
+        Store = VaultStore(self.path)
+        self.assertEqual(Store.fix_duplicate_names(), [('New Account', 'New Account (3)'),
+                                                       ('New Account', 'New Account (4)')])
+        self.assertEqual(Store.fix_duplicate_names(), []) # snapshot was rewritten
+        expected = {'New Account (3)': 'a', 'New Account (4)': 'b', 'New Account (2)': 'c', 'New Account': 'd'}
+        self.assertEqual({name: rec['username'] for name, rec in self.records().items()}, expected)
+
+    def test_compaction_keeps_duplicate_names(self):
+        '''compaction renames duplicates instead of deleting all but one of them'''
+        self.write_snapshot([('X', 'a'), ('X', 'b')])
+        Store = VaultStore(self.path)
+        Store.upsert(Account('Y', 'c', ''))
+        Store.compact(wait=True)
+        self.assertEqual({name: rec['username'] for name, rec in self.records().items()},
+                         {'X (2)': 'a', 'X': 'b', 'Y': 'c'})
+
+
+if __name__ == '__main__':
+    unittest.main()
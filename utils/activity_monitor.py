@@ -0,0 +1,30 @@
+import time
+
+
+class ActivityMonitor:
+    ''' Records the time of the last mouse click, key press or scroll in the app
+
+        Each event only stores a timestamp - nothing is reset or rescheduled.
+        Objects that depend on activity, such as TimeoutBar, read the
+        timestamp when they next need it.
+    '''
+    def __init__(self, root, events=('<ButtonPress>', '<KeyPress>', '<MouseWheel>')):
+        '''
+        Parameters
+        ----------
+            :param root: tk.Tk - events anywhere in root are recorded
+            :param events: tuple of str - event sequences that count as activity
+                                          (<ButtonPress> includes mouse wheel buttons 4 and 5 on Linux)
+        '''
+        self.__last = time.monotonic()
+        for sequence in events:
+            # add='+' causes this to not override other bindings
+            root.bind_all(sequence, self.__record, add='+')
+
+    def __record(self, event=None):
+        '''private - called on every activity event'''
+        self.__last = time.monotonic()
+
+    def get_last_activity(self) -> float:
+        '''returns time.monotonic() of the last activity'''
+        return self.__last
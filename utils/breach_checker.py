@@ -0,0 +1,172 @@
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import hashlib, os
+
+
+record_size = 20 # bytes of a SHA-1 hash
+fanout_bits = 16 # fan-out table has one entry per prefix of this many bits
+
+
+def password_hash(password:str) -> bytes:
+    '''returns SHA-1 digest of password - the hash used by breached password lists'''
+    return hashlib.sha1(password.encode('utf-8')).digest()
+
+def convert_hash_list(text_path:str, binary_path:str, chunk_lines=1000000) -> int:
+    '''
+    Purpose:
+        converts a downloaded breached password list to the binary layout used by BreachCorpus
+        lines look like "<40 hex digit SHA-1>:<count>" and must be sorted by hash
+        (as the "ordered by hash" download is) - the file is streamed in chunks
+        the fan-out table is written next to the binary file when done
+    Pre-conditions:
+        :param text_path: str - path of text hash list
+        :param binary_path: str - path of binary file to write - 20 bytes per hash, sorted
+        :param chunk_lines: int - number of lines converted at a time
+    Post-conditions:
+        writes binary file and fan-out table
+    Returns:
+        :return: int - number of hashes written
+    '''
+    count = 0
+    with open(text_path, 'r') as text, open(binary_path, 'wb') as binary:
+        while True:
+            lines = text.readlines(chunk_lines * 50) # about chunk_lines lines
+            if len(lines) == 0:
+                break
+            hashes = [line[:2 * record_size] for line in lines if line.strip()]
+            binary.write(bytes.fromhex(''.join(hashes)))
+            count += len(hashes)
+    write_fanout(binary_path)
+    return count
+
+def write_fanout(binary_path:str) -> np.ndarray:
+    '''
+    Purpose:
+        writes fan-out table of a binary hash file to binary_path + '.fanout'
+        entry p is the index of the first hash whose first fanout_bits bits are >= p,
+        so the hashes with prefix p are records[table[p]:table[p + 1]]
+    Pre-conditions:
+        :param binary_path: str - path of sorted binary hash file
+    Post-conditions:
+        writes fan-out file
+    Returns:
+        :return: np.ndarray of uint64 - fan-out table
+    '''
+    records = np.memmap(binary_path, dtype=f'S{record_size}', mode='r')
+    prefixes = np.arange(2 ** fanout_bits, dtype='>u2').tobytes()
+    bounds = np.frombuffer(prefixes, dtype='S2').astype(f'S{record_size}') # prefixes padded with zero bytes
+    table = np.append(np.searchsorted(records, bounds), len(records)).astype(np.uint64)
+    table.tofile(binary_path + '.fanout')
+    return table
+
+
+class BreachCorpus:
+    ''' Sorted file of breached password hashes, searched without loading it
+
+        The file holds 20 byte SHA-1 hashes in sorted order (see
+        convert_hash_list) and is memory-mapped, so a lookup only reads the
+        pages touched by its binary search - a corpus of tens of GB costs no
+        memory. The optional fan-out table (binary_path + '.fanout') gives the
+        range of hashes that share the first 16 bits of a hash, so the binary
+        search starts in a range 65536 times smaller and touches fewer pages.
+    '''
+    def __init__(self, binary_path:str):
+        '''
+        Parameters
+        ----------
+            :param binary_path: str - path of sorted binary hash file
+                                      raises ValueError if the file or its fan-out table is empty or truncated
+        '''
+        self.__path = binary_path
+        self.__records = np.memmap(binary_path, dtype=f'S{record_size}', mode='r')
+        self.__fanout = None # np.ndarray of uint64 - None if there is no fan-out file
+        if os.path.exists(binary_path + '.fanout'):
+            self.__fanout = np.fromfile(binary_path + '.fanout', dtype=np.uint64)
+            if len(self.__fanout) != 2 ** fanout_bits + 1:
+                raise ValueError(f'Fan-out table of {binary_path} is truncated')
+
+    def get_path(self) -> str:
+        '''returns path of binary hash file'''
+        return self.__path
+
+    def __len__(self) -> int:
+        '''returns number of hashes in corpus'''
+        return len(self.__records)
+
+    def contains_hash(self, digest:bytes) -> bool:
+        '''returns True if 20 byte digest is in corpus - one binary search'''
+        lo, hi = 0, len(self.__records)
+        if self.__fanout is not None:
+            prefix = int.from_bytes(digest[:fanout_bits // 8], 'big')
+            lo, hi = int(self.__fanout[prefix]), int(self.__fanout[prefix + 1])
+        records = self.__records[lo:hi]
+        i = int(np.searchsorted(records, digest))
+        return i < len(records) and records[i:i + 1].tobytes() == digest # raw bytes - numpy strips trailing zero bytes
+
+    def contains_password(self, password:str) -> bool:
+        '''returns True if password is in corpus'''
+        return self.contains_hash(password_hash(password))
+
+    def contains_many(self, digests:list) -> list:
+        '''
+        Purpose:
+            looks up many digests in one vectorized binary search
+            digests are sorted first so that neighbouring searches touch the same
+            pages - the fan-out table is not needed, numpy starts each search
+            from the result of the previous one
+        Pre-conditions:
+            :param digests: list of bytes - 20 byte digests
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of bool - True for each digest that is in corpus, in the same order as digests
+        '''
+        if len(digests) == 0:
+            return []
+        queries = np.frombuffer(b''.join(digests), dtype=f'S{record_size}') # raw bytes - no trailing zeros stripped
+        order = np.argsort(queries)
+        index = np.searchsorted(self.__records, queries[order])
+        inside = index < len(self.__records)
+        found = np.zeros(len(queries), dtype=bool)
+        # compare raw bytes of matches as rows of uint8
+        matches = self.__records[index[inside]].view(np.uint8).reshape(-1, record_size)
+        wanted = queries[order[inside]].view(np.uint8).reshape(-1, record_size)
+        found[order[inside]] = np.all(matches == wanted, axis=1)
+        return found.tolist()
+
+
+corpus = None # BreachCorpus of each pool process - opened once by open_corpus
+
+def open_corpus(binary_path:str):
+    '''process pool initializer - maps corpus once per process'''
+    global corpus
+    corpus = BreachCorpus(binary_path)
+
+def check_chunk(digests:list) -> list:
+    '''process pool task - looks up a chunk of digests in the corpus of this process'''
+    return corpus.contains_many(digests)
+
+def check_passwords(binary_path:str, passwords:list, processes:int=None, chunk_size=4096) -> list:
+    '''
+    Purpose:
+        checks every password against the corpus with a pool of processes
+        passwords are hashed here - only hashes are sent to the processes -
+        and split into chunks that the processes search in parallel
+        each process maps the corpus file once, so the operating system
+        shares its cached pages between all of them
+    Pre-conditions:
+        :param binary_path: str - path of sorted binary hash file
+        :param passwords: list of str - decoded passwords
+        :param processes: int or None - number of processes - default is number of CPUs
+        :param chunk_size: int - number of hashes per task
+    Post-conditions:
+        (none)
+    Returns:
+        :return: list of bool - True for each password that is in the corpus
+    '''
+    digests = [password_hash(p) for p in passwords]
+    chunks = [digests[i:i + chunk_size] for i in range(0, len(digests), chunk_size)]
+    if len(chunks) <= 1: # not worth starting processes
+        return BreachCorpus(binary_path).contains_many(digests)
+    with ProcessPoolExecutor(processes, initializer=open_corpus, initargs=(binary_path,)) as pool:
+        return [found for results in pool.map(check_chunk, chunks) for found in results]
@@ -1,16 +1,64 @@
-import numpy as np
+from .info import database_path
+from .vault_crypto import VaultCipher, AuthenticationError, is_encrypted, is_current
 
 
 class EncodingManager:
-    ''' Placeholder class to do optional encoding/decoding
+    ''' Encrypts and decrypts account info
+
+        Values are encrypted with VaultCipher (see vault_crypto.py), which must
+        be unlocked with the encryption key first. Values saved before the
+        vault was encrypted are decoded with legacy_decode_many and are
+        re-encoded at login. In this version the legacy encoding is a
+        placeholder that does not change values.
+
+        The private utils/encoding.py (not in git) has the real legacy
+        character encoding. It subclasses EncodingManager and overrides only
+        initiate_chars and legacy_decode_many, so it gets unlock, encode_many,
+        decode_many and decode_passwords from this class. run.py and cli.py
+        use it when it exists and this class otherwise.
+
+        encode_many and decode_many process a whole column of values (such as
+        every password in the vault) at once. Passwords are encoded with the
+        name of their account as context, and must be decoded with the same
+        name - a password copied to another account cannot be decoded.
     '''
-    def __init__(self):
-        '''class to encode/decode account info'''
+    def __init__(self, meta_path:str=None):
+        '''
+        Parameters
+        ----------
+            :param meta_path: str or None - path of vault key file - default is next to database
+        '''
+        self.__Cipher = VaultCipher(database_path + '.meta' if meta_path is None else meta_path)
+
+    def unlock(self, key:str, values:list=()) -> bool:
+        '''
+        Purpose:
+            derives vault keys from encryption key
+            the first unlock of a vault sets its encryption key - only if none of values is encrypted
+        Pre-conditions:
+            :param key : str - encryption key entered at login
+            :param values : list of str - stored values of the vault (such as every password)
+        Post-conditions:
+            values can be encoded and decoded if key is correct
+        Returns:
+            :return : bool - True if key is correct, False if it is the wrong key
+            raises ValueError if the vault key file is missing but values are encrypted
+        '''
+        return self.__Cipher.unlock(key, create=not any(is_encrypted(text) for text in values))
+
+    def lock(self):
+        '''forgets vault keys - called on lockout'''
+        self.__Cipher.lock()
+
+    def is_current(self, text:str) -> bool:
+        '''returns True if text is in the current encrypted format - other values are re-encoded at login'''
+        return is_current(text)
         
     def initiate_chars(self, chars_code:int):
         '''
         Purpose:
             converts encoded (scrambled chars) into actual characters to use for encoding/decoding
+            placeholder - this version has no legacy character encoding (see legacy_decode_many)
             multiplication of chars_code with self.__factors determines reorganizing index
             there is only one chars_code that will work
             if chars_code is incorrect, the program will continue but password decoding will be wrong
@@ -22,32 +70,114 @@ class EncodingManager:
             (none)
         '''
 
-    def encode(self, text:str):
+    def encode(self, text:str, context:str=''):
         '''
         Purpose:
             encodes text
         Pre-conditions:
             :param text : str - text to be encoded
+            :param context : str - name of account text belongs to
         Post-conditions:
             (none)
         Returns:
             :return : str - encoded text
         '''
-        return text
+        return self.encode_many([text], [context])[0]
 
-    def decode(self, text:str):
+    def decode(self, text:str, context:str=''):
         '''
         Purpose:
             decodes text
         Pre-conditions:
             :param text : str - text to be decoded
+            :param context : str - name of account text was encoded with
         Post-conditions:
             (none)
         Returns:
             :return : str - decoded text
         '''
-        return text
-    
+        return self.decode_many([text], [context])[0]
+
+    def encode_many(self, texts:list, contexts:list=None) -> list:
+        '''
+        Purpose:
+            encodes every string in texts - same result as calling encode on each string
+        Pre-conditions:
+            :param texts : list of str - texts to be encoded
+            :param contexts : list of str or None - account name of each text - None is '' for all
+        Post-conditions:
+            (none)
+        Returns:
+            :return : list of str - encoded texts in the same order
+        '''
+        texts = list(texts)
+        return self.__Cipher.encrypt_many(texts, None if contexts is None else list(contexts))
+
+    def decode_many(self, texts:list, contexts:list=None) -> list:
+        '''
+        Purpose:
+            decodes every string in texts - same result as calling decode on each string
+        Pre-conditions:
+            :param texts : list of str - texts to be decoded
+            :param contexts : list of str or None - account name each text was encoded with - None is '' for all
+        Post-conditions:
+            (none)
+        Returns:
+            :return : list of str - decoded texts in the same order
+            raises ValueError if vault is locked or an encrypted value fails authentication
+        '''
+        texts = list(texts)
+        results = self.__Cipher.decrypt_many(texts, None if contexts is None else list(contexts))
+        legacy = [i for i, text in enumerate(texts) if not is_encrypted(text)]
+        if len(legacy) > 0: # values saved before the vault was encrypted
+            for i, text in zip(legacy, self.legacy_decode_many([texts[i] for i in legacy])):
+                results[i] = text
+        return results
+
+    def legacy_decode_many(self, texts:list) -> list:
+        '''
+        Purpose:
+            decodes values saved before the vault was encrypted
+            placeholder - values are not changed - overridden by the private legacy encoding
+        Pre-conditions:
+            :param texts : list of str - values without an encrypted record prefix
+            initiate_chars must have been called with the encryption key
+        Post-conditions:
+            (none)
+        Returns:
+            :return : list of str - decoded texts in the same order
+        '''
+        return list(texts)
+
+    def decode_passwords(self, accounts:list, failed:list=None) -> list:
+        '''
+        Purpose:
+            decodes the password of every account - each is decoded with its account name
+        Pre-conditions:
+            :param accounts : list of Account
+            :param failed : list or None - if given, accounts whose password fails authentication are
+                            appended to it and decode to None instead of raising
+        Post-conditions:
+            adds to failed
+        Returns:
+            :return : list of str (or None) - decoded passwords in the same order as accounts
+            raises ValueError if vault is locked, or if a password fails authentication and failed is None
+        '''
+        accounts = list(accounts)
+        try:
+            return self.decode_many([A.get_password() for A in accounts], [A.get_name() for A in accounts])
+        except AuthenticationError:
+            if failed is None:
+                raise
+        results = [] # decoded one by one to find the records that fail
+        for A in accounts:
+            try:
+                results.append(self.decode(A.get_password(), A.get_name()))
+            except AuthenticationError:
+                failed.append(A)
+                results.append(None)
+        return results
+
     def raw_encode(self, text:str):
         '''
         Purpose:
@@ -1,9 +1,9 @@
 from tkinter import Frame, Label
-from chichitk import CheckEntry, TextBox, IconButton
-from pandas.io import clipboard
+from chichitk import CheckEntry, TextBox
 
 
 from .info import font_name, font_name_bold, font_size_header, font_size_small, font_size_normal
+from .icons import CachedIconButton
 
 
 class EntryField(Frame):
@@ -46,8 +46,8 @@ class EntryField(Frame):
                                   font_size=font_size)
         self.__Entry.pack(side='left')
         if copy_button:
-            self.__Copy = IconButton(entry_frame, 'icons\\copy.png',
-                                     lambda: clipboard.copy(self.get_text()),
+            self.__Copy = CachedIconButton(entry_frame, 'icons\\copy.png',
+                                     self.copy_text,
                                      bar_height=0, selectable=False, inactive_bg=bg,
                                      popup_label='Copy', click_popup='Copied!')
             self.__Copy.pack(side='right')
@@ -67,6 +67,15 @@ class EntryField(Frame):
         '''returns Entry widget'''
         return self.__Entry
 
+    def bind_modified(self, function):
+        '''calls function (0 arguments) whenever text in entry box changes - including set_text()'''
+        self.__Entry.sv.trace_add('write', lambda name, index, mode: function())
+
+    def copy_text(self):
+        '''copies text in entry box to clipboard'''
+        self.clipboard_clear()
+        self.clipboard_append(self.get_text())
+
     def set_active(self):
         '''sets entry box state so that it is interactable'''
         self.__active = True
@@ -188,6 +197,10 @@ class BoxField(Frame):
         '''returns Entry widget'''
         return self.__Entry
 
+    def bind_modified(self, function):
+        '''calls function (0 arguments) whenever text in text box changes - including set_text()'''
+        self.__Entry.box.bind('<<TextModified>>', lambda e: function(), add='+')
+
     def set_active(self):
         '''sets entry box state so that it is interactable'''
         self.__active = True
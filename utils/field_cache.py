@@ -0,0 +1,54 @@
+from collections import OrderedDict
+import time
+
+
+class FieldCache:
+    ''' Least recently used cache of decrypted fields with an expiry time
+
+        Keys include the encrypted value, such as (Account, 'password',
+        encrypted password), so an entry can never be returned for a value
+        that has since changed. Entries expire ttl seconds after they were
+        added, and the whole cache is cleared at lockout, so plain text is
+        not kept longer than the session.
+    '''
+    def __init__(self, max_size=64, ttl=60):
+        '''
+        Parameters
+        ----------
+            :param max_size: int - maximum number of cached fields
+            :param ttl: float - seconds that a field stays in cache
+        '''
+        self.__max_size = max_size
+        self.__ttl = ttl
+        self.__entries = OrderedDict() # key -> (expiry time, decrypted value)
+
+    def get(self, key:tuple):
+        '''returns cached value of key, or None if key is not cached or has expired'''
+        if key not in self.__entries:
+            return None
+        expiry, value = self.__entries[key]
+        if time.monotonic() >= expiry:
+            del self.__entries[key]
+            return None
+        self.__entries.move_to_end(key)
+        return value
+
+    def put(self, key:tuple, value:str):
+        '''adds value to cache - removes expired entries and least recently used entry if cache is full'''
+        now = time.monotonic()
+        self.__entries[key] = (now + self.__ttl, value)
+        self.__entries.move_to_end(key)
+        # entries are in order of use - expired entries are usually at the front
+        while len(self.__entries) > 0:
+            oldest = next(iter(self.__entries))
+            if now < self.__entries[oldest][0] and len(self.__entries) <= self.__max_size:
+                break
+            del self.__entries[oldest]
+
+    def clear(self):
+        '''removes all cached values'''
+        self.__entries.clear()
+
+    def __len__(self):
+        '''returns number of cached values'''
+        return len(self.__entries)
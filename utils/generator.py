@@ -1,10 +1,10 @@
-from tkinter import Toplevel, Frame, Label, messagebox
-from chichitk import CheckEntry, CheckButton, IconButton, ToggleLabelButton, RangeLabel
-from pandas.io import clipboard
-import random
+from tkinter import Toplevel, Frame, Label, messagebox, filedialog
+from chichitk import CheckEntry, CheckButton, ToggleLabelButton, RangeLabel
 
 from .info import ascii_lowercase, ascii_uppercase, digits, punctuation
 from .info import colors, font_name, font_name_bold, font_size_normal, font_size_header
+from .icons import CachedIconButton
+from .password_generator import generate_passwords, write_passwords
 
 
 def brighten(hex_code:str, fact:float):
@@ -25,8 +25,11 @@ def brighten(hex_code:str, fact:float):
 
 class GeneratorFrame(Frame):
     def __init__(self, master, bg:str, top_bg:str=colors['background0'],
-                 fg:str='#ffffff', sep_width=2):
-        '''frame to generate random passwords'''
+                 fg:str='#ffffff', sep_width=2, default_count=100, max_count=1000000):
+        '''frame to generate random passwords
+        bulk row generates default_count passwords at a time (at most max_count) to a file or the clipboard
+        '''
+        self.__max_count = max_count
         Frame.__init__(self, master, bg=bg)
 
         # Top Label
@@ -41,7 +44,7 @@ class GeneratorFrame(Frame):
         # Main Frame
         frame = Frame(self, bg=bg)
         frame.pack(side='top', fill='both')
-        for row in range(7):
+        for row in range(8):
             frame.grid_rowconfigure(row, weight=1)
         pad = 2 # first and last columns are only for padding
         frame.grid_columnconfigure(0, weight=pad)
@@ -77,34 +80,105 @@ class GeneratorFrame(Frame):
                                 bg=colors['background4'], fg='#ffffff',
                                 width=40, editable=False)
         self.Entry.pack(side='left')
-        CopyButton = IconButton(inner_result_frame, 'icons\\copy.png',
-                                lambda: clipboard.copy(self.Entry.get()),
+        CopyButton = CachedIconButton(inner_result_frame, 'icons\\copy.png',
+                                self.copy_password,
                                 bar_height=0, selectable=False, inactive_bg=bg,
                                 popup_label='Copy', click_popup='Copied!')
         CopyButton.pack(side='right')
 
         button_frame = Frame(frame, bg=bg)
         button_frame.grid(row=6, column=0, columnspan=5, sticky='nsew')
-        self.Generate = IconButton(button_frame, 'icons\\edit.png',
+        self.Generate = CachedIconButton(button_frame, 'icons\\edit.png',
                                    self.generate_password, 'Generate', bar_height=0,
                                    selectable=False, inactive_bg=bg)
         self.Generate.pack()
 
-    def generate_password(self):
-        '''generates password and puts it in the EntryBox
-        gets status of CharacterSelect objects to determine which characters to include
-        '''
+        # Bulk Generation
+        bulk_frame = Frame(frame, bg=bg)
+        bulk_frame.grid(row=7, column=0, columnspan=5, sticky='nsew')
+        inner_bulk_frame = Frame(bulk_frame, bg=bg)
+        inner_bulk_frame.pack()
+        Label(inner_bulk_frame, text='Bulk Count', bg=bg, fg=fg,
+              font=(font_name, font_size_normal)).pack(side='left')
+        self.BulkCount = CheckEntry(inner_bulk_frame, default=str(default_count),
+                                    allowed_chars=digits, max_len=len(str(max_count)),
+                                    justify='center', bg=colors['background4'],
+                                    fg='#ffffff', width=8)
+        self.BulkCount.pack(side='left', padx=3)
+        SaveButton = CachedIconButton(inner_bulk_frame, 'icons\\save.png',
+                                      self.save_passwords, 'Save', bar_height=0,
+                                      selectable=False, inactive_bg=bg)
+        SaveButton.pack(side='left')
+        CopyAllButton = CachedIconButton(inner_bulk_frame, 'icons\\copy.png',
+                                         self.copy_passwords, 'Copy All', bar_height=0,
+                                         selectable=False, inactive_bg=bg,
+                                         click_popup='Copied!')
+        CopyAllButton.pack(side='left')
+
+    def get_characters(self) -> str:
+        '''returns selected characters - shows error and returns empty string if none are selected'''
         Chars = [self.UpperCase, self.LowerCase, self.Numbers, self.SpecialChars]
         characters = ''.join([C.get_characters() for C in Chars])
         if characters == '': # no characters to choose from
             m = 'No characters selected! There must be at least one character selected to generate a password.'
             messagebox.showerror(title='Password Generator Error', message=m)
+        return characters
+
+    def get_count(self) -> int:
+        '''returns number of passwords in bulk count entry - shows error and returns 0 if it is not valid'''
+        text = self.BulkCount.get()
+        if text == '' or not 0 < int(text) <= self.__max_count:
+            m = f'Bulk count must be a number between 1 and {self.__max_count}.'
+            messagebox.showerror(title='Password Generator Error', message=m)
+            return 0
+        return int(text)
+
+    def generate_password(self):
+        '''generates password and puts it in the EntryBox
+        gets status of CharacterSelect objects to determine which characters to include
+        '''
+        characters = self.get_characters()
+        if characters == '':
             return
-        password = ''.join([random.choice(characters) for _ in range(random.randint(*self.RangeLabels.get()))])
+        password = generate_passwords(characters, 1, *self.RangeLabels.get())[0]
         self.Entry.config(state='normal') # must be normal in order in insert text
         self.Entry.activate(text=password, select=False, focus=False)
         self.Entry.config(state='disabled') # set back to disabled
 
+    def copy_password(self):
+        '''copies generated password to clipboard'''
+        self.clipboard_clear()
+        self.clipboard_append(self.Entry.get())
+
+    def save_passwords(self):
+        '''
+        Purpose:
+            generates bulk count passwords and streams them to a file chosen by the user
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            writes one password per line to chosen file - nothing happens if no file is chosen
+        Returns:
+            (none)
+        '''
+        characters, count = self.get_characters(), self.get_count()
+        if characters == '' or count == 0:
+            return
+        path = filedialog.asksaveasfilename(title='Save Passwords', defaultextension='.txt',
+                                            filetypes=[('Text Files', '*.txt'), ('All Files', '*.*')])
+        if not path: # dialog was cancelled
+            return
+        with open(path, 'w', newline='\n') as f:
+            write_passwords(f, characters, count, *self.RangeLabels.get())
+
+    def copy_passwords(self):
+        '''generates bulk count passwords and copies them to clipboard - one password per line'''
+        characters, count = self.get_characters(), self.get_count()
+        if characters == '' or count == 0:
+            return
+        self.clipboard_clear()
+        self.clipboard_append('\n'.join(generate_passwords(characters, count, *self.RangeLabels.get())))
+
 class CharacterSelect:
     def __init__(self, master, label:str, characters:str, bg:str, row:int, col_start:int=0, fg='#ffffff',
                  selected=True, active=True, check_box_padx=3, check_box_pady=3):
@@ -120,7 +194,7 @@ class CharacterSelect:
                                     bar_height=0, selected=selected, active=active)
         self.CheckBox.grid(row=row, column=col_start + 1, padx=check_box_padx, pady=check_box_pady)
 
-        self.EditButton = IconButton(master, 'icons\\edit.png',
+        self.EditButton = CachedIconButton(master, 'icons\\edit.png',
                                      self.open_edit_window, label='Edit',
                                      bar_height=0, selectable=False, inactive_bg=bg)
         self.EditButton.grid(row=row, column=col_start + 2)
@@ -155,13 +229,13 @@ class CharacterWindow(Toplevel):
         # Footer
         footer_frame = Frame(self, bg=footer_bg)
         footer_frame.pack(side='bottom', fill='x')
-        Button = IconButton(footer_frame, 'icons\\check.png', self.destroy, label='Ok',
+        Button = CachedIconButton(footer_frame, 'icons\\check.png', self.destroy, label='Ok',
                             bar_height=0, selectable=False, inactive_bg=footer_bg)
         Button.pack(side='right', padx=2)
-        SelectButton = IconButton(footer_frame, 'icons\\checkbox.png',
+        SelectButton = CachedIconButton(footer_frame, 'icons\\checkbox.png',
                                   self.select_all, label='Select All', bar_height=0,
                                   selectable=False, inactive_bg=footer_bg)
-        DeselectButton = IconButton(footer_frame, 'icons\\box.png',
+        DeselectButton = CachedIconButton(footer_frame, 'icons\\box.png',
                                     self.deselect_all, label='Deselect All', bar_height=0,
                                     selectable=False, inactive_bg=footer_bg)
         SelectButton.pack(side='left', padx=2)
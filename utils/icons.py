@@ -0,0 +1,100 @@
+from chichitk import IconButton
+from chichitk.buttons import image_replace_colors
+from PIL import Image, ImageTk
+import numpy as np
+import cv2
+
+
+# Decoded icons and colored images are shared by every button in the app
+arrays = {} # icon path -> decoded image (np.ndarray) - read only
+images = {} # (Tk interpreter, icon path, fg, bg) -> ImageTk.PhotoImage
+placeholder = np.zeros((1, 1, 3), dtype=np.uint8) # icon given to IconButton before shared images are set
+
+
+def load_icon(icon_path:str):
+    '''
+    Purpose:
+        returns decoded image of .png file - each file is only decoded once
+        the array is read only - IconButton copies it before changing colors
+    Pre-conditions:
+        :param icon_path: str - path to .png file in icons folder
+    Post-conditions:
+        (none)
+    Returns:
+        :return: np.ndarray - 3d image array - can be passed to any chichitk button as icon
+    '''
+    if icon_path not in arrays:
+        img = cv2.imread(icon_path)
+        if img is None:
+            raise FileNotFoundError(f'Icon could not be loaded: {icon_path}')
+        img.flags.writeable = False
+        arrays[icon_path] = img
+    return arrays[icon_path]
+
+def icon_image(widget, icon_path:str, fg:str, bg:str) -> ImageTk.PhotoImage:
+    '''
+    Purpose:
+        returns icon with white replaced by fg and black replaced by bg
+        each combination of icon and colors is only created once
+    Pre-conditions:
+        :param widget: tk widget - image belongs to Tk interpreter of widget
+        :param icon_path: str - path to .png file in icons folder
+        :param fg: str (hex code) - icon color
+        :param bg: str (hex code) - background color
+    Post-conditions:
+        (none)
+    Returns:
+        :return: ImageTk.PhotoImage - shared image - must not be changed
+    '''
+    key = (widget.tk, icon_path, fg, bg)
+    if key not in images:
+        img = image_replace_colors(load_icon(icon_path).copy(), [('#ffffff', fg), ('#000000', bg)])
+        images[key] = ImageTk.PhotoImage(image=Image.fromarray(img), master=widget)
+    return images[key]
+
+
+class CachedIconButton(IconButton):
+    ''' IconButton that uses shared images from icon_image()
+
+        IconButton decodes its .png file and creates a new PhotoImage for
+        every color state, and again whenever a color is changed. This
+        button takes them from the shared cache, so any number of buttons
+        with the same icon and colors (such as the delete button of every
+        account row) cost no image memory beyond the first one.
+    '''
+    def __init__(self, master, icon_path:str, command, label:str='', bar_height:int=3, **kwargs):
+        '''
+        Parameters
+        ----------
+            :param master: frame in which to put button
+            :param icon_path: str - path to .png file
+            :param command: 0 argument function - function to be executed when button is clicked
+            :param label: str - text beside icon
+            :param bar_height: Int - height of bar at the bottom of button
+        '''
+        base_img = load_icon(icon_path) # raises FileNotFoundError before any widget is created
+        # IconButton builds the widgets - a 1 pixel placeholder keeps it from decoding and coloring the icon
+        IconButton.__init__(self, master, placeholder, command, label=label, bar_height=bar_height, **kwargs)
+        self.icon_path, self.base_img = icon_path, base_img
+        # placeholder images are replaced (and freed) by the shared images
+        self.images = [[icon_image(self, icon_path, self.fg_colors[x][y], self.bg_colors[x][y]) for y in [0, 1]] for x in [0, 1]]
+        self.off_icon = icon_image(self, icon_path, self.off_fg, self.bg_colors[0][0])
+        self.config_colors()
+
+    def set_color(self, color:str, which:str='bg', selected:bool=False, hover:bool=False):
+        '''sets a single color
+
+        color : str (hex code)
+        which : str - options: ['bg', 'fg', 'bar']
+        selected : bool - selected color
+        hover : bool - hover color
+        '''
+        if which == 'bg':
+            self.bg_colors[selected][hover] = color
+        elif which == 'fg':
+            self.fg_colors[selected][hover] = color
+        elif which == 'bar':
+            self.bar_colors[selected][hover] = color
+        self.images[selected][hover] = icon_image(self, self.icon_path, self.fg_colors[selected][hover],
+                                                  self.bg_colors[selected][hover])
+        self.config_colors()
@@ -0,0 +1,172 @@
+from datetime import datetime
+import csv
+
+from .accounts import Account
+
+
+# Column names used by the csv exports of other password managers - each field
+# lists the possible column names, and url is added to notes (accounts have no url field)
+profiles = {
+    'Password Manager': {'name': ['name'], 'username': ['username'], 'password': ['password'],
+                         'category': ['category'], 'notes': ['notes'], 'date': ['date']},
+    'Bitwarden': {'name': ['name'], 'username': ['login_username'], 'password': ['login_password'],
+                  'category': ['folder'], 'notes': ['notes'], 'url': ['login_uri']},
+    'LastPass': {'name': ['name'], 'username': ['username'], 'password': ['password'],
+                 'category': ['grouping'], 'notes': ['extra'], 'url': ['url']},
+    '1Password': {'name': ['Title', 'title'], 'username': ['Username', 'username'],
+                  'password': ['Password', 'password'], 'category': ['Type', 'Tags'],
+                  'notes': ['Notes', 'notesPlain'], 'url': ['URL', 'Url', 'url']},
+    'KeePass': {'name': ['Title', 'Account'], 'username': ['Username', 'User Name', 'Login Name'],
+                'password': ['Password'], 'category': ['Group'], 'notes': ['Notes', 'Comments'],
+                'url': ['URL', 'Web Site']},
+    'Chrome': {'name': ['name'], 'username': ['username'], 'password': ['password'],
+               'notes': ['note'], 'url': ['url']},
+}
+collision_policies = ['rename', 'skip', 'overwrite']
+
+
+def detect_profile(columns:list) -> str:
+    '''
+    Purpose:
+        finds the profile that matches the most columns of a csv header
+    Pre-conditions:
+        :param columns: list of str - csv header
+    Post-conditions:
+        (none)
+    Returns:
+        :return: str - name of profile in profiles
+        raises ValueError if no profile has both a name and a password column in header
+    '''
+    best, best_count = None, 0
+    for name, profile in profiles.items():
+        found = {field for field, options in profile.items() if any(c in columns for c in options)}
+        if {'name', 'password'} <= found and len(found) > best_count:
+            best, best_count = name, len(found)
+    if best is None:
+        raise ValueError('File does not match any import profile - it needs a name and a password column')
+    return best
+
+def map_columns(columns:list, profile:dict) -> dict:
+    '''returns field -> column in header for every field of profile that header has'''
+    mapping = {}
+    for field, options in profile.items():
+        for option in options:
+            if option in columns:
+                mapping[field] = option
+                break
+    return mapping
+
+
+class AccountImporter:
+    ''' Reads accounts from the csv export of another password manager
+
+        Rows are streamed from the file and handled chunk_size at a time: the
+        passwords of a chunk are encoded together with encode_many (each with
+        the name its account ends up with), so rows are never encoded one by
+        one and the file is never held in memory.
+        The importer does not change the vault - it returns the new accounts
+        and the changes to existing accounts, so the caller can apply them
+        all at once (see VaultStore.upsert_many).
+
+        Names that are already used (by the vault or earlier rows) are
+        handled by the collision policy:
+            rename - adds " (2)", " (3)", ... to the name of the imported account
+            skip - the row is not imported
+            overwrite - the existing account is changed to the imported fields
+    '''
+    def __init__(self, EncodingManager, Registry, collisions='rename', chunk_size=512):
+        '''
+        Parameters
+        ----------
+            :param EncodingManager: EncodingManager - must be unlocked
+            :param Registry: AccountRegistry - accounts already in the vault
+            :param collisions: str - one of collision_policies
+            :param chunk_size: int - number of rows encoded at a time
+        '''
+        if collisions not in collision_policies:
+            raise ValueError(f'Collision policy must be one of {collision_policies}')
+        self.__EncodingManager = EncodingManager
+        self.__Registry = Registry
+        self.__collisions = collisions
+        self.__chunk_size = chunk_size
+
+    def read(self, file, profile:str=None) -> dict:
+        '''
+        Purpose:
+            reads every row of a csv export
+        Pre-conditions:
+            :param file: readable text file object - csv with a header row
+            :param profile: str or None - name of profile in profiles - detected from header if None
+        Post-conditions:
+            (none) - vault and existing accounts are not changed
+        Returns:
+            :return: dict with keys:
+                profile (str) - profile used
+                added (list of Account) - new accounts, in file order
+                updated (dict) - existing Account -> dict of changed fields (password encoded) - overwrite only
+                renamed (int), skipped (int) - number of rows renamed or skipped
+        '''
+        reader = csv.DictReader(file)
+        columns = reader.fieldnames or []
+        profile = detect_profile(columns) if profile is None else profile
+        mapping = map_columns(columns, profiles[profile])
+        result = {'profile': profile, 'added': [], 'updated': {}, 'renamed': 0, 'skipped': 0}
+        names = set() # names used by imported rows so far
+        chunk = []
+        for row in reader:
+            chunk.append({field: (row.get(column) or '').strip() for field, column in mapping.items()})
+            if len(chunk) == self.__chunk_size:
+                self.__read_chunk(chunk, names, result)
+                chunk = []
+        self.__read_chunk(chunk, names, result)
+        return result
+
+    def __read_chunk(self, rows:list, names:set, result:dict):
+        '''private - resolves names of rows, encodes their passwords together and adds rows to result'''
+        if len(rows) == 0:
+            return
+        date = datetime.now().strftime('%m/%d/%Y')
+        infos = [] # info dict of each new account - password is not encoded yet
+        updates = [] # (existing Account, changed fields) - password is not encoded yet
+        for row in rows:
+            notes = row.get('notes', '')
+            if row.get('url'): # accounts have no url field
+                notes = f'{notes}\nURL: {row["url"]}'.strip()
+            info = {'name': row.get('name') or row.get('url') or 'Imported Account',
+                    'username': row.get('username', ''), 'password': row.get('password', ''),
+                    'category': row.get('category') or 'Other', 'notes': notes or 'No Notes',
+                    'date': row.get('date') or date}
+            name = info['name']
+            if name in names or name in self.__Registry:
+                if self.__collisions == 'skip':
+                    result['skipped'] += 1
+                    continue
+                if self.__collisions == 'overwrite' and name in self.__Registry and name not in names:
+                    A = self.__Registry.get(name)
+                    old = A.get_info_dict()
+                    # password is compared decoded - encoded values of equal passwords differ
+                    old['password'] = self.__EncodingManager.decode(old['password'], name)
+                    changes = {f: info[f] for f in ['username', 'password', 'category', 'notes'] if info[f] != old[f]}
+                    if len(changes) > 0:
+                        updates.append((A, changes))
+                    names.add(name)
+                    continue
+                n = 2 # rename - also used when overwrite meets a name repeated within the file
+                while f'{name} ({n})' in names or f'{name} ({n})' in self.__Registry:
+                    n += 1
+                info['name'] = f'{name} ({n})'
+                result['renamed'] += 1
+            names.add(info['name'])
+            infos.append(info)
+        # passwords are encoded with the final account name, so names are resolved first
+        changed = [(A, changes) for A, changes in updates if 'password' in changes]
+        passwords = self.__EncodingManager.encode_many([info['password'] for info in infos] +
+                                                       [changes['password'] for A, changes in changed],
+                                                       [info['name'] for info in infos] +
+                                                       [A.get_name() for A, changes in changed])
+        for info, password in zip(infos, passwords):
+            result['added'].append(Account(info['name'], info['username'], password,
+                                           category=info['category'], notes=info['notes'], date=info['date']))
+        for (A, changes), password in zip(changed, passwords[len(infos):]):
+            changes['password'] = password
+        result['updated'].update(updates)
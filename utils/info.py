@@ -1,5 +1,6 @@
 
 database_path = 'C:\\Users\\samue\\OneDrive\\Documents\\Passwords\\passwords_database.csv'
+breach_path = 'C:\\Users\\samue\\OneDrive\\Documents\\Passwords\\breached_hashes.bin' # made by breach_checker.convert_hash_list
 
 # Allowed Characters
 ascii_uppercase = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
@@ -0,0 +1,92 @@
+import numpy as np
+import os
+
+
+def random_indices(n:int, k:int) -> np.ndarray:
+    '''
+    Purpose:
+        draws n uniform random integers in [0, k) from the operating system's secure source
+        random bytes are rejection sampled - values at or above the largest
+        multiple of k are dropped - so every integer is equally likely
+    Pre-conditions:
+        :param n: int - number of integers to draw
+        :param k: int between 1 and 2 ** 32 - number of possible values
+    Post-conditions:
+        (none)
+    Returns:
+        :return: np.ndarray of int64 - n random integers
+        raises ValueError if k is out of range
+    '''
+    if not 1 <= k <= 2 ** 32:
+        raise ValueError(f'Cannot draw random integers from {k} values')
+    dtype = np.uint8 if k <= 2 ** 8 else np.uint32
+    span = 2 ** (8 * np.dtype(dtype).itemsize)
+    limit = span - span % k # values below limit map evenly onto [0, k) - Python int, may be span itself
+    result = np.empty(0, dtype=np.int64)
+    while len(result) < n:
+        missing = n - len(result)
+        draw = int(missing * span / limit) + 16 # expected to be enough in one pass
+        values = np.frombuffer(os.urandom(draw * np.dtype(dtype).itemsize), dtype=dtype)
+        values = values.astype(np.int64) # compared as int64 - limit does not fit in dtype when k divides span
+        values = values[values < limit][:missing]
+        result = np.concatenate([result, values % k])
+    return result
+
+def generate_passwords(characters:str, n:int, min_length:int, max_length:int) -> list:
+    '''
+    Purpose:
+        generates n random passwords in one batched pass
+        lengths and characters of all passwords are drawn at once and the
+        passwords are built from a single array of code points
+    Pre-conditions:
+        :param characters: str - characters to choose from - must not be empty
+        :param n: int - number of passwords
+        :param min_length: int - minimum password length
+        :param max_length: int - maximum password length (inclusive)
+    Post-conditions:
+        (none)
+    Returns:
+        :return: list of str - n passwords
+        raises ValueError if characters is empty or min_length is more than max_length
+    '''
+    if characters == '':
+        raise ValueError('No characters to generate passwords from')
+    if min_length > max_length:
+        raise ValueError(f'Minimum length {min_length} is more than maximum length {max_length}')
+    if n <= 0:
+        return []
+    alphabet = np.frombuffer(characters.encode('utf-32-le'), dtype=np.uint32)
+    lengths = min_length + random_indices(n, max_length - min_length + 1)
+    codes = alphabet[random_indices(int(lengths.sum()), len(alphabet))]
+    joined = codes.tobytes().decode('utf-32-le')
+    ends = np.cumsum(lengths).tolist()
+    return [joined[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+def iter_passwords(characters:str, n:int, min_length:int, max_length:int, batch_size=4096):
+    '''yields lists of at most batch_size passwords until n passwords have been generated'''
+    for start in range(0, n, batch_size):
+        yield generate_passwords(characters, min(batch_size, n - start), min_length, max_length)
+
+def write_passwords(file, characters:str, n:int, min_length:int, max_length:int, batch_size=4096) -> int:
+    '''
+    Purpose:
+        streams n generated passwords to file - one password per line
+        passwords are generated and written one batch at a time, so memory
+        does not grow with n
+    Pre-conditions:
+        :param file: writable text file object
+        :param characters: str - characters to choose from - must not be empty
+        :param n: int - number of passwords
+        :param min_length: int - minimum password length
+        :param max_length: int - maximum password length (inclusive)
+        :param batch_size: int - number of passwords generated at a time
+    Post-conditions:
+        writes n lines to file
+    Returns:
+        :return: int - number of passwords written
+    '''
+    count = 0
+    for batch in iter_passwords(characters, n, min_length, max_length, batch_size):
+        file.write('\n'.join(batch) + '\n')
+        count += len(batch)
+    return count
@@ -0,0 +1,77 @@
+class AccountRegistry:
+    ''' Shared lookup of accounts and their displays by account name
+
+        App, AccountsPage and EditPage all look accounts up by name. The
+        registry keeps name -> Account and name -> AccountDisplay maps so that
+        these lookups do not scan lists. Renames are followed through
+        Account.add_listener, so the maps stay keyed by the current names.
+    '''
+    def __init__(self, accounts:list=()):
+        '''
+        Parameters
+        ----------
+            :param accounts: list of Account objects - initial accounts
+        '''
+        self.__accounts = {} # name -> Account
+        self.__displays = {} # name -> AccountDisplay currently showing account
+        for A in accounts:
+            self.add(A)
+
+    def add(self, Account):
+        '''adds Account to registry and follows changes to its name
+        raises ValueError if another account already has its name - it would be lost'''
+        if self.__accounts.get(Account.get_name(), Account) is not Account:
+            raise ValueError(f'Account name "{Account.get_name()}" is already used')
+        self.__accounts[Account.get_name()] = Account
+        Account.add_listener(self.__account_changed)
+
+    def remove(self, Account):
+        '''removes Account (and its display) from registry - does nothing if Account is not registered'''
+        if self.__accounts.get(Account.get_name()) is Account:
+            del self.__accounts[Account.get_name()]
+            self.__displays.pop(Account.get_name(), None)
+            Account.remove_listener(self.__account_changed)
+
+    def __account_changed(self, Account, field:str, old_value:str):
+        '''private - called by Account when a field changes - moves renamed accounts'''
+        if field == 'name' and self.__accounts.get(old_value) is Account:
+            del self.__accounts[old_value]
+            self.__accounts[Account.get_name()] = Account
+            if old_value in self.__displays:
+                self.__displays[Account.get_name()] = self.__displays.pop(old_value)
+
+    def get(self, name:str):
+        '''returns Account with name, or None if there is no such account'''
+        return self.__accounts.get(name)
+
+    def get_accounts(self) -> list:
+        '''returns list of all accounts'''
+        return list(self.__accounts.values())
+
+    def get_names(self) -> list:
+        '''returns list of all account names'''
+        return list(self.__accounts)
+
+    def set_display(self, name:str, Display):
+        '''registers Display (AccountDisplay) as the widget currently showing account with name'''
+        self.__displays[name] = Display
+
+    def remove_display(self, name:str):
+        '''unregisters display of account with name - does nothing if it has no display'''
+        self.__displays.pop(name, None)
+
+    def get_display(self, name:str):
+        '''returns AccountDisplay currently showing account with name, or None'''
+        return self.__displays.get(name)
+
+    def get_displays(self) -> list:
+        '''returns list of all registered AccountDisplay objects'''
+        return list(self.__displays.values())
+
+    def __contains__(self, name:str):
+        '''returns True if there is an account with name'''
+        return name in self.__accounts
+
+    def __len__(self):
+        '''returns number of accounts'''
+        return len(self.__accounts)
@@ -0,0 +1,92 @@
+import hmac, os
+
+
+class ReuseIndex:
+    ''' Finds accounts that share a password
+
+        Each decoded password is reduced to a keyed hash (HMAC-SHA256) and
+        accounts are grouped by hash, so finding the accounts that use a
+        password - or every group of reused passwords - is a dictionary
+        lookup. Only hashes are kept, never passwords. The key is random and
+        only lives as long as the index, so the hashes cannot be compared
+        with anything outside of this session.
+    '''
+    def __init__(self):
+        self.__key = os.urandom(32)
+        self.__hash_of = {} # Account -> hash of its password
+        self.__accounts_of = {} # hash -> {Account: None} - accounts using password, in order added
+
+    def __hash(self, password:str) -> bytes:
+        '''private - returns keyed hash of password'''
+        return hmac.digest(self.__key, password.encode('utf-8'), 'sha256')
+
+    def build(self, accounts:list, passwords:list):
+        '''
+        Purpose:
+            indexes every account - replaces anything already indexed
+        Pre-conditions:
+            :param accounts: list of Account
+            :param passwords: list of str - decoded password of each account
+        Post-conditions:
+            changes index
+        Returns:
+            (none)
+        '''
+        self.clear()
+        for Account, password in zip(accounts, passwords):
+            self.update(Account, password)
+
+    def update(self, Account, password:str) -> list:
+        '''
+        Purpose:
+            indexes the new password of Account - called when it is saved
+        Pre-conditions:
+            :param Account: Account - account that was saved
+            :param password: str - decoded password - empty passwords are not indexed
+        Post-conditions:
+            changes index
+        Returns:
+            :return: list of Account - other accounts that use the same password
+        '''
+        self.remove(Account)
+        if password == '':
+            return []
+        digest = self.__hash(password)
+        self.__hash_of[Account] = digest
+        accounts = self.__accounts_of.setdefault(digest, {})
+        accounts[Account] = None
+        return [A for A in accounts if A is not Account]
+
+    def remove(self, Account):
+        '''removes Account from index - called when it is deleted'''
+        digest = self.__hash_of.pop(Account, None)
+        if digest is None:
+            return
+        accounts = self.__accounts_of[digest]
+        del accounts[Account]
+        if len(accounts) == 0:
+            del self.__accounts_of[digest]
+
+    def clear(self):
+        '''forgets every account and changes key - called at lockout'''
+        self.__key = os.urandom(32)
+        self.__hash_of = {}
+        self.__accounts_of = {}
+
+    def get_clusters(self) -> list:
+        '''
+        Purpose:
+            lists every password that is used by more than one account
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of list of Account - one list per reused password, largest first
+        '''
+        clusters = [list(accounts) for accounts in self.__accounts_of.values() if len(accounts) > 1]
+        return sorted(clusters, key=len, reverse=True)
+
+    def __len__(self) -> int:
+        '''returns number of indexed accounts'''
+        return len(self.__hash_of)
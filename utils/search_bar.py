@@ -1,16 +1,17 @@
 from tkinter import Frame, Label
-from chichitk import CheckEntry, IconButton
-
-from difflib import get_close_matches
+from chichitk import CheckEntry
+from threading import Lock
 
 from .info import colors, font_name, font_size_normal
-
-# enhance search algorithm - build on top of get_close_matches()
+from .search_index import NGramIndex, SearchCache, score_all, best_matches
+from .search_worker import SearchWorker
+from .icons import CachedIconButton
 
 class SearchBar(Frame):
     def __init__(self, master, results:list, show_accounts_command, show_all_command,
                  bg:str=colors['background0'], entry_bg:str=colors['background2'], menu_hover_bg=colors['background4'],
-                 label_fg=colors['inactive_icon'], entry_fg='#ffffff', max_results=5):
+                 label_fg=colors['inactive_icon'], entry_fg='#ffffff', max_results=5,
+                 debounce_ms=120, poll_ms=15, text_index=None):
         '''search bar to search existing accounts
         
         Parameters
@@ -20,11 +21,22 @@ class SearchBar(Frame):
             results : list of str - list of all accounts
             show_accounts_command : 1 argument function (list of str) - called with list of account names on each keystroke
             show_all_command : 0 argument function - called when search bar is cleared (with X button)
+            debounce_ms : int - search only runs once typing has paused for this long
+            poll_ms : int - how often the worker thread is checked for results
+            text_index : FullTextIndex or None - if given, words in username, category and notes are also searched
         '''
         Frame.__init__(self, master, bg=bg)
         self.__show_accounts_command = show_accounts_command
         self.__show_all_command = show_all_command
-        self.__results = results # list of str -  of possible seach results
+        self.__Index = NGramIndex(results) # trigram index of possible search results
+        self.__TextIndex = text_index # words of all account fields
+        self.__Cache = SearchCache() # candidates and scores of recent queries
+        self.__lock = Lock() # index and cache are shared with worker thread
+        self.__debounce_ms, self.__poll_ms = debounce_ms, poll_ms
+        self.__debounce_id = None # after() id of search waiting for typing to pause
+        self.__poll_id = None # after() id of next check for results
+        self.__failed = False # True if the latest search raised - entry shows error color
+        self.__Worker = SearchWorker(self.__search)
         self.__max_results = max_results # maximum number of results to display at once
 
         search_label = Label(self, text='Search ', bg=bg, fg=label_fg, font=(font_name, font_size_normal))
@@ -38,7 +50,7 @@ class SearchBar(Frame):
         self.Entry.pack(side='left')
         #self.Entry.bind('<FocusOut>', lambda e: self.__show_all_command())
 
-        XButton = IconButton(self, 'icons\\close.png', self.x_click,
+        XButton = CachedIconButton(self, 'icons\\close.png', self.x_click,
                              popup_label='Clear Search', bar_height=0,
                              selectable=False, inactive_bg=bg)
         XButton.pack(side='left', padx=2)
@@ -47,6 +59,7 @@ class SearchBar(Frame):
         '''
         Purpose:
             updates list of possible search results
+            only results that were added or removed are re-indexed
         Pre-conditions:
             :param results : list - possible search results
         Post-conditions:
@@ -54,7 +67,9 @@ class SearchBar(Frame):
         Returns:
             (none)
         '''
-        self.__results = results
+        with self.__lock:
+            if self.__Index.set_items(results):
+                self.__Cache.clear() # cached scores are for the old results
 
     def x_click(self):
         '''
@@ -82,12 +97,76 @@ class SearchBar(Frame):
         Post-conditions:
             (none)
         Returns:
-            :return bool - True if there is at least one result, otherwise False
+            :return bool - False if the previous search failed (entry shows error color), otherwise True
+                           results are shown by __poll when the search finishes
         '''
+        # any search in progress is stale now
+        self.__Worker.cancel()
+        if self.__debounce_id is not None:
+            self.after_cancel(self.__debounce_id)
+            self.__debounce_id = None
         if text == '':
+            if self.__poll_id is not None: # no results are coming
+                self.after_cancel(self.__poll_id)
+                self.__poll_id = None
             self.__show_all_command()
             return
-        search_results = get_close_matches(text, self.__results, n=self.__max_results, cutoff=cutoff)
-        self.__show_accounts_command(search_results)
-        return True
-    
+        self.__debounce_id = self.after(self.__debounce_ms, self.__submit, text, cutoff)
+        return not self.__failed
+
+    def __submit(self, text:str, cutoff:float):
+        '''called once typing has paused - sends search to worker thread and waits for results'''
+        self.__debounce_id = None
+        self.__Worker.submit(text, cutoff)
+        if self.__poll_id is None:
+            self.__poll_id = self.after(self.__poll_ms, self.__poll)
+
+    def __poll(self):
+        '''checks worker thread for results of the latest search - runs in Tk mainloop'''
+        self.__poll_id = None
+        if self.__Worker.get_error() is not None: # no results are coming - stop polling
+            self.__failed = True
+            self.Entry.config(bg=self.Entry.error_color)
+            return
+        search_results = self.__Worker.get_result()
+        if search_results is not None:
+            self.__failed = False
+            self.__show_accounts_command(search_results)
+        elif self.__debounce_id is None: # latest search is still running
+            self.__poll_id = self.after(self.__poll_ms, self.__poll)
+
+    def __search(self, cancelled, text:str, cutoff:float):
+        '''
+        Purpose:
+            finds account names that best match text - runs in worker thread
+        Pre-conditions:
+            :param cancelled : 0 argument function (-> bool) - True once a newer search was requested
+            :param text : str - search text
+            :param cutoff : float between 0 and 1 - minimum similarity of results
+        Post-conditions:
+            caches candidates and scores of text
+        Returns:
+            :return : list of str - best name matches first, followed by best
+                      full text matches, or None if search was cancelled
+        '''
+        with self.__lock:
+            scores = self.__Cache.get(text) # backspacing to a previous query
+            if scores is None:
+                # extended query narrows the candidates of the previous query
+                cached = self.__Cache.get_prefix_candidates(text)
+                if cached is None: # only results that share trigrams with text are scored
+                    candidates = self.__Index.candidates(text)
+                else:
+                    candidates = self.__Index.narrow(text, *cached)
+        if scores is None:
+            scores = score_all(text, candidates, cancelled=cancelled)
+            if scores is None:
+                return None
+            with self.__lock:
+                self.__Cache.put(text, candidates, scores)
+        search_results = best_matches(scores, self.__max_results, cutoff)
+        if self.__TextIndex is not None and not cancelled():
+            for A in self.__TextIndex.search(text, self.__max_results):
+                if A.get_name() not in search_results:
+                    search_results.append(A.get_name())
+        return search_results
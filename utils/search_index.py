@@ -0,0 +1,201 @@
+from difflib import SequenceMatcher
+from collections import Counter, OrderedDict
+from heapq import nlargest
+
+
+class NGramIndex:
+    ''' Index of strings by their character n-grams (trigrams by default)
+
+        Used to find search candidates without comparing the query against
+        every string. Candidates are the strings that share the most n-grams
+        with the query. Only the candidates are scored with difflib (see
+        score_all and best_matches), using the same similarity ratio and
+        cutoff as difflib.get_close_matches.
+
+        Strings are indexed in lowercase, but scored in their original case
+        so that ranking matches get_close_matches.
+    '''
+    def __init__(self, items:list=(), n=3, max_candidates=100):
+        '''
+        Parameters
+        ----------
+            :param items: list of str - strings to index
+            :param n: int - number of characters in each n-gram
+            :param max_candidates: int - maximum number of strings scored per search
+        '''
+        self.__n = n
+        self.__max_candidates = max_candidates
+        self.__grams = {} # item -> set of n-grams in item
+        self.__postings = {} # n-gram -> set of items containing n-gram
+        self.set_items(items)
+
+    def ngrams(self, text:str) -> set:
+        '''returns set of n-grams in text - text is padded so that short text still has n-grams'''
+        pad = ' ' * (self.__n - 1)
+        text = pad + text.lower() + pad
+        return {text[i:i + self.__n] for i in range(len(text) - self.__n + 1)}
+
+    def add(self, item:str):
+        '''adds a single string to index'''
+        if item in self.__grams:
+            return
+        grams = self.ngrams(item)
+        self.__grams[item] = grams
+        for gram in grams:
+            self.__postings.setdefault(gram, set()).add(item)
+
+    def remove(self, item:str):
+        '''removes a single string from index - does nothing if item is not indexed'''
+        for gram in self.__grams.pop(item, ()):
+            posting = self.__postings[gram]
+            posting.discard(item)
+            if len(posting) == 0:
+                del self.__postings[gram]
+
+    def set_items(self, items:list):
+        '''
+        Purpose:
+            updates index to contain exactly items
+            only strings that were added or removed since the last call are (re)indexed
+        Pre-conditions:
+            :param items: list of str - all strings that should be searchable
+        Post-conditions:
+            adds and removes strings from index
+        Returns:
+            :return: bool - True if the indexed strings changed
+        '''
+        items = set(items)
+        removed = [item for item in self.__grams if item not in items]
+        added = [item for item in items if item not in self.__grams]
+        for item in removed:
+            self.remove(item)
+        for item in added:
+            self.add(item)
+        return len(removed) > 0 or len(added) > 0
+
+    def candidates(self, query:str) -> list:
+        '''
+        Purpose:
+            finds strings that share at least one n-gram with query
+        Pre-conditions:
+            :param query: str - search text
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of str - at most max_candidates strings, most shared n-grams first
+        '''
+        counts = Counter()
+        for gram in self.ngrams(query):
+            counts.update(self.__postings.get(gram, ()))
+        return [item for item, _ in counts.most_common(self.__max_candidates)]
+
+    def narrow(self, query:str, prefix:str, candidates:list) -> list:
+        '''
+        Purpose:
+            finds candidates of query from the candidates of a prefix of query
+            candidates of prefix that share no n-gram with query are dropped, and only
+            the n-grams that query has but prefix does not are looked up in the index
+            gives the same strings as candidates(query) unless max_candidates was reached
+        Pre-conditions:
+            :param query: str - search text
+            :param prefix: str - earlier search text that query extends
+            :param candidates: list of str - result of candidates(prefix) (or of narrow)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of str - at most max_candidates strings, most shared n-grams first
+        '''
+        grams = self.ngrams(query)
+        counts = Counter({item: len(self.__grams[item] & grams) for item in candidates if item in self.__grams})
+        for gram in grams - self.ngrams(prefix):
+            for item in self.__postings.get(gram, ()):
+                if item not in counts:
+                    counts[item] = len(self.__grams[item] & grams)
+        return [item for item, count in counts.most_common(self.__max_candidates) if count > 0]
+
+    def __len__(self):
+        '''returns number of indexed strings'''
+        return len(self.__grams)
+
+class SearchCache:
+    ''' Least recently used cache of search candidates and scores by query
+
+        While a query is typed one character at a time, each query extends
+        the previous one. An extended query starts from the candidates of the
+        longest cached prefix (see NGramIndex.narrow) instead of searching the
+        index again, and backspacing to a previous query is served straight
+        from the cache.
+
+        Cached scores do not depend on cutoff or max_results, so the same
+        entry can be filtered differently. The cache must be cleared whenever
+        the searchable strings change.
+    '''
+    def __init__(self, max_size=32, min_prefix=3):
+        '''
+        Parameters
+        ----------
+            :param max_size: int - maximum number of cached queries
+            :param min_prefix: int - shortest prefix whose candidates are reused
+                                     (short prefixes have too few candidates to narrow from)
+        '''
+        self.__max_size = max_size
+        self.__min_prefix = min_prefix
+        self.__entries = OrderedDict() # query -> (candidates, list of (score, item))
+
+    def get(self, query:str):
+        '''returns cached list of (score, item) for query, or None if query is not cached'''
+        if query not in self.__entries:
+            return None
+        self.__entries.move_to_end(query)
+        return self.__entries[query][1]
+
+    def get_prefix_candidates(self, query:str):
+        '''returns (prefix, candidates) of longest cached prefix of query, or None if no prefix is cached'''
+        for end in range(len(query) - 1, self.__min_prefix - 1, -1):
+            if query[:end] in self.__entries:
+                self.__entries.move_to_end(query[:end])
+                return query[:end], self.__entries[query[:end]][0]
+        return None
+
+    def put(self, query:str, candidates:list, scores:list):
+        '''adds query to cache - removes least recently used query if cache is full'''
+        self.__entries[query] = (candidates, scores)
+        self.__entries.move_to_end(query)
+        if len(self.__entries) > self.__max_size:
+            self.__entries.popitem(last=False)
+
+    def clear(self):
+        '''removes all cached queries'''
+        self.__entries.clear()
+
+    def __len__(self):
+        '''returns number of cached queries'''
+        return len(self.__entries)
+
+def score_all(query:str, candidates:list, cancelled=None) -> list:
+    '''
+    Purpose:
+        scores every candidate by similarity to query - no cutoff is applied
+    Pre-conditions:
+        :param query: str - search text
+        :param candidates: list of str - strings to score
+        :param cancelled: 0 argument function (-> bool) or None - scoring stops when it returns True
+    Post-conditions:
+        (none)
+    Returns:
+        :return: list of tuple (float, str) - (score, candidate) in order of candidates
+                 or None if scoring was cancelled
+    '''
+    matcher = SequenceMatcher()
+    matcher.set_seq2(query)
+    scores = []
+    for item in candidates:
+        if cancelled is not None and cancelled():
+            return None
+        matcher.set_seq1(item)
+        scores.append((matcher.ratio(), item))
+    return scores
+
+def best_matches(scores:list, max_results:int, cutoff:float) -> list:
+    '''returns at most max_results items from scores (list of (score, item)) scoring at least cutoff - best first'''
+    return [item for _, item in nlargest(max_results, [s for s in scores if s[0] >= cutoff])]
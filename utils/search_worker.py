@@ -0,0 +1,101 @@
+from threading import Thread, Condition
+
+
+class SearchWorker:
+    ''' Runs searches on a background thread so that the Tk mainloop never waits on one
+
+        Only the most recent request matters. Each call to submit() or
+        cancel() starts a new generation, and any search from an older
+        generation is cancelled: it is skipped if it has not started, and a
+        running search is told to stop through the cancelled function it is
+        given. Results are never passed to Tk from the worker thread - the
+        owner collects them with get_result(), typically from an after() loop.
+        A search that raises does not stop the worker - its exception is kept
+        for get_error() instead of a result.
+    '''
+    def __init__(self, search_function):
+        '''
+        Parameters
+        ----------
+            :param search_function: function (cancelled, *args) -> results
+                cancelled is a 0 argument function that returns True once the search
+                is stale - search_function should return None as soon as it is
+        '''
+        self.__search_function = search_function
+        self.__condition = Condition()
+        self.__generation = 0 # incremented with every request or cancel
+        self.__request = None # (generation, args) - waiting to be searched
+        self.__result = None # (generation, results) - latest finished search
+        self.__error = None # (generation, exception) - latest search that raised
+        Thread(target=self.__run, daemon=True).start()
+
+    def submit(self, *args) -> int:
+        '''
+        Purpose:
+            requests a search with args - cancels any previous search
+        Pre-conditions:
+            :param args: arguments passed to search_function (after cancelled)
+        Post-conditions:
+            wakes up worker thread
+        Returns:
+            :return: int - generation of request
+        '''
+        with self.__condition:
+            self.__generation += 1
+            self.__request = (self.__generation, args)
+            self.__condition.notify()
+            return self.__generation
+
+    def cancel(self):
+        '''cancels pending and running searches - their results will never be returned'''
+        with self.__condition:
+            self.__generation += 1
+            self.__request = None
+
+    def get_result(self):
+        '''
+        Purpose:
+            collects results of the latest request, if it has finished
+            stale results are discarded
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            result is consumed - it is only returned once
+        Returns:
+            :return: results of search_function, or None if latest request is not finished
+        '''
+        with self.__condition:
+            if self.__result is None or self.__result[0] != self.__generation:
+                return None
+            results = self.__result[1]
+            self.__result = None
+            return results
+
+    def get_error(self):
+        '''returns exception raised by the search of the latest request, or None - it is only returned once'''
+        with self.__condition:
+            if self.__error is None or self.__error[0] != self.__generation:
+                return None
+            error = self.__error[1]
+            self.__error = None
+            return error
+
+    def __run(self):
+        '''private - waits for requests and searches - always runs in a Thread'''
+        while True:
+            with self.__condition:
+                while self.__request is None:
+                    self.__condition.wait()
+                generation, args = self.__request
+                self.__request = None
+            cancelled = lambda: generation != self.__generation
+            results, error = None, None
+            try:
+                results = self.__search_function(cancelled, *args)
+            except Exception as e: # reported to owner - worker keeps serving later requests
+                error = e
+            with self.__condition:
+                if error is not None:
+                    self.__error = (generation, error)
+                elif results is not None and not cancelled():
+                    self.__result = (generation, results)
@@ -0,0 +1,249 @@
+from threading import Thread, Condition
+import numpy as np
+import re
+
+from .info import digits, punctuation
+
+
+# Rows of a US keyboard - neighbouring keys (including diagonals) form keyboard walks like "qwerty" or "zxcv"
+keyboard_rows = ['`1234567890-=', 'qwertyuiop[]\\', "asdfghjkl;'", 'zxcvbnm,./']
+keyboard_shifted = ['~!@#$%^&*()_+', 'QWERTYUIOP{}|', 'ASDFGHJKL:"', 'ZXCVBNM<>?']
+
+# Common passwords and words - any of these inside a password (ignoring case and leetspeak) is a dictionary hit
+common_words = ['password', 'passw0rd', 'qwerty', 'letmein', 'welcome', 'admin', 'login', 'master',
+                'monkey', 'dragon', 'football', 'baseball', 'soccer', 'hockey', 'shadow', 'sunshine',
+                'princess', 'iloveyou', 'love', 'trustno1', 'secret', 'superman', 'batman', 'starwars',
+                'whatever', 'freedom', 'hello', 'charlie', 'michael', 'jordan', 'jennifer', 'hunter',
+                'summer', 'winter', 'spring', 'autumn', 'flower', 'computer', 'internet', 'google',
+                'access', 'default', 'changeme', 'guest', 'test', 'user', 'pass', 'abc123', 'money',
+                'cookie', 'pepper', 'ginger', 'orange', 'banana', 'apple', 'cheese', 'killer', 'ninja',
+                'mustang', 'harley', 'ranger', 'tigger', 'buster', 'maggie', 'thomas', 'robert', 'daniel']
+leet_table = str.maketrans('013457@$!|', 'oleastasii')
+
+# Score labels - scores are 0 to 4 and are set by effective entropy (bits)
+score_labels = ['Very Weak', 'Weak', 'Fair', 'Strong', 'Very Strong']
+score_bits = [28, 36, 60, 128] # lowest entropy of scores 1 to 4
+
+def keyboard_positions(max_code=128) -> np.ndarray:
+    '''returns array of (row, column) on keyboard for each code point below max_code - (-9, -9) if not a key'''
+    table = np.full((max_code, 2), -9, dtype=np.int64)
+    for rows in (keyboard_rows, keyboard_shifted):
+        for r, row in enumerate(rows):
+            for c, char in enumerate(row):
+                table[ord(char)] = (r, c)
+    return table
+
+def character_classes(max_code=128) -> np.ndarray:
+    '''returns array of character class for each code point below max_code - 0 lower, 1 upper, 2 digit, 3 symbol'''
+    table = np.full(max_code, 3, dtype=np.int64)
+    for c in range(ord('a'), ord('z') + 1):
+        table[c] = 0
+    for c in range(ord('A'), ord('Z') + 1):
+        table[c] = 1
+    for char in digits:
+        table[ord(char)] = 2
+    return table
+
+positions = keyboard_positions()
+classes = character_classes()
+class_sizes = np.array([26, 26, 10, max(33, len(punctuation)), 100]) # characters in each class - class 4 is non-ascii
+dictionary = re.compile('|'.join(sorted(map(re.escape, common_words), key=len, reverse=True)))
+
+
+def analyze_passwords(passwords:list) -> list:
+    '''
+    Purpose:
+        measures the strength of every password in one vectorized pass
+        all passwords are padded into a single (passwords x characters) array
+        of code points, and every measure is computed on the whole array:
+            - character classes used and the pool size they give
+            - repeated characters ("aaa") and sequences ("abc", "321")
+            - keyboard walks - each character next to the previous key ("qwer", "zxcv")
+        dictionary hits are found with one compiled pattern of common_words
+        each weak character (repeat, sequence, walk or dictionary word) adds
+        only 1 bit of entropy instead of log2(pool size)
+    Pre-conditions:
+        :param passwords: list of str - decoded passwords
+    Post-conditions:
+        (none)
+    Returns:
+        :return: list of dict - one report per password with keys:
+            length (int), classes (list of str), entropy (float - bits),
+            weak_chars (int), dictionary (list of str - words found), score (int 0-4), label (str)
+    '''
+    n = len(passwords)
+    if n == 0:
+        return []
+    lengths = np.array([len(p) for p in passwords], dtype=np.int64)
+    width = max(1, int(lengths.max()))
+    codes = np.zeros((n, width), dtype=np.int64)
+    joined = np.frombuffer(''.join(passwords).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    valid = np.arange(width)[None, :] < lengths[:, None] # True where a character exists
+    codes[valid] = joined
+
+    # character classes
+    ascii_codes = np.where(codes < len(classes), codes, 0)
+    char_class = np.where(codes < len(classes), classes[ascii_codes], 4)
+    used = np.stack([np.any(valid & (char_class == k), axis=1) for k in range(len(class_sizes))], axis=1)
+    pool = (used * class_sizes).sum(axis=1)
+
+    # patterns between each character and the previous one
+    pair = valid[:, 1:]
+    step = codes[:, 1:] - codes[:, :-1]
+    repeat = pair & (step == 0)
+    sequence = pair & (np.abs(step) == 1) & (char_class[:, 1:] == char_class[:, :-1])
+    key = positions[ascii_codes]
+    on_keyboard = (key[:, :, 0] >= 0) & (codes < len(classes))
+    key_step = np.abs(key[:, 1:] - key[:, :-1])
+    walk = pair & on_keyboard[:, 1:] & on_keyboard[:, :-1] & (key_step.max(axis=2) == 1) & (key_step[:, :, 0] <= 1)
+    weak = np.zeros((n, width), dtype=bool)
+    weak[:, 1:] = repeat | sequence | walk
+
+    # dictionary words - found in the lowercase, de-leeted password
+    words = []
+    for i, password in enumerate(passwords):
+        found = []
+        for match in dictionary.finditer(password.lower().translate(leet_table)):
+            weak[i, match.start():match.end()] = True
+            found.append(match.group())
+        words.append(found)
+
+    weak_chars = (weak & valid).sum(axis=1)
+    bits_per_char = np.log2(np.maximum(pool, 1))
+    entropy = (lengths - weak_chars) * bits_per_char + weak_chars * np.minimum(bits_per_char, 1)
+    scores = np.searchsorted(score_bits, entropy, side='right')
+    class_names = ['lowercase', 'uppercase', 'digits', 'symbols', 'other']
+    return [{'length': int(lengths[i]),
+             'classes': [class_names[k] for k in range(len(class_names)) if used[i, k]],
+             'entropy': float(entropy[i]), 'weak_chars': int(weak_chars[i]),
+             'dictionary': words[i], 'score': int(scores[i]), 'label': score_labels[scores[i]]}
+            for i in range(n)]
+
+
+class StrengthAnalyzer:
+    ''' Measures password strength of accounts on a background thread
+
+        Accounts passed to submit() are queued and analyzed in batches: the
+        passwords of a batch are decoded together, measured together with
+        analyze_passwords, and only the reports are kept - decoded passwords
+        are dropped as soon as their batch is done. The owner polls progress
+        and reports from the Tk thread (get_progress, get_report), typically
+        from an after() loop, so the UI never waits on the analysis.
+    '''
+    def __init__(self, decode_passwords, batch_size=256):
+        '''
+        Parameters
+        ----------
+            :param decode_passwords: 1 argument function (list of Account) -> list of str - decodes passwords of accounts
+                may raise any exception (such as vault locked) - the accounts of that batch are then
+                decoded one at a time, and accounts that still fail are left without a report
+            :param batch_size: int - number of passwords decoded and measured at once
+        '''
+        self.__decode_passwords = decode_passwords
+        self.__batch_size = batch_size
+        self.__condition = Condition()
+        self.__generation = 0 # incremented by clear() - batches of older generations are discarded
+        self.__pending = {} # Account -> None - queued accounts in order
+        self.__reports = {} # Account -> report dict (see analyze_passwords)
+        self.__done, self.__total = 0, 0 # progress since the queue was last empty
+        self.__busy = False # True while a batch is being analyzed
+        self.__running = set() # accounts of the batch being analyzed - discard() removes them
+        Thread(target=self.__run, daemon=True).start()
+
+    def submit(self, accounts:list):
+        '''
+        Purpose:
+            queues accounts to be analyzed - accounts already queued are not added twice
+        Pre-conditions:
+            :param accounts: list of Account or a single Account
+        Post-conditions:
+            wakes up worker thread
+        Returns:
+            (none)
+        '''
+        if not isinstance(accounts, (list, tuple)):
+            accounts = [accounts]
+        with self.__condition:
+            if len(self.__pending) == 0 and not self.__busy: # start counting progress again
+                self.__done, self.__total = 0, 0
+            for A in accounts:
+                if A not in self.__pending:
+                    self.__pending[A] = None
+                    self.__total += 1
+            self.__condition.notify()
+
+    def discard(self, Account):
+        '''forgets Account - called when it is deleted - a report of a running batch is not kept'''
+        with self.__condition:
+            if Account in self.__pending:
+                del self.__pending[Account]
+                self.__total -= 1
+            elif Account in self.__running:
+                self.__running.remove(Account)
+                self.__total -= 1
+            self.__reports.pop(Account, None)
+
+    def clear(self):
+        '''cancels queued and running analysis and forgets all reports - called at lockout'''
+        with self.__condition:
+            self.__generation += 1
+            self.__pending = {}
+            self.__running = set()
+            self.__reports = {}
+            self.__done, self.__total = 0, 0
+
+    def get_progress(self) -> tuple:
+        '''returns (accounts analyzed, accounts submitted) since the queue was last empty - accounts that cannot be decoded are not counted'''
+        with self.__condition:
+            return self.__done, self.__total
+
+    def is_idle(self) -> bool:
+        '''returns True when no accounts are queued or being analyzed'''
+        with self.__condition:
+            return len(self.__pending) == 0 and not self.__busy
+
+    def get_report(self, Account):
+        '''returns strength report of Account (see analyze_passwords) or None if it has not been analyzed'''
+        with self.__condition:
+            return self.__reports.get(Account)
+
+    def __analyze(self, batch:list) -> list:
+        '''private - returns report of each account in batch - None for accounts whose password cannot be decoded'''
+        try:
+            return analyze_passwords(self.__decode_passwords(batch))
+        except Exception: # vault was locked mid-batch or a password could not be decoded
+            if len(batch) == 1:
+                return [None]
+        reports = [] # accounts are retried one at a time so one bad password does not drop the batch
+        for A in batch:
+            reports.extend(self.__analyze([A]))
+        return reports
+
+    def __run(self):
+        '''private - analyzes queued accounts in batches - always runs in a Thread'''
+        while True:
+            with self.__condition:
+                while len(self.__pending) == 0:
+                    self.__condition.wait()
+                batch = list(self.__pending)[:self.__batch_size]
+                for A in batch:
+                    del self.__pending[A]
+                self.__running = set(batch)
+                generation = self.__generation
+                self.__busy = True
+            reports = [None] * len(batch)
+            try:
+                reports = self.__analyze(batch)
+            finally: # the worker must never stop with __busy set, or is_idle() would never be True again
+                with self.__condition:
+                    self.__busy = False
+                    if generation == self.__generation: # not cleared while batch was analyzed
+                        for A, report in zip(batch, reports):
+                            if A not in self.__running: # discarded while batch was analyzed
+                                continue
+                            if report is None: # cannot be decoded - no longer counted in progress
+                                self.__total -= 1
+                            else:
+                                self.__reports[A] = report
+                                self.__done += 1
+                    self.__running = set()
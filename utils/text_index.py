@@ -0,0 +1,172 @@
+from collections import Counter
+from bisect import bisect_left
+from threading import RLock
+from heapq import nlargest
+import math
+import re
+
+
+# fields searched and the weight of a word found in each field
+field_weights = {'name': 3.0, 'category': 1.5, 'username': 1.0, 'notes': 1.0}
+
+
+def tokenize(text:str) -> list:
+    '''splits text into lowercase words - "john.doe@mail.com" -> ["john", "doe", "mail", "com"]'''
+    return re.findall(r'[^\W_]+', text.lower())
+
+
+class FullTextIndex:
+    ''' Inverted index of the words in account name, username, category and notes
+
+        Results are ranked with BM25 over weighted term frequencies, where a
+        word found in the account name counts more than one found in notes
+        (see field_weights). The last word of the query is also matched as a
+        prefix, so results appear while the word is still being typed.
+
+        Accounts are kept up to date through Account.add_listener, so editing
+        an account only re-indexes that account. The index is locked so it can
+        be searched from a worker thread while accounts are edited.
+    '''
+    def __init__(self, k1=1.2, b=0.75, max_prefix_terms=50):
+        '''
+        Parameters
+        ----------
+            :param k1: float - BM25 term frequency saturation
+            :param b: float - BM25 document length normalization
+            :param max_prefix_terms: int - maximum number of words matched by the last (prefix) query word
+        '''
+        self.__k1, self.__b = k1, b
+        self.__max_prefix_terms = max_prefix_terms
+        self.__postings = {} # term -> {Account: weighted term frequency}
+        self.__terms = {} # Account -> Counter of weighted term frequencies
+        self.__lengths = {} # Account -> weighted number of terms
+        self.__total_length = 0
+        self.__vocabulary = [] # sorted list of all terms - for prefix matching - None when out of date
+        self.__lock = RLock()
+
+    def add(self, Account, keep=None):
+        '''adds Account to index and follows changes to it - not added if keep(Account) is False'''
+        with self.__lock: # keep is checked under the lock, so a remove() cannot run between check and add
+            if Account in self.__terms or (keep is not None and not keep(Account)):
+                return
+            self.__index(Account)
+            Account.add_listener(self.__account_changed)
+
+    def add_many(self, accounts:list, keep=None):
+        '''
+        Purpose:
+            adds every account in accounts to index
+        Pre-conditions:
+            :param accounts: list of Account
+            :param keep: 1 argument function (Account) -> bool or None - accounts it returns False for are skipped
+                         used when accounts are added from another thread and may be removed meanwhile
+        Post-conditions:
+            changes index
+        Returns:
+            (none)
+        '''
+        for A in accounts:
+            self.add(A, keep)
+
+    def remove(self, Account):
+        '''removes Account from index - does nothing if Account is not indexed'''
+        with self.__lock:
+            if Account not in self.__terms:
+                return
+            self.__unindex(Account)
+            Account.remove_listener(self.__account_changed)
+
+    def __index(self, Account):
+        '''private - adds terms of Account to postings'''
+        terms = Counter()
+        info = Account.get_info_dict()
+        for field, weight in field_weights.items():
+            for term in tokenize(info[field]):
+                terms[term] += weight
+        self.__terms[Account] = terms
+        self.__lengths[Account] = sum(terms.values())
+        self.__total_length += self.__lengths[Account]
+        for term, frequency in terms.items():
+            if term not in self.__postings:
+                self.__postings[term] = {}
+                self.__vocabulary = None # new term - must re-sort
+            self.__postings[term][Account] = frequency
+
+    def __unindex(self, Account):
+        '''private - removes terms of Account from postings'''
+        for term in self.__terms.pop(Account):
+            posting = self.__postings[term]
+            del posting[Account]
+            if len(posting) == 0:
+                del self.__postings[term]
+                self.__vocabulary = None
+        self.__total_length -= self.__lengths.pop(Account)
+
+    def __account_changed(self, Account, field:str, old_value:str):
+        '''private - called by Account when a field changes - re-indexes account'''
+        if field in field_weights:
+            with self.__lock:
+                self.__unindex(Account)
+                self.__index(Account)
+
+    def expand(self, query:str) -> list:
+        '''
+        Purpose:
+            splits query into search terms
+            the last word of query is replaced by all indexed words it is a prefix of
+        Pre-conditions:
+            :param query: str - search text
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of str - indexed terms to search for
+        '''
+        words = tokenize(query)
+        if len(words) == 0:
+            return []
+        terms = [w for w in words[:-1] if w in self.__postings]
+        if self.__vocabulary is None: # sorted once after any number of changes
+            self.__vocabulary = sorted(self.__postings)
+        prefix = words[-1]
+        i = bisect_left(self.__vocabulary, prefix)
+        while i < len(self.__vocabulary) and self.__vocabulary[i].startswith(prefix):
+            terms.append(self.__vocabulary[i])
+            if len(terms) >= len(words) - 1 + self.__max_prefix_terms:
+                break
+            i += 1
+        return terms
+
+    def search(self, query:str, max_results:int) -> list:
+        '''
+        Purpose:
+            finds the accounts that best match query - ranked with BM25
+        Pre-conditions:
+            :param query: str - search text - words are separated by spaces or punctuation
+            :param max_results: int - maximum number of accounts returned
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of Account objects - best matches first
+        '''
+        with self.__lock:
+            if len(self.__terms) == 0:
+                return []
+            n = len(self.__terms)
+            avg_length = self.__total_length / n
+            k1, b = self.__k1, self.__b
+            scores = Counter()
+            # rare terms first - terms found in most accounts only adjust the score
+            # of accounts that already matched a rarer term
+            for term in sorted(set(self.expand(query)), key=lambda t: len(self.__postings[t])):
+                posting = self.__postings[term]
+                idf = math.log(1 + (n - len(posting) + 0.5) / (len(posting) + 0.5))
+                if len(scores) > 0 and len(posting) > n / 2:
+                    posting = {A: posting[A] for A in scores if A in posting}
+                for Account, frequency in posting.items():
+                    norm = k1 * (1 - b + b * self.__lengths[Account] / avg_length)
+                    scores[Account] += idf * frequency * (k1 + 1) / (frequency + norm)
+            return [A for A, _ in nlargest(max_results, scores.items(), key=lambda x: x[1])]
+
+    def __len__(self):
+        '''returns number of indexed accounts'''
+        return len(self.__terms)
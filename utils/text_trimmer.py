@@ -0,0 +1,85 @@
+from tkinter.font import Font
+from collections import OrderedDict
+
+
+class TextTrimmer:
+    ''' Trims text to fit a width in pixels, using the real widths of a font
+
+        The width of each character is measured once and cached, so trimming
+        text only adds up cached numbers instead of asking Tk to measure.
+        Trimmed text breaks at the end of a word when that does not waste
+        more than half of the available width.
+
+        Use get_trimmer() so that all widgets with the same font share one
+        TextTrimmer (and one cache).
+    '''
+    def __init__(self, root, font:tuple, ellipsis='...', max_cached=4096):
+        '''
+        Parameters
+        ----------
+            :param root: tk widget - used to measure font
+            :param font: tuple (str, int) - font name and size
+            :param ellipsis: str - added to the end of trimmed text
+            :param max_cached: int - maximum number of trimmed texts cached
+        '''
+        self.__Font = Font(root=root, font=font)
+        self.__ellipsis = ellipsis
+        self.__max_cached = max_cached
+        self.__char_widths = {} # character -> width in pixels
+        self.__results = OrderedDict() # (text, width) -> trimmed text
+
+    def measure(self, text:str) -> int:
+        '''returns width of text in pixels - sum of cached character widths'''
+        total = 0
+        for c in text:
+            if c not in self.__char_widths:
+                self.__char_widths[c] = self.__Font.measure(c)
+            total += self.__char_widths[c]
+        return total
+
+    def trim(self, text:str, width:int) -> str:
+        '''
+        Purpose:
+            trims text and adds ellipsis if it is wider than width
+        Pre-conditions:
+            :param text: str - text to trim if necessary
+            :param width: int - maximum width of text in pixels, including ellipsis
+        Post-conditions:
+            (none)
+        Returns:
+            :return: str - text that has been trimmed if necessary
+        '''
+        key = (text, width)
+        if key in self.__results:
+            self.__results.move_to_end(key)
+            return self.__results[key]
+        available = width - self.measure(self.__ellipsis) # width left for text if it is trimmed
+        total, cut = 0, None
+        for i, c in enumerate(text):
+            total += self.measure(c)
+            if cut is None and total > available:
+                cut = i # text[:cut] is the longest prefix that fits with ellipsis
+            if total > width:
+                break
+        else: # whole text fits
+            return self.__store(key, text)
+        prefix = text[:cut]
+        space = prefix.rfind(' ')
+        if space > len(prefix) // 2: # break at end of a word
+            prefix = prefix[:space]
+        return self.__store(key, prefix.rstrip(' -,') + self.__ellipsis)
+
+    def __store(self, key:tuple, result:str) -> str:
+        '''private - caches result of key and returns result'''
+        self.__results[key] = result
+        if len(self.__results) > self.__max_cached:
+            self.__results.popitem(last=False)
+        return result
+
+trimmers = {} # font -> TextTrimmer
+
+def get_trimmer(root, font:tuple) -> TextTrimmer:
+    '''returns TextTrimmer for font - created the first time font is used'''
+    if font not in trimmers:
+        trimmers[font] = TextTrimmer(root, font)
+    return trimmers[font]
@@ -1,5 +1,5 @@
 from tkinter import Canvas
-from chichitk import Timer
+import math, time
 
 
 def seconds_text(sec:float):
@@ -30,9 +30,22 @@ def red_to_green(val):
 class TimeoutBar(Canvas):
     ''' Narrow bar to display time until lockout
         Fades from green to red as time expires
+
+        The bar is only redrawn when its width in pixels or the displayed
+        second changes. After each redraw, the next one is scheduled with
+        after() for whichever of those changes comes first, so an idle app
+        only wakes up a few times per second. Time is measured from the
+        restart time, so lockout happens at exactly duration seconds
+        regardless of how often the bar is redrawn.
+
+        If activity_function is given, the timer also counts from the last
+        activity it returns. Activity only moves that timestamp - the
+        deadline is worked out at the next redraw, which happens before the
+        old deadline at the latest.
     '''
     def __init__(self, master, bg:str, duration:int, expire_function,
-                 update_text_function, fps=100, height=3):
+                 update_text_function, fps=100, height=3, color_steps=256,
+                 activity_function=None):
         '''
         Parameters
         ----------
@@ -41,32 +54,88 @@ class TimeoutBar(Canvas):
             :param duration int - timeout duration in seconds
             :param expire_function 0 argument function - called when time expires
             :param update_text_function 1 argument function (str) - to update text display
-            :param fps: int - updates per second
+            :param fps: int - maximum redraws per second
             :param height: int - height of TimeoutBar in pixels
+            :param color_steps: int - number of colors between green and red
+            :param activity_function: 0 argument function (-> float) or None - returns time.monotonic()
+                                      of the last user activity - such as ActivityMonitor.get_last_activity
         '''
         Canvas.__init__(self, master, bg=bg, height=height, highlightthickness=0)
-        self.__fps = fps # steps per second
-        self.__steps = duration * self.__fps # total steps
+        self.__duration = duration
+        self.__expire_function = expire_function
         self.__update_text_function = update_text_function
-
-        self.__Timer = Timer(1 / self.__fps, self.__update,
-                             end_callback=expire_function,
-                             max_step=self.__steps)
+        self.__activity_function = activity_function
+        self.__min_delay = max(1, int(1000 / fps)) # milliseconds
+        # colors are computed once - index is fraction of time elapsed * (color_steps - 1)
+        self.__colors = [red_to_green(1 - i / (color_steps - 1)) for i in range(color_steps)]
+        self.__start = None # time.monotonic() of last restart - None when stopped
+        self.__after_id = None
+        self.__drawn = (None, None, None) # (width in pixels, color, second) last drawn
 
         self.fill_id = self.create_rectangle(0, 0, 0, 0, fill=bg, width=0)
+        self.bind('<Configure>', lambda e: self.__redraw(), add='+')
 
     def restart(self):
         '''restarts timer'''
-        self.__Timer.reset()
-        self.__Timer.start()
+        self.__start = time.monotonic()
+        self.__redraw()
+
+    def stop(self):
+        '''stops timer without calling expire function'''
+        self.__start = None
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+            self.__after_id = None
 
-    def __update(self, step:int):
+    def get_remaining(self) -> float:
+        '''returns seconds until time expires - duration if timer is stopped'''
+        if self.__start is None:
+            return self.__duration
+        return max(0, self.__duration - (time.monotonic() - self.__get_start()))
+
+    def __get_start(self) -> float:
+        '''private - returns time that timer counts from - restart or last activity, whichever is later'''
+        if self.__activity_function is None:
+            return self.__start
+        return max(self.__start, self.__activity_function())
+
+    def __redraw(self):
         '''
         Purpose:
-            updates color and coordinates of fill based step
-            only called internally by self.__Timer
+            updates fill and text if they changed, and schedules the next redraw
+            calls expire function if time has expired
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            may change color and coordinates of fill, and text display
+        Returns:
+            (none)
         '''
-        perc = max(0, min(1, step / self.__steps))
-        self.itemconfig(self.fill_id, fill=red_to_green(1 - perc))
-        self.coords(self.fill_id, 0, 0, self.winfo_width() * perc, self.winfo_height())
-        self.__update_text_function(seconds_text((self.__steps - step) / self.__fps))
+        if self.__after_id is not None:
+            self.after_cancel(self.__after_id)
+            self.__after_id = None
+        if self.__start is None:
+            return
+        elapsed = time.monotonic() - self.__get_start()
+        if elapsed >= self.__duration:
+            self.__start = None
+            self.__expire_function()
+            return
+        perc = elapsed / self.__duration
+        width = self.winfo_width()
+        pixels = int(width * perc)
+        color = self.__colors[int(perc * (len(self.__colors) - 1))]
+        second = math.ceil(self.__duration - elapsed)
+        if (pixels, color) != self.__drawn[:2]:
+            self.itemconfig(self.fill_id, fill=color)
+            self.coords(self.fill_id, 0, 0, pixels, self.winfo_height())
+        if second != self.__drawn[2]:
+            self.__update_text_function(seconds_text(second))
+        self.__drawn = (pixels, color, second)
+
+        # wait until the next pixel, color or second - lockout is never later than a second boundary
+        wait = self.__duration - elapsed - (second - 1)
+        if width > 1:
+            wait = min(wait, (pixels + 1) / width * self.__duration - elapsed)
+        wait = min(wait, (int(perc * (len(self.__colors) - 1)) + 1) / (len(self.__colors) - 1) * self.__duration - elapsed)
+        self.__after_id = self.after(max(self.__min_delay, math.ceil(wait * 1000)), self.__redraw)
@@ -0,0 +1,259 @@
+import hashlib, hmac, base64, json, time, os
+
+
+prefix = 'v2$' # marks values stored in the encrypted record format - tag includes associated data
+legacy_prefix = 'v1$' # records of the first format - tag covers only nonce and ciphertext
+nonce_size = 16
+tag_size = 32
+verifier_message = b'password manager vault verifier'
+
+
+class AuthenticationError(ValueError):
+    '''raised when a record was changed, was encrypted with another key or belongs to another account'''
+
+
+def derive_keys(key:str, salt:bytes, n:int, r:int, p:int) -> tuple:
+    '''
+    Purpose:
+        derives the encryption and authentication keys from the encryption key
+        scrypt is memory-hard, so each guess of the encryption key is expensive
+    Pre-conditions:
+        :param key: str - encryption key entered at login
+        :param salt: bytes - random salt stored with the vault
+        :param n: int (power of 2) - scrypt cost - time and memory grow with n
+        :param r: int - scrypt block size
+        :param p: int - scrypt parallelization
+    Post-conditions:
+        (none)
+    Returns:
+        :return: tuple (bytes, bytes) - (encryption key, authentication key) - 32 bytes each
+    '''
+    derived = hashlib.scrypt(key.encode('utf-8'), salt=salt, n=n, r=r, p=p,
+                             maxmem=128 * r * (n + p) + 1024 * 1024, dklen=64)
+    return derived[:32], derived[32:]
+
+def calibrate(target_seconds=0.5, r=8, p=1, min_n=2 ** 14, max_n=2 ** 20) -> dict:
+    '''
+    Purpose:
+        benchmarks scrypt on this machine and finds the largest cost that
+        derives keys in less than target_seconds
+        the time of scrypt doubles with n, so n is doubled until it would be too slow
+    Pre-conditions:
+        :param target_seconds: float - longest acceptable unlock time
+        :param r: int - scrypt block size
+        :param p: int - scrypt parallelization
+        :param min_n: int (power of 2) - lowest cost used, even if it is slower than target
+        :param max_n: int (power of 2) - highest cost used
+    Post-conditions:
+        (none)
+    Returns:
+        :return: dict - {'n': int, 'r': int, 'p': int, 'seconds': float} - seconds is the time taken with n
+    '''
+    n = min_n
+    t0 = time.perf_counter()
+    derive_keys('calibrate', os.urandom(16), n, r, p)
+    seconds = time.perf_counter() - t0
+    while n < max_n and seconds * 2 <= target_seconds:
+        n *= 2
+        t0 = time.perf_counter()
+        derive_keys('calibrate', os.urandom(16), n, r, p)
+        seconds = time.perf_counter() - t0
+    return {'n': n, 'r': r, 'p': p, 'seconds': seconds}
+
+def xor_bytes(data:bytes, stream:bytes) -> bytes:
+    '''returns data XOR stream - both must be the same length'''
+    import numpy as np # imported on first use - cli.py starts without loading numpy
+    return np.bitwise_xor(np.frombuffer(data, dtype=np.uint8),
+                          np.frombuffer(stream, dtype=np.uint8)).tobytes()
+
+def is_encrypted(text:str) -> bool:
+    '''returns True if text is stored in an encrypted record format (current or legacy)'''
+    return text.startswith(prefix) or text.startswith(legacy_prefix)
+
+def is_current(text:str) -> bool:
+    '''returns True if text is stored in the current encrypted record format'''
+    return text.startswith(prefix)
+
+
+class VaultCipher:
+    ''' Authenticated encryption of vault records
+
+        The key is derived with scrypt from the encryption key entered at
+        login. The salt, scrypt cost and a key verifier are kept in a small
+        JSON file next to the vault, so a wrong key is detected at unlock
+        instead of producing garbage.
+
+        Each record gets a random nonce. The record is XORed with a SHAKE-256
+        keystream of the key and nonce, and the nonce and ciphertext are
+        authenticated with HMAC-SHA256 (encrypt-then-MAC) together with the
+        associated data of the record (the name of its account), so a record
+        copied to another account fails authentication. A record is stored
+        as "v2$" followed by base64 of nonce + ciphertext + tag. Records of
+        the "v1$" format have no associated data - they are still decrypted
+        and are re-encrypted at login. Values without a prefix were saved
+        before encryption and are not changed.
+    '''
+    def __init__(self, meta_path:str, target_seconds=0.5):
+        '''
+        Parameters
+        ----------
+            :param meta_path: str - path of JSON file with salt, scrypt cost and key verifier
+            :param target_seconds: float - unlock time that scrypt cost is calibrated to
+                                           when the vault is first unlocked
+        '''
+        self.__meta_path = meta_path
+        self.__target_seconds = target_seconds
+        self.__enc_key = None # None while locked
+        self.__mac_key = None
+
+    def exists(self) -> bool:
+        '''returns True if the vault already has a key - otherwise the first unlock sets it'''
+        return os.path.exists(self.__meta_path)
+
+    def unlock(self, key:str, create=True) -> bool:
+        '''
+        Purpose:
+            derives keys from encryption key and checks them against the key verifier
+            the first unlock calibrates scrypt, and saves a new salt and the verifier of key
+        Pre-conditions:
+            :param key: str - encryption key entered at login
+            :param create: bool - False if the vault already has encrypted records - a missing
+                                  key file is then an error, since a new key could never decrypt them
+        Post-conditions:
+            keeps derived keys in memory if key is correct
+        Returns:
+            :return: bool - True if key is correct
+            raises ValueError if key file is missing and create is False
+        '''
+        if not self.exists() and not create:
+            raise ValueError(f'Key file {self.__meta_path} is missing but the vault has encrypted passwords - '
+                             'restore it from a backup (a new key would lock them out)')
+        if self.exists():
+            with open(self.__meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            salt = bytes.fromhex(meta['salt'])
+        else: # new vault - key is set now
+            meta = calibrate(self.__target_seconds)
+            salt = os.urandom(16)
+        enc_key, mac_key = derive_keys(key, salt, meta['n'], meta['r'], meta['p'])
+        verifier = hmac.new(mac_key, verifier_message, hashlib.sha256).hexdigest()
+        if not self.exists():
+            meta = {'version': 1, 'kdf': 'scrypt', 'salt': salt.hex(), 'n': meta['n'],
+                    'r': meta['r'], 'p': meta['p'], 'verifier': verifier}
+            with open(self.__meta_path + '.tmp', 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            os.replace(self.__meta_path + '.tmp', self.__meta_path)
+        elif not hmac.compare_digest(verifier, meta['verifier']):
+            return False # wrong key
+        self.__enc_key, self.__mac_key = enc_key, mac_key
+        return True
+
+    def lock(self):
+        '''forgets derived keys - records cannot be encrypted or decrypted until unlocked again'''
+        self.__enc_key, self.__mac_key = None, None
+
+    def is_unlocked(self) -> bool:
+        '''returns True if keys are available'''
+        return self.__enc_key is not None
+
+    def __keys(self) -> tuple:
+        '''private - returns (encryption key, authentication key) or raises ValueError if locked'''
+        # keys are read once per call - lock() from the Tk thread can run while a worker is encrypting
+        enc_key, mac_key = self.__enc_key, self.__mac_key
+        if enc_key is None or mac_key is None:
+            raise ValueError('vault is locked')
+        return enc_key, mac_key
+
+    def __keystream(self, enc_key:bytes, nonce:bytes, size:int) -> bytes:
+        '''private - returns size bytes of keystream for nonce'''
+        return hashlib.shake_256(enc_key + nonce).digest(size)
+
+    def __tag(self, mac_key:bytes, nonce:bytes, ciphertext:bytes, context:str=None) -> bytes:
+        '''private - returns authentication tag of nonce, ciphertext and associated data - None context is the legacy format'''
+        if context is None:
+            message = legacy_prefix.encode() + nonce + ciphertext
+        else: # associated data is length-prefixed so it cannot run into the nonce
+            data = context.encode('utf-8')
+            message = prefix.encode() + len(data).to_bytes(4, 'big') + data + nonce + ciphertext
+        return hmac.new(mac_key, message, hashlib.sha256).digest()
+
+    def encrypt(self, text:str, context:str='') -> str:
+        '''returns text in the encrypted record format - context is its associated data'''
+        return self.encrypt_many([text], [context])[0]
+
+    def decrypt(self, text:str, context:str='') -> str:
+        '''returns decrypted text - text without the record prefix is returned unchanged'''
+        return self.decrypt_many([text], [context])[0]
+
+    def encrypt_many(self, texts:list, contexts:list=None) -> list:
+        '''
+        Purpose:
+            encrypts every string in texts with its own nonce
+            all records are XORed with their keystreams in one numpy operation
+        Pre-conditions:
+            :param texts: list of str - plain texts
+            :param contexts: list of str or None - associated data of each text (such as its account name)
+                             the same context must be given to decrypt - None is '' for every text
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of str - records in the encrypted format, in the same order
+            raises ValueError if vault is locked
+        '''
+        enc_key, mac_key = self.__keys()
+        contexts = [''] * len(texts) if contexts is None else contexts
+        data = [t.encode('utf-8') for t in texts]
+        nonces = [os.urandom(nonce_size) for _ in data]
+        stream = b''.join(self.__keystream(enc_key, nonce, len(d)) for nonce, d in zip(nonces, data))
+        joined = xor_bytes(b''.join(data), stream)
+        records, start = [], 0
+        for nonce, d, context in zip(nonces, data, contexts):
+            ciphertext = joined[start:start + len(d)]
+            start += len(d)
+            record = nonce + ciphertext + self.__tag(mac_key, nonce, ciphertext, context)
+            records.append(prefix + base64.b64encode(record).decode('ascii'))
+        return records
+
+    def decrypt_many(self, texts:list, contexts:list=None) -> list:
+        '''
+        Purpose:
+            checks the tag of every record and decrypts them
+            texts without the record prefix were saved before encryption and are returned unchanged
+        Pre-conditions:
+            :param texts: list of str - records
+            :param contexts: list of str or None - associated data each text was encrypted with - None is ''
+                             ignored for records of the legacy format
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of str - plain texts in the same order
+            raises ValueError if vault is locked, or AuthenticationError (a ValueError) if a
+            record was changed, was encrypted with another key or was moved from another context
+        '''
+        enc_key, mac_key = self.__keys()
+        contexts = [''] * len(texts) if contexts is None else contexts
+        nonces, ciphertexts = [], []
+        for text, context in zip(texts, contexts):
+            if not is_encrypted(text):
+                continue
+            try:
+                record = base64.b64decode(text[len(prefix):]) # both prefixes have the same length
+            except ValueError: # not base64 - record was changed
+                raise AuthenticationError('record failed authentication')
+            nonce, ciphertext, tag = record[:nonce_size], record[nonce_size:-tag_size], record[-tag_size:]
+            expected = self.__tag(mac_key, nonce, ciphertext, context if is_current(text) else None)
+            if len(record) < nonce_size + tag_size or not hmac.compare_digest(tag, expected):
+                raise AuthenticationError('record failed authentication')
+            nonces.append(nonce)
+            ciphertexts.append(ciphertext)
+        stream = b''.join(self.__keystream(enc_key, nonce, len(c)) for nonce, c in zip(nonces, ciphertexts))
+        joined = xor_bytes(b''.join(ciphertexts), stream)
+        results, start, i = [], 0, 0
+        for text in texts:
+            if not is_encrypted(text):
+                results.append(text)
+                continue
+            size = len(ciphertexts[i])
+            results.append(joined[start:start + size].decode('utf-8'))
+            start, i = start + size, i + 1
+        return results
@@ -0,0 +1,307 @@
+from threading import Thread, Lock
+import json
+import csv
+import os
+
+
+# columns of the vault snapshot - same order as Account.get_info_dict()
+fields = ['name', 'username', 'password', 'category', 'notes', 'date']
+
+
+def rename_duplicates(rows:list) -> list:
+    '''
+    Purpose:
+        gives every row a unique name - older versions saved accounts with the same name
+        (such as two "New Account"s), but accounts are looked up and saved by name
+        the last row with a name keeps it, since that is the account the app showed and
+        saved changes to - earlier rows get " (2)", " (3)", ... added (as the importer does)
+    Pre-conditions:
+        :param rows: list of dict - snapshot rows in file order
+    Post-conditions:
+        changes name of duplicate rows
+    Returns:
+        :return: list of tuple (str, str) - (old name, new name) of each renamed row
+    '''
+    names = {row['name'] for row in rows}
+    last = {row['name']: i for i, row in enumerate(rows)}
+    renamed = []
+    for i, row in enumerate(rows):
+        if last[row['name']] == i:
+            continue
+        name, n = row['name'], 2
+        while f'{name} ({n})' in names:
+            n += 1
+        row['name'] = f'{name} ({n})'
+        names.add(row['name'])
+        renamed.append((name, row['name']))
+    return renamed
+
+
+class VaultStore:
+    ''' Journaled storage for the accounts database
+
+        The database is a csv snapshot plus an append-only journal of changes
+        that have not been folded into the snapshot yet. Saving an account
+        only appends one line to the journal instead of rewriting the whole
+        snapshot. Once the journal grows past compact_size bytes it is folded
+        into a new snapshot on a background thread.
+
+        Journal lines are json objects:
+            {"op": "upsert", "key": name, "fields": {...}} - creates or updates account
+            {"op": "delete", "key": name} - removes account
+            {"op": "batch", "ops": [...]} - operations that are applied together or not at all
+
+        key is the name the account was last saved under, so renaming an
+        account is an upsert whose fields contain the new name.
+    '''
+    def __init__(self, path:str, compact_size=256 * 1024):
+        '''
+        Parameters
+        ----------
+            :param path: str - path to csv snapshot
+            :param compact_size: int - journal size (bytes) that triggers compaction
+        '''
+        self.__path = path
+        self.__journal_path = path + '.journal'
+        self.__folding_path = path + '.journal.old' # journal that is being folded into snapshot
+        self.__compact_size = compact_size
+        self.__keys = {} # Account -> name the account was last saved under
+        self.__lock = Lock()
+        self.__compact_thread: Thread = None
+
+    def exists(self) -> bool:
+        '''returns True if there is any saved data'''
+        return any(os.path.exists(p) for p in [self.__path, self.__journal_path, self.__folding_path])
+
+    def load(self) -> list:
+        '''
+        Purpose:
+            reads snapshot and replays journal(s) on top of it
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: list of dict - account info dictionaries (same keys as Account.get_info_dict())
+        '''
+        return list(self.iter_records())
+
+    def fix_duplicate_names(self) -> list:
+        '''
+        Purpose:
+            renames snapshot rows that share a name (see rename_duplicates) and rewrites the snapshot
+            called once before the database is loaded - nothing is written if names are unique
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            may rewrite snapshot
+        Returns:
+            :return: list of tuple (str, str) - (old name, new name) of each renamed account
+        '''
+        if not os.path.exists(self.__path):
+            return []
+        with self.__lock:
+            with open(self.__path, 'r', newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+            renamed = rename_duplicates(rows)
+            if len(renamed) > 0:
+                self.__write_snapshot(rows)
+        return renamed
+
+    def iter_records(self):
+        '''
+        Purpose:
+            streams account records in a single pass over the snapshot
+            the journal(s) are read first since they are small - snapshot rows
+            that were changed or deleted by the journal are merged or skipped
+            as they stream past, then records created by the journal are yielded
+        Pre-conditions:
+            (none)
+        Post-conditions:
+            (none)
+        Returns:
+            :return: generator of dict - account info dictionaries
+        '''
+        overlay = {} # name -> record changed by journal
+        bases = {} # snapshot name -> overlay record built on top of that snapshot row
+        for path in [self.__folding_path, self.__journal_path]:
+            for op in self.__read_journal(path):
+                rec = overlay.pop(op['key'], None)
+                if rec is None: # first change to this account
+                    rec = {}
+                    # only the first record under a name is based on the snapshot row - a later
+                    # record under that name (after a rename or delete) is a new account, as in __apply
+                    bases.setdefault(op['key'], rec)
+                if op['op'] == 'upsert':
+                    rec.update(op['fields'])
+                    overlay[rec.get('name', op['key'])] = rec # name is only in fields if it changed
+        if os.path.exists(self.__path):
+            with open(self.__path, 'r', newline='', encoding='utf-8') as f:
+                for row in csv.DictReader(f):
+                    # overlay also wins if op was already folded (interrupted compaction)
+                    rec = bases.get(row['name'], overlay.get(row['name']))
+                    if rec is None:
+                        yield row
+                    else: # fill in fields that journal did not change
+                        for key, value in row.items():
+                            rec.setdefault(key, value)
+        for rec in overlay.values():
+            for key in fields:
+                rec.setdefault(key, '')
+            yield rec
+
+    def track(self, Account):
+        '''remembers the name that Account was loaded under - call for every loaded account'''
+        self.__keys[Account] = Account.get_name()
+
+    def upsert(self, Account, changed:list=None):
+        '''
+        Purpose:
+            appends account to journal - creates or updates account in database
+        Pre-conditions:
+            :param Account: Account object - account that was created or changed
+            :param changed: list of str or None - fields that changed (keys of Account.get_info_dict())
+                            only these fields are written - None writes every field
+                            every field is always written for accounts that were never saved
+        Post-conditions:
+            appends one line to journal - may start compaction
+        Returns:
+            (none)
+        '''
+        key = self.__keys.get(Account, Account.get_name())
+        info = Account.get_info_dict()
+        if changed is not None and Account in self.__keys:
+            info = {field: info[field] for field in changed}
+        self.__append({'op': 'upsert', 'key': key, 'fields': info})
+        self.__keys[Account] = Account.get_name()
+
+    def upsert_many(self, accounts:list, changed:dict=None):
+        '''
+        Purpose:
+            saves many accounts in one transaction - used by bulk import
+            all upserts are written as a single journal line, so a torn write
+            (crash while writing) loses the whole batch rather than part of it
+        Pre-conditions:
+            :param accounts: list of Account objects - accounts that were created or changed
+            :param changed: dict or None - Account -> list of fields that changed (see upsert)
+                            accounts not in changed have every field written
+        Post-conditions:
+            appends one line to journal - may start compaction
+        Returns:
+            (none)
+        '''
+        if len(accounts) == 0:
+            return
+        changed = {} if changed is None else changed
+        ops = []
+        for A in accounts:
+            info = A.get_info_dict()
+            if changed.get(A) is not None and A in self.__keys:
+                info = {field: info[field] for field in changed[A]}
+            ops.append({'op': 'upsert', 'key': self.__keys.get(A, A.get_name()), 'fields': info})
+            self.__keys[A] = A.get_name()
+        self.__append({'op': 'batch', 'ops': ops})
+
+    def delete(self, Account):
+        '''
+        Purpose:
+            appends delete operation to journal
+            accounts that were never saved are ignored
+        Pre-conditions:
+            :param Account: Account object - account to delete
+        Post-conditions:
+            appends one line to journal - may start compaction
+        Returns:
+            (none)
+        '''
+        if Account in self.__keys:
+            self.__append({'op': 'delete', 'key': self.__keys.pop(Account)})
+
+    def compact(self, wait=False):
+        '''
+        Purpose:
+            folds journal into a new snapshot on a background thread
+            new changes are written to a fresh journal while compacting
+        Pre-conditions:
+            :param wait: bool - if True, blocks until compaction is finished
+        Post-conditions:
+            rewrites snapshot and removes folded journal
+        Returns:
+            (none)
+        '''
+        with self.__lock:
+            if self.__compact_thread is not None and self.__compact_thread.is_alive():
+                return # already compacting
+            # a leftover folding journal (from a crash) is folded first
+            if not os.path.exists(self.__folding_path):
+                if not os.path.exists(self.__journal_path):
+                    return # nothing to fold
+                os.replace(self.__journal_path, self.__folding_path)
+            self.__compact_thread = Thread(target=self.__fold, daemon=True)
+            self.__compact_thread.start()
+        if wait:
+            self.__compact_thread.join()
+
+    def __append(self, op:dict):
+        '''writes a single operation to the end of the journal'''
+        with self.__lock:
+            with open(self.__journal_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(op) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+            size = os.path.getsize(self.__journal_path)
+        if size >= self.__compact_size:
+            self.compact()
+
+    def __fold(self):
+        '''private - writes snapshot + folding journal to new snapshot - runs in a Thread'''
+        rows = []
+        if os.path.exists(self.__path):
+            with open(self.__path, 'r', newline='', encoding='utf-8') as f:
+                rows = list(csv.DictReader(f))
+        rename_duplicates(rows) # duplicate names are never dropped (fix_duplicate_names normally ran already)
+        records = {row['name']: row for row in rows}
+        for op in self.__read_journal(self.__folding_path):
+            self.__apply(records, op)
+        self.__write_snapshot(records.values())
+        os.remove(self.__folding_path)
+
+    def __write_snapshot(self, rows):
+        '''private - replaces snapshot with rows (info dicts) - written to a temporary file first'''
+        temp_path = self.__path + '.tmp'
+        with open(temp_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore')
+            writer.writeheader()
+            writer.writerows(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.__path)
+
+    @staticmethod
+    def __read_journal(path:str):
+        '''yields operations from journal file - ignores a torn last line - batches are flattened'''
+        if not os.path.exists(path):
+            return
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except json.JSONDecodeError: # incomplete write
+                    continue
+                if op['op'] == 'batch': # transaction - replayed as its operations
+                    yield from op['ops']
+                else:
+                    yield op
+
+    @staticmethod
+    def __apply(records:dict, op:dict):
+        '''applies a single journal operation to records (name -> info dict)'''
+        if op['op'] == 'delete':
+            records.pop(op['key'], None)
+        elif op['op'] == 'upsert':
+            # operation may already be in snapshot if compaction was interrupted
+            rec = records.pop(op['key'], None)
+            if rec is None:
+                rec = records.pop(op['fields'].get('name', op['key']), {})
+            rec.update(op['fields'])
+            records[rec.get('name', op['key'])] = rec